@@ -0,0 +1,71 @@
+"""Benchmark for add_reference over a large S3 prefix.
+
+Populates an in-process S3 stub (moto) with objects spread over nested
+prefixes, then times Artifact.add_reference on the root prefix and reports
+objects/sec. Requires boto3 and moto:
+
+    pip install boto3 moto
+    python artifact_reference_listing_bench.py --num_objects 20000 --fanout 20
+"""
+
+import argparse
+import os
+import time
+
+import boto3
+
+try:
+    from moto import mock_aws as mock_s3
+except ImportError:  # moto < 5
+    from moto import mock_s3
+
+import wandb
+
+parser = argparse.ArgumentParser(description="add_reference listing benchmark")
+parser.add_argument("--num_objects", type=int, default=20000)
+parser.add_argument(
+    "--fanout", type=int, default=20, help="number of sub-prefixes per level"
+)
+parser.add_argument("--depth", type=int, default=2, help="levels of sub-prefixes")
+parser.add_argument("--bucket", type=str, default="wandb-bench")
+args = parser.parse_args()
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+
+
+def object_key(i):
+    parts = []
+    n = i
+    for _ in range(args.depth):
+        parts.append("p%d" % (n % args.fanout))
+        n //= args.fanout
+    return "data/%s/obj-%d" % ("/".join(parts), i)
+
+
+def main():
+    with mock_s3():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=args.bucket)
+        start = time.time()
+        for i in range(args.num_objects):
+            client.put_object(Bucket=args.bucket, Key=object_key(i), Body=b"x")
+        print("populated %d objects in %.1fs" % (args.num_objects, time.time() - start))
+
+        artifact = wandb.Artifact("listing-bench", type="dataset")
+        start = time.time()
+        artifact.add_reference(
+            "s3://%s/data" % args.bucket, max_objects=args.num_objects + 1
+        )
+        elapsed = time.time() - start
+        n = len(artifact.manifest.entries)
+        assert n == args.num_objects, n
+        print(
+            "add_reference: %d objects in %.2fs, %.0f objects/sec"
+            % (n, elapsed, n / elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark for console capture.
+
+Pushes plain log lines, tqdm style progress bar updates (carriage returns) and
+colored log lines through the StreamWrapper ("wrap") and Redirect ("redirect")
+console capture and reports bytes/sec until the captured output has been
+processed. The captured program output is written to stdout, results go to
+stderr, so redirect stdout away from the terminal:
+
+    python console_capture_bench.py --mb 20 > /dev/null
+
+Redirect.uninstall waits a fixed second for output still in the pipe, use enough
+data for it not to dominate.
+"""
+
+import argparse
+import sys
+import time
+
+from wandb.sdk.lib import redirect
+
+parser = argparse.ArgumentParser(description="console capture benchmark")
+parser.add_argument("--mb", type=float, default=10, help="MB of output per case")
+parser.add_argument("--chunk", type=int, default=4096, help="bytes per write")
+parser.add_argument(
+    "--impl", choices=["wrap", "redirect", "all"], default="all",
+)
+args = parser.parse_args()
+
+
+def plain(i):
+    return "step %d loss=0.4213 acc=0.8765 lr=0.001 some more log text\n" % i
+
+
+def tqdm(i):
+    done = i % 1001 // 20
+    return "\r%3d%%|%s%s| %d/1000 [00:01<00:02, 512.00it/s]" % (
+        i % 1001 // 10,
+        "#" * done,
+        " " * (50 - done),
+        i % 1001,
+    )
+
+
+def colored(i):
+    return (
+        "\x1b[32mINFO\x1b[0m step %d \x1b[1mloss\x1b[22m=0.42 \x1b[31macc\x1b[39m\n" % i
+    )
+
+
+def payload(line_fn):
+    size = int(args.mb * 1024 * 1024)
+    lines, n, i = [], 0, 0
+    while n < size:
+        line = line_fn(i)
+        lines.append(line)
+        n += len(line)
+        i += 1
+    data = "".join(lines)
+    return [data[i : i + args.chunk] for i in range(0, len(data), args.chunk)]
+
+
+def bench(cls, chunks):
+    captured = [0]
+
+    def cb(data):
+        captured[0] += len(data)
+
+    r = cls("stdout", cbs=[cb])
+    start = time.time()
+    r.install()
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+    sys.stdout.flush()
+    # let the emulator catch up, uninstall skips processing of a large backlog
+    while r._pending:
+        time.sleep(0.01)
+    r.uninstall()
+    elapsed = time.time() - start
+    return sum(map(len, chunks)) / elapsed, captured[0]
+
+
+def main():
+    impls = []
+    if args.impl in ("wrap", "all"):
+        impls.append(("wrap", redirect.StreamWrapper))
+    if args.impl in ("redirect", "all") and redirect.pty is not None:
+        impls.append(("redirect", redirect.Redirect))
+    for case, line_fn in [("plain", plain), ("tqdm", tqdm), ("colored", colored)]:
+        chunks = payload(line_fn)
+        for name, cls in impls:
+            rate, captured = bench(cls, chunks)
+            sys.stderr.write(
+                "%-8s %-8s %8.2f MB/s  (%d bytes captured)\n"
+                % (name, case, rate / 1024 / 1024, captured)
+            )
+
+
+if __name__ == "__main__":
+    main()
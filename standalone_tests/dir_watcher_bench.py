@@ -0,0 +1,92 @@
+"""Benchmark for the run directory watcher.
+
+Fills a directory with many files, then watches it with the inotify and the
+polling observer while a few files keep changing, and reports the CPU time the
+process used to start watching and per second of watching:
+
+    python dir_watcher_bench.py --files 10000 100000 --seconds 10
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from wandb.filesync import dir_watcher
+
+parser = argparse.ArgumentParser(description="dir watcher benchmark")
+parser.add_argument("--files", type=int, nargs="*", default=[10000, 100000])
+parser.add_argument("--per-dir", type=int, default=1000, help="files per subdirectory")
+parser.add_argument("--seconds", type=float, default=10, help="duration per case")
+args = parser.parse_args()
+
+
+class Settings(object):
+    ignore_globs = ()
+
+    def __init__(self, files_dir):
+        self.files_dir = files_dir
+
+
+class NullPusher(object):
+    def __init__(self):
+        self.changed = 0
+
+    def file_changed(self, save_name, path, copy=True):
+        self.changed += 1
+
+
+def fill(root, n):
+    for i in range(n):
+        subdir = os.path.join(root, "shard%d" % (i // args.per_dir))
+        if i % args.per_dir == 0:
+            os.makedirs(subdir)
+        with open(os.path.join(subdir, "f%d.bin" % i), "w") as f:
+            f.write("x")
+
+
+def cpu():
+    t = os.times()
+    return t.user + t.system
+
+
+def bench(n, inotify):
+    root = tempfile.mkdtemp()
+    try:
+        fill(root, n)
+        saved = dir_watcher.wd_inotify
+        if not inotify:
+            dir_watcher.wd_inotify = None
+        try:
+            pusher = NullPusher()
+            start = cpu()
+            watcher = dir_watcher.DirWatcher(Settings(root), None, pusher)
+        finally:
+            dir_watcher.wd_inotify = saved
+        startup = cpu() - start
+        start, start_time = cpu(), time.time()
+        while time.time() - start_time < args.seconds:
+            with open(os.path.join(root, "shard0", "live.log"), "a") as f:
+                f.write("step\n")
+            time.sleep(0.1)
+        per_second = (cpu() - start) / (time.time() - start_time)
+        watcher.finish()
+        return type(watcher._file_observer).__name__, startup, per_second
+    finally:
+        shutil.rmtree(root)
+
+
+def main():
+    for n in args.files:
+        for inotify in (True, False):
+            observer, startup, per_second = bench(n, inotify)
+            sys.stdout.write(
+                "%7d files  %-16s start %6.2fs cpu  watching %6.2f%% cpu\n"
+                % (n, observer, startup, per_second * 100)
+            )
+
+
+if __name__ == "__main__":
+    main()
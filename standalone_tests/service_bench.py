@@ -0,0 +1,57 @@
+"""Benchmark for starting many short runs with and without the wandb service.
+
+Starts `wandb grpc-server` on a local port, then times a number of short runs
+that each log a few steps, once with a new internal process per run and once
+with the runs handled by the service:
+
+    python service_bench.py --runs 20 --port 50051
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+import wandb
+
+parser = argparse.ArgumentParser(description="wandb service benchmark")
+parser.add_argument("--runs", type=int, default=20)
+parser.add_argument("--steps", type=int, default=10, help="steps logged per run")
+parser.add_argument("--port", type=int, default=50051)
+args = parser.parse_args()
+
+
+def bench(service):
+    init, total = 0.0, 0.0
+    for _ in range(args.runs):
+        start = time.time()
+        run = wandb.init(
+            project="service-bench", settings=wandb.Settings(service=service)
+        )
+        init += time.time() - start
+        for step in range(args.steps):
+            run.log(dict(step=step))
+        run.finish()
+        total += time.time() - start
+    return init / args.runs, total / args.runs
+
+
+def main():
+    server = subprocess.Popen(
+        [sys.executable, "-m", "wandb", "grpc-server", "--port", str(args.port)]
+    )
+    try:
+        # give the service time to import wandb and bind its port
+        time.sleep(5)
+        for name, service in (("process", None), ("service", str(args.port))):
+            init, total = bench(service)
+            sys.stdout.write(
+                "%-8s %d runs  init %.2fs  run %.2fs\n" % (name, args.runs, init, total)
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
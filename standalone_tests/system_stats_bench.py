@@ -0,0 +1,80 @@
+"""Benchmark for system stats collection overhead.
+
+Runs SystemStats for a while, once with the default probes and once more per
+high-frequency sampling rate, and reports the CPU time the sampling thread used
+as a percentage of one core, and the size of the recorded profile:
+
+    python system_stats_bench.py --seconds 20 --rates 10 50 100
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import psutil
+from wandb.sdk.internal import stats
+
+parser = argparse.ArgumentParser(description="system stats benchmark")
+parser.add_argument("--seconds", type=float, default=10, help="duration per case")
+parser.add_argument(
+    "--rates", type=float, nargs="*", default=[10, 50, 100], help="sample rates in Hz"
+)
+args = parser.parse_args()
+
+
+class NullInterface(object):
+    def __init__(self):
+        self.published = 0
+
+    def publish_stats(self, stats_dict):
+        self.published += 1
+
+    def publish_telemetry(self, telem):
+        pass
+
+
+def thread_cpu_seconds(thread_ids):
+    return sum(
+        t.user_time + t.system_time
+        for t in psutil.Process().threads()
+        if t.id in thread_ids
+    )
+
+
+def bench(rate, tmpdir):
+    interface = NullInterface()
+    system_stats = stats.SystemStats(pid=os.getpid(), interface=interface)
+    path = os.path.join(tmpdir, "profile-%s.bin" % rate)
+    if rate:
+        system_stats.add_probe(
+            stats.HighFrequencyProbe(rate, gpu_count=system_stats.gpu_count, path=path)
+        )
+    before = set(t.id for t in psutil.Process().threads())
+    system_stats.start()
+    time.sleep(0.1)
+    ids = set(t.id for t in psutil.Process().threads()) - before
+    start_cpu = thread_cpu_seconds(ids)
+    start = time.time()
+    time.sleep(args.seconds)
+    cpu = thread_cpu_seconds(ids) - start_cpu
+    elapsed = time.time() - start
+    system_stats.shutdown()
+    samples = len(stats.load_profile(path)[1]) if rate else 0
+    size = os.path.getsize(path) if rate else 0
+    return cpu / elapsed * 100, samples / elapsed, size
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    for rate in [0] + args.rates:
+        cpu, achieved, size = bench(rate, tmpdir)
+        sys.stdout.write(
+            "%-8s cpu %6.2f%%  %7.1f samples/s  %9d bytes\n"
+            % ("%gHz" % rate if rate else "default", cpu, achieved, size)
+        )
+
+
+if __name__ == "__main__":
+    main()
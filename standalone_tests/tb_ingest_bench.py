@@ -0,0 +1,82 @@
+"""Benchmark for TensorBoard event ingestion.
+
+Writes an event file with many scalar steps and times how long TBWatcher takes
+to turn it into history records, the way `wandb sync` does it. Needs the
+tensorboard package, but not TensorFlow:
+
+    python tb_ingest_bench.py --steps 100000 --tags 10
+"""
+
+import argparse
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from six.moves import queue
+import wandb
+from wandb.sdk.interface import interface
+from wandb.sdk.internal import tb_watcher
+from tensorboard.compat.proto import event_pb2, summary_pb2
+from tensorboard.summary.writer.event_file_writer import EventFileWriter
+
+parser = argparse.ArgumentParser(description="tensorboard ingestion benchmark")
+parser.add_argument("--steps", type=int, default=100000)
+parser.add_argument("--tags", type=int, default=10, help="scalars per step")
+args = parser.parse_args()
+
+
+def write_events(logdir):
+    writer = EventFileWriter(logdir)
+    for step in range(args.steps):
+        summary = summary_pb2.Summary(
+            value=[
+                summary_pb2.Summary.Value(tag="metric%d" % i, simple_value=step * i)
+                for i in range(args.tags)
+            ]
+        )
+        writer.add_event(
+            event_pb2.Event(wall_time=1e9 + step, step=step, summary=summary)
+        )
+    writer.close()
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        logdir = os.path.join(tmpdir, "logs")
+        os.makedirs(logdir)
+        write_events(logdir)
+        size = sum(os.path.getsize(os.path.join(logdir, f)) for f in os.listdir(logdir))
+
+        settings = wandb.Settings(
+            root_dir=tmpdir,
+            run_id="bench",
+            _start_datetime=datetime.datetime.now(),
+            _start_time=time.time(),
+        )
+        os.makedirs(settings.files_dir)
+        record_q = queue.Queue()
+        proto_run = wandb.proto.wandb_internal_pb2.RunRecord(run_id="bench")
+        watcher = tb_watcher.TBWatcher(
+            settings, proto_run, interface.BackendSender(record_q), True
+        )
+        start = time.time()
+        watcher.add(logdir, False, tmpdir)
+        watcher.finish()
+        elapsed = time.time() - start
+        rows = sum(
+            1 for r in record_q.queue if r.WhichOneof("record_type") == "history"
+        )
+        sys.stdout.write(
+            "%d steps, %.1f MB: %.2fs, %.0f steps/s, %d history rows\n"
+            % (args.steps, size / 1e6, elapsed, args.steps / elapsed, rows)
+        )
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import os
 import pytest
+import subprocess
 import sys
 
 
@@ -10,3 +12,63 @@ def test_path_is_unchanged():
 
     for item in sys.path:
         assert "wandb/vendor" not in item
+
+
+def _import_wandb_in_subprocess(code=""):
+    import wandb
+
+    # import the same wandb the tests run against, not whatever is installed
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(wandb.__file__))]
+        + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import wandb\n" + code],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="lazy attributes need PEP 562")
+def test_import_skips_slow_modules():
+    slow = [
+        "distutils",
+        "git",
+        "pkg_resources",
+        "wandb.apis.public",
+        "wandb.sdk.internal.internal",
+        "wandb.wandb_agent",
+    ]
+    result = _import_wandb_in_subprocess(
+        "import sys\nprint([m for m in %r if m in sys.modules])" % slow
+    )
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="lazy attributes need PEP 562")
+def test_import_time_budget():
+    result = _import_wandb_in_subprocess()
+    # -X importtime prints a line for every module imported. Timings depend on
+    # the load of the machine, the number of modules does not: about 750 with
+    # the optional modules loaded lazily, over 1000 when they were all imported.
+    imported = [
+        line for line in result.stderr.splitlines() if line.startswith("import time:")
+    ]
+    assert len(imported) < 900
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="lazy attributes need PEP 562")
+def test_lazy_attributes():
+    import wandb
+
+    assert wandb.Api is wandb.apis.public.Api
+    assert wandb.ThreadedAsyncApi is wandb.apis.public_async.ThreadedAsyncApi
+    assert callable(wandb.agent)
+    assert wandb.plot.line
+    assert "agent" in dir(wandb)
+    with pytest.raises(AttributeError):
+        wandb.not_an_attribute
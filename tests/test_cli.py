@@ -11,7 +11,12 @@ import netrc
 import subprocess
 import sys
 import os
+import glob
+import json
+import shutil
 from tests import utils
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.sdk.internal import datastore
 
 DUMMY_API_KEY = "1824812581259009ca9981580f8f8a9012409eee"
 DOCKER_SHA = (
@@ -950,6 +955,67 @@ def test_sync_wandb_run(runner, live_mock_server):
         assert "wandb: ERROR Nothing to sync." in result.output
 
 
+def test_sync_wandb_runs_in_parallel(runner, live_mock_server):
+    with runner.isolated_filesystem():
+        utils.fixture_copy("wandb")
+        run_dir = os.path.join("wandb", "offline-run-20210216_154407-g9dvvkua")
+        shutil.copytree(run_dir, run_dir.replace("154407", "154408"))
+
+        result = runner.invoke(cli.sync, ["--sync-all", "--jobs", "2"])
+        print(result.output)
+        assert result.exit_code == 0
+        assert (
+            result.output.count("mock_server_entity/test/runs/g9dvvkua ...done.") == 2
+        )
+        assert len(glob.glob(os.path.join("wandb", "*", "*.wandb.synced"))) == 2
+
+
+def _write_run_file(path, steps, finished):
+    ds = datastore.DataStore()
+    ds.open_for_write(path)
+    ds.write(pb.Record(run=pb.RunRecord(run_id="resumed", project="test")))
+    for step in range(steps):
+        record = pb.Record()
+        item = record.history.item.add()
+        item.key = "_step"
+        item.value_json = json.dumps(step)
+        ds.write(record)
+    if finished:
+        ds.write(pb.Record(exit=pb.RunExitRecord(exit_code=0)))
+        ds.write(pb.Record(final=pb.FinalRecord()))
+    ds.close()
+
+
+def test_sync_resumes_from_checkpoint(runner, live_mock_server):
+    with runner.isolated_filesystem():
+        run_dir = os.path.join("wandb", "offline-run-20210216_154407-resumed")
+        os.makedirs(run_dir)
+        run_file = os.path.join(run_dir, "run-resumed.wandb")
+        _write_run_file(run_file, 5, finished=False)
+
+        result = runner.invoke(cli.sync, [run_dir])
+        assert result.exit_code == 0
+        with open(run_file + ".progress") as f:
+            assert json.load(f)["streams"]["history"] == 5
+
+        # the run went on after the first sync
+        os.remove(run_file)
+        _write_run_file(run_file, 8, finished=True)
+        result = runner.invoke(cli.sync, [run_dir])
+        assert result.exit_code == 0
+        assert not os.path.exists(run_file + ".progress")
+        assert os.path.exists(run_file + ".synced")
+        history = [
+            fs["files"]["wandb-history.jsonl"]
+            for fs in live_mock_server.get_ctx()["file_stream"]
+            if "wandb-history.jsonl" in fs.get("files", {})
+        ]
+        assert history[-1] == {
+            "offset": 5,
+            "content": [json.dumps({"_step": step}) for step in (5, 6, 7)],
+        }
+
+
 @pytest.mark.skipif(
     sys.version_info >= (3, 9), reason="Tensorboard not currently built for 3.9"
 )
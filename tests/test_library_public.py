@@ -61,6 +61,7 @@ SYMBOLS_ROOT_OTHER = {
     "PublicApi",
     "START_TIME",
     "Settings",
+    "ThreadedAsyncApi",
     "UsageError",
     "absolute_import",
     "agents",
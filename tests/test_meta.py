@@ -4,11 +4,12 @@ import platform
 import sys
 import subprocess
 import threading
+import time
 import wandb
 
 from six.moves import queue
 
-from wandb.sdk.internal.meta import Meta
+from wandb.sdk.internal.meta import _environment_key, Meta
 from wandb.sdk.internal.sender import SendManager
 from wandb.sdk.interface.interface import BackendSender
 
@@ -109,3 +110,59 @@ def test_jupyter_path(meta, mocked_ipython):
 
 
 # TODO: test actual code saving
+
+
+def test_meta_start_publishes_files(meta, record_q):
+    os.makedirs(meta._settings.files_dir)
+    meta.start()
+    meta.join()
+    files = record_q.get(timeout=1).files.files
+    assert "wandb-metadata.json" in [f.path for f in files]
+    assert os.path.exists(meta.fname)
+
+
+def test_meta_probe_timeout(meta, monkeypatch):
+    monkeypatch.setattr(Meta, "PROBE_TIMEOUT", 0.1)
+    monkeypatch.setattr(meta, "_save_pip", lambda: time.sleep(5))
+    meta._save_pip.__name__ = "_save_pip"
+    start = time.time()
+    meta.probe()
+    assert time.time() - start < 5
+    assert "requirements.txt" not in meta._saved_environment
+
+
+def test_meta_caches_requirements(test_settings, interface, monkeypatch, tmp_path):
+    monkeypatch.setenv("WANDB_CACHE_DIR", str(tmp_path))
+    os.makedirs(test_settings.files_dir)
+    first = Meta(settings=test_settings, interface=interface)
+    first._save_pip()
+    (cached,) = (tmp_path / "meta").iterdir()
+    assert cached.name.endswith("-requirements.txt")
+
+    cached.write_text("cached==1.0")
+    second = Meta(settings=test_settings, interface=interface)
+    monkeypatch.setattr(second, "_write_pip", None)
+    second._save_pip()
+    with open(os.path.join(test_settings.files_dir, "requirements.txt")) as f:
+        assert f.read() == "cached==1.0"
+    assert second._saved_environment == ["requirements.txt"]
+
+
+def test_meta_cache_key_changes_with_directories(tmp_path):
+    os.utime(str(tmp_path), ns=(0, 0))
+    key = _environment_key(str(tmp_path))
+    # a module added to a directory that isn't named site-packages
+    (tmp_path / "pkg.py").write_text("")
+    assert _environment_key(str(tmp_path)) != key
+
+
+def test_meta_cache_prunes_old_entries(test_settings, interface, monkeypatch, tmp_path):
+    monkeypatch.setenv("WANDB_CACHE_DIR", str(tmp_path))
+    os.makedirs(test_settings.files_dir)
+    stale = tmp_path / "meta" / "stale-requirements.txt"
+    stale.parent.mkdir()
+    stale.write_text("old==1.0")
+    os.utime(str(stale), (0, 0))
+    Meta(settings=test_settings, interface=interface)._save_pip()
+    (cached,) = (tmp_path / "meta").iterdir()
+    assert cached.name != stale.name
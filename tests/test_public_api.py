@@ -5,14 +5,19 @@ test_wandb
 Tests for the `wandb.apis.PublicApi` module.
 """
 
+import asyncio
 import os
+import gc
 import json
 import pytest
 import platform
 import sys
+import threading
+import time
 
 import wandb
 from wandb import Api
+from wandb.apis.response_cache import ResponseCache
 from tests import utils
 
 
@@ -146,6 +151,171 @@ def test_run_history_keys_bad_arg(mock_server, api, capsys):
     assert "wandb: ERROR keys argument must be a list of strings\n" in captured.err
 
 
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_history_scan_concurrent_pages_in_order(mocker, concurrency):
+    class FakeClient(object):
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+        def execute(self, query, variable_values, **kwargs):
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            # later windows come back first
+            time.sleep(0.01 * (100 - variable_values["minStep"]) / 100)
+            with self.lock:
+                self.in_flight -= 1
+            steps = range(variable_values["minStep"], variable_values["maxStep"])
+            rows = [json.dumps({"_step": step}) for step in steps]
+            return {"project": {"run": {"history": rows}}}
+
+    run = mocker.Mock(entity="e", project="p", id="r")
+    client = FakeClient()
+    scan = wandb.apis.public.HistoryScan(
+        client,
+        run,
+        0,
+        100,
+        page_size=10,
+        concurrency=concurrency,
+        max_buffered_pages=3,
+    )
+    assert [row["_step"] for row in scan] == list(range(100))
+    assert client.max_in_flight <= min(concurrency, 3)
+    # the scan can be iterated again from the start
+    assert [row["_step"] for row in scan] == list(range(100))
+
+
+@pytest.mark.parametrize("use_with", [True, False])
+def test_history_scan_closed_early(mocker, use_with):
+    class FakeClient(object):
+        def __init__(self):
+            self.release = threading.Event()
+            self.windows = []
+
+        def execute(self, query, variable_values, **kwargs):
+            self.windows.append(variable_values["minStep"])
+            if variable_values["minStep"] > 0:
+                self.release.wait(5)
+            return {"project": {"run": {"history": [json.dumps({"_step": 0})]}}}
+
+    run = mocker.Mock(entity="e", project="p", id="r")
+    client = FakeClient()
+    scan = wandb.apis.public.HistoryScan(
+        client, run, 0, 100, page_size=10, concurrency=2, max_buffered_pages=8
+    )
+    if use_with:
+        with scan:
+            next(iter(scan))
+            pages = list(scan._pages)
+    else:
+        next(iter(scan))
+        pages = list(scan._pages)
+        executor = scan._executor
+        del scan
+        gc.collect()
+        assert executor._shutdown
+    client.release.set()
+    wandb.apis.public.futures.wait(pages)
+    assert sum(page.cancelled() for page in pages) >= 5
+    assert len(client.windows) <= 4
+
+
+def test_history_columns():
+    columns = wandb.apis.public._HistoryColumns()
+    rows = [
+        {"_step": 0, "acc": 1, "name": "a"},
+        {"_step": 1, "acc": 2.5, "loss": None},
+        {"_step": 2, "loss": 3, "image": {"path": "x.png"}},
+    ]
+    for row in rows:
+        columns.append(row, extra={"run_id": "abc"})
+    arrays = columns.to_numpy()
+    assert list(arrays) == ["run_id", "_step", "acc", "name", "loss", "image"]
+    assert arrays["_step"].dtype.name == "int64"
+    assert arrays["acc"].dtype.name == "float64"
+    assert arrays["acc"][:2].tolist() == [1.0, 2.5]
+    assert arrays["loss"][2] == 3.0
+    assert list(arrays["name"]) == ["a", None, None]
+    assert list(arrays["run_id"]) == ["abc"] * 3
+
+    df = columns.to_table("pandas")
+    assert df.shape == (3, 6)
+    assert df["loss"].isnull().tolist() == [True, True, False]
+    with pytest.raises(ValueError):
+        columns.to_table("csv")
+
+
+def test_run_history_table(mock_server, api, mocker):
+    run = api.run("test/test/test")
+    rows = [{"_step": i, "acc": i / 10} for i in range(5)]
+    scan = mocker.patch.object(run, "scan_history", return_value=iter(rows))
+    df = run.history_table(keys=["acc"], page_size=2)
+    assert scan.call_args[1]["keys"] == ["acc"]
+    assert df["acc"].tolist() == [r["acc"] for r in rows]
+
+
+def test_response_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=1000, running_ttl=60, final_ttl=600)
+    assert cache.get("a") is None
+    cache.put("a", {"x": 1})
+    assert cache.get("a") == {"x": 1}
+    cache.put("expired", {"x": 2}, ttl=-1)
+    assert cache.get("expired") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 0}
+
+    assert cache.ttl_for_run_state("finished") == 600
+    assert cache.ttl_for_run_state("running") == 60
+
+    # writing past max_bytes evicts the least recently used entries
+    for i in range(20):
+        cache.put("big-%d" % i, "x" * 100)
+    assert cache.stats()["evictions"] > 0
+    assert cache.get("big-19") == "x" * 100
+    assert cache.get("a") is None
+
+
+def test_run_history_cached(mock_server, runner, tmp_path):
+    api = Api(cache=ResponseCache(str(tmp_path)))
+    run = api.run("test/test/test")
+
+    def history_queries():
+        return [q for q in mock_server.ctx["graphql"] if "history(" in q["query"]]
+
+    assert run.history(pandas=False) == run.history(pandas=False)
+    assert len(history_queries()) == 1
+    assert api.cache.stats()["hits"] == 1
+    # file listings hold signed urls that expire
+    assert run.files()._cache_ttl is None
+
+    uncached = Api(cache=False).run("test/test/test")
+    uncached.history(pandas=False)
+    assert len(history_queries()) == 2
+
+
+def test_async_api(mock_server, runner):
+    async def fan_out(api):
+        runs = await api.runs("test/test")
+        run = await api.run("test/test/test")
+        histories = await asyncio.gather(
+            *[api.history(r, pandas=False) for r in runs + [run]]
+        )
+        files = await api.files(run)
+        return runs, histories, files
+
+    async def main():
+        async with wandb.ThreadedAsyncApi(concurrency=4) as api:
+            return await fan_out(api)
+
+    runs, histories, files = asyncio.run(main())
+    assert [r.id for r in runs] == ["test", "test"]
+    assert len(histories) == 3
+    assert histories[0][0] == {"acc": 10, "loss": 90}
+    assert [f.name for f in files] == ["weights.h5"]
+
+
 def test_run_config(mock_server, api):
     run = api.run("test/test/test")
     assert run.config == {"epochs": 10}
@@ -277,6 +447,86 @@ def test_runs_from_path_index(mock_server, api):
     assert len(runs.objects) == 4
 
 
+def test_runs_prefetch_next_page(mock_server, api):
+    mock_server.set_context("page_times", 3)
+    runs = api.runs("test/test", per_page=1)
+    assert next(runs).id == "test"
+    # only a caller that reads past the first page gets the next one prefetched
+    assert runs._next_page is None
+    next(runs)
+    assert runs._next_page is not None
+    assert len(list(runs)) == 3
+    assert runs._next_page is None
+
+
+def test_prefetch_pool_shared_across_threads(monkeypatch):
+    monkeypatch.setattr(wandb.apis.public, "_prefetch_executor", None)
+    pools = []
+    threads = [
+        threading.Thread(
+            target=lambda: pools.append(wandb.apis.public._prefetch_pool())
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(pools) == 8 and len(set(map(id, pools))) == 1
+    pools[0].shutdown()
+
+
+def test_runs_per_page_cap(mock_server, api, monkeypatch):
+    monkeypatch.setenv("WANDB_PUBLIC_API_MAX_PER_PAGE", "100")
+    assert api.runs("test/test", per_page=5000).per_page == 100
+
+
+def test_sweep_get_many(mock_server, api):
+    sweeps = wandb.apis.public.Sweep.get_many(
+        api.client, "test", "test", ["one", "two", "missing"]
+    )
+    assert sweeps["one"].id == "one"
+    assert sweeps["two"].best_loss == 0.5
+    assert sweeps["missing"] is None
+    queries = [q for q in mock_server.ctx["graphql"] if "query Sweeps(" in q["query"]]
+    assert len(queries) == 1
+
+
+def test_runs_history(mock_server, api, mocker):
+    runs = api.runs("test/test")
+    mocker.patch.object(runs, "_HISTORY_MAX_RUNS_PER_REQUEST", 1)
+    df = runs.history(samples=2, keys=["acc"])
+    ids = [run.id for run in runs]
+    assert df["run_id"].tolist() == [i for i in ids for _ in range(2)]
+    assert df["acc"].tolist() == [100, 0] * len(ids)
+    queries = [
+        q for q in mock_server.ctx["graphql"] if "query MultiRunHistory(" in q["query"]
+    ]
+    assert len(queries) == len(ids)
+
+    df = runs.history(samples=2)
+    assert set(df["run_id"]) == set(ids)
+
+
+def test_runs_fields_projection(mock_server, api):
+    runs = api.runs("test/test", fields=["summary.acc"])
+    assert runs[0].summary_metrics == {"acc": 100, "loss": 0}
+    query = mock_server.ctx["graphql"][-1]["query"]
+    assert "summaryMetrics" in query
+    assert "systemMetrics" not in query and "config" not in query
+
+
+def test_run_lazy_fields(mock_server, api):
+    attrs = {"name": "test", "state": "finished", "summaryMetrics": '{"acc": 1}'}
+    run = wandb.apis.public.Run(api.client, "test", "test", "test", attrs)
+    assert run.summary_metrics == {"acc": 1}
+    # fields left out by a projection are fetched on first access
+    assert run.config == {"epochs": 10}
+    assert "query RunBlobs(" in mock_server.ctx["graphql"][-1]["query"]
+    assert run.system_metrics == {"cpu": 100}
+    assert run.summary_metrics == {"acc": 1}
+
+
 def test_projects(mock_server, api):
     projects = api.projects("test")
     # projects doesn't provide a length for now, so we iterate
@@ -299,6 +549,32 @@ def test_reports(mock_server, api):
     assert reports[1].pageCount == 1
 
 
+def test_files_bulk_download(runner, mock_server, api):
+    with runner.isolated_filesystem():
+        files = api.run("test/test/test").files()
+        reported = []
+        paths = files.download(
+            root="out", parallelism=2, callback=lambda f, d: reported.append(d)
+        )
+        assert paths == [os.path.join("out", "weights.h5")]
+        assert os.path.exists(paths[0]) and reported == [True]
+
+        # files whose local size and md5 match are skipped
+        file = files[0]
+        file._attrs["md5"] = wandb.util.md5_file(paths[0])
+        file._attrs["sizeBytes"] = os.path.getsize(paths[0])
+        files.download(root="out", callback=lambda f, d: reported.append(d))
+        assert reported == [True, False]
+
+        file._attrs["md5"] = "stale"
+        with pytest.raises(wandb.CommError):
+            files.download(root="out")
+        files.download(
+            root="out", replace=True, callback=lambda f, d: reported.append(d)
+        )
+        assert reported == [True, False, True]
+
+
 def test_delete_file(runner, mock_server, api):
     run = api.run("test/test/test")
     file = run.files()[0]
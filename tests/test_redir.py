@@ -89,6 +89,29 @@ def test_tqdm_progbar(cls, capfd):
         assert len(o) == 1 and o[0].startswith(b"100%")
 
 
+def test_console_pump(capfd):
+    with capfd.disabled():
+        batches = []
+        pump = wandb.wandb_sdk.lib.redirect.ConsolePump(
+            cbs=[batches.append], live=False
+        )
+        out, err = CapList(), CapList()
+        wrap = wandb.wandb_sdk.lib.redirect.StreamWrapper
+        r_out = wrap("stdout", cbs=[out.append], pump=pump)
+        r_err = wrap("stderr", cbs=[err.append], pump=pump)
+        r_out.install()
+        r_err.install()
+        print("out")
+        sys.stderr.write("err\n")
+        r_err.uninstall()
+        r_out.uninstall()
+        assert out == [b"out"] and err == [b"err"]
+        sep = os.linesep.encode()
+        assert batches == [[("stderr", b"err" + sep)], [("stdout", b"out" + sep)]]
+        # the thread exits once no redirect is left
+        assert pump._thread is None
+
+
 @pytest.mark.parametrize("cls", impls)
 def test_formatting(cls, capfd):
     with capfd.disabled():
@@ -281,48 +304,43 @@ def test_offline_compression(console_settings, capfd, runner):
 
 
 @pytest.mark.parametrize("console_settings", console_modes, indirect=True)
-@pytest.mark.parametrize("numpy", [True, False])
 @pytest.mark.timeout(120)
-def test_very_long_output(console_settings, capfd, runner, numpy):
+def test_very_long_output(console_settings, capfd, runner):
     # https://wandb.atlassian.net/browse/WB-5437
     with capfd.disabled():
-        if not numpy:
-            wandb.wandb_sdk.lib.redirect.np = wandb.wandb_sdk.lib.redirect._Numpy()
-        try:
-            run = wandb.init(settings=console_settings)
-            print("LOG" * 1000000)
-            print("\x1b[31m\x1b[40m\x1b[1mHello\x01\x1b[22m\x1b[39m" * 100)
-            print("===finish===")
-            run.finish()
-            binary_log_file = (
-                os.path.join(os.path.dirname(run.dir), "run-" + run.id) + ".wandb"
-            )
-            binary_log = runner.invoke(
-                cli.sync, ["--view", "--verbose", binary_log_file]
-            ).stdout
-            assert "\\033[31m\\033[40m\\033[1mHello" in binary_log
-            assert binary_log.count("LOG") == 1000000
-            assert "===finish===" in binary_log
-        finally:
-            wandb.wandb_sdk.lib.redirect.np = np
-
-
-@pytest.mark.parametrize("console_settings", console_modes, indirect=True)
-def test_no_numpy(console_settings, capfd, runner):
-    with capfd.disabled():
-        wandb.wandb_sdk.lib.redirect.np = wandb.wandb_sdk.lib.redirect._Numpy()
-        try:
-            run = wandb.init(settings=console_settings)
-            print("\x1b[31m\x1b[40m\x1b[1mHello\x01\x1b[22m\x1b[39m")
-            run.finish()
-            binary_log_file = (
-                os.path.join(os.path.dirname(run.dir), "run-" + run.id) + ".wandb"
-            )
-            binary_log = runner.invoke(
-                cli.sync, ["--view", "--verbose", binary_log_file]
-            ).stdout
-        finally:
-            wandb.wandb_sdk.lib.redirect.np = np
+        run = wandb.init(settings=console_settings)
+        print("LOG" * 1000000)
+        print("\x1b[31m\x1b[40m\x1b[1mHello\x01\x1b[22m\x1b[39m" * 100)
+        print("===finish===")
+        run.finish()
+        binary_log_file = (
+            os.path.join(os.path.dirname(run.dir), "run-" + run.id) + ".wandb"
+        )
+        binary_log = runner.invoke(
+            cli.sync, ["--view", "--verbose", binary_log_file]
+        ).stdout
+        assert "\\033[31m\\033[40m\\033[1mHello" in binary_log
+        assert binary_log.count("LOG") == 1000000
+        assert "===finish===" in binary_log
+
+
+def test_terminal_emulator():
+    emulator = wandb.wandb_sdk.lib.redirect.TerminalEmulator()
+    for i in range(101):
+        emulator.write("\r%3d%%|%s" % (i, "#" * (i // 10)))
+    emulator.write("\n\x1b[31mred\x1b[0m plain \x1b[1mbold\x1b[22m\n")
+    assert emulator.read() == (
+        "100%|##########"
+        + os.linesep
+        + "\x1b[31mred\x1b[39m plain \x1b[1mbold"
+        + os.linesep
+    )
+    # overwrite the middle of a colored line
+    emulator.write("\x1b[A\r\x1b[2C\x1b[32mD\x1b[0m\x1b[2C  \n")
+    assert emulator.read() == (
+        "\r\x1b[31mre\x1b[32mD\x1b[39m p  in \x1b[1mbold" + os.linesep
+    )
+    assert len(emulator.buffer) == 2
 
 
 @pytest.mark.parametrize("console_settings", console_modes, indirect=True)
@@ -78,3 +78,19 @@ def test_policy_on_modified_size_rate_limited(mocked_live_policy):
 
 def test_live_policy_policy(mocked_live_policy):
     assert mocked_live_policy.policy == "live"
+
+
+def test_policy_retry_time(mocked_live_policy):
+    # nothing to retry before the first upload
+    assert mocked_live_policy.retry_time() is None
+    with open(mocked_live_policy.file_path, "w") as fp:
+        fp.write("a" * 10)
+    mocked_live_policy.save_file()
+    assert mocked_live_policy.retry_time() is None
+    with open(mocked_live_policy.file_path, "w") as fp:
+        fp.write("a" * 100)
+    os.utime(mocked_live_policy.file_path, (0, 0))
+    # rate limited change, look again when the limit expires
+    mocked_live_policy.on_modified()
+    assert mocked_live_policy._last_uploaded_size == 10
+    assert mocked_live_policy.retry_time() > time.time()
@@ -241,6 +241,24 @@ def test_save_now_write_after_policy(mocked_run, mock_server, backend_interface)
     assert len(mock_server.ctx["storage?file=test.txt"]) == 1
 
 
+@pytest.mark.parametrize("polling", [True, False])
+def test_save_now_pending_at_finish(
+    mocked_run, mock_server, mocker, backend_interface, polling
+):
+    if polling:
+        mocker.patch("wandb.filesync.dir_watcher.wd_inotify", None)
+    # the change is still coalescing when the run finishes
+    mocker.patch("wandb.filesync.dir_watcher.DirWatcher.COALESCE_SECONDS", 60)
+    with backend_interface() as interface:
+        interface.publish_files({"files": [("*.ckpt", "now")]})
+        # let the policy be registered before the file exists
+        time.sleep(1)
+        with open(os.path.join(mocked_run.dir, "test.ckpt"), "w") as f:
+            f.write("TEST TEST")
+
+    assert len(mock_server.ctx["storage?file=test.ckpt"]) == 1
+
+
 def test_save_now_existing_file(mocked_run, mock_server, backend_interface):
     with backend_interface() as interface:
         with open(os.path.join(mocked_run.dir, "test.txt"), "w") as f:
@@ -329,6 +347,44 @@ def test_output(mocked_run, mock_server, backend_interface):
     assert "Final line baby" in stream["files"]["output.log"]["content"][0]
 
 
+def test_output_batch(mocked_run, mock_server, backend_interface, parse_ctx):
+    with backend_interface() as interface:
+        interface.publish_output_batch(
+            [("stdout", "one\ntw"), ("stdout", "o\nthr"), ("stderr", "oops\n")]
+        )
+        interface.publish_output("stdout", "ee")
+
+    updates = parse_ctx(mock_server.ctx).get_filestream_file_updates()
+    chunks = {update["offset"]: update["content"] for update in updates["output.log"]}
+    lines = [line for offset in sorted(chunks) for line in chunks[offset]]
+    # partial lines are completed by later records or flushed on exit
+    assert [line.split(" ", 1)[1] for line in lines if "ERROR" not in line] == [
+        "one\n",
+        "two\n",
+        "three\n",
+    ]
+    assert [line.split(" ", 2)[2] for line in lines if "ERROR" in line] == ["oops\n"]
+    # output.log is written by the internal process
+    with open(os.path.join(mocked_run.dir, "output.log")) as f:
+        log = f.read()
+    assert log.startswith("one\ntwo\n") and "oops\n" in log
+
+
+def test_output_log_offset(internal_hm, test_settings):
+    from wandb.proto import wandb_internal_pb2 as pb
+
+    mkdir_exists_ok(test_settings.files_dir)
+    internal_hm._write_output_log(pb.OutputRecord(line="one\ntwo"))
+    # the last line of a chunk isn't written until a later chunk completes it
+    assert internal_hm._output_log_offset == len(b"one\n")
+    internal_hm._write_output_log(pb.OutputRecord(line="\nthree"))
+    assert internal_hm._output_log_offset == len(b"one\ntwo\n")
+    internal_hm._close_output_log()
+    assert internal_hm._output_log_offset == len(b"one\ntwo\nthree")
+    path = os.path.join(test_settings.files_dir, "output.log")
+    assert os.path.getsize(path) == internal_hm._output_log_offset
+
+
 def test_sync_spell_run(mocked_run, mock_server, backend_interface, parse_ctx):
     try:
         os.environ["SPELL_RUN_URL"] = "https://spell.run/foo"
@@ -437,6 +493,29 @@ def test_upgrade_removed(
         assert run_result.HasField("error") is False
 
 
+def test_check_version_concurrent_with_run(
+    mocked_run, mock_server, backend_interface, monkeypatch
+):
+    pypi_answered = threading.Event()
+
+    def check_available(current_version):
+        pypi_answered.wait(timeout=30)
+        return {"upgrade_message": "upgrade"}
+
+    monkeypatch.setattr(wandb.sdk.internal.update, "check_available", check_available)
+    with backend_interface(initial_run=False) as interface:
+        version_future = interface.communicate_check_version_async()
+        # the run is upserted while the version check is still waiting on pypi
+        run_result = interface.communicate_run(mocked_run, timeout=10)
+        assert run_result is not None
+        assert run_result.HasField("error") is False
+        assert version_future.get(timeout=0) is None
+
+        pypi_answered.set()
+        ret = version_future.get(timeout=10)
+        assert ret.response.check_version_response.upgrade_message == "upgrade"
+
+
 # TODO: test other sender methods
 
 
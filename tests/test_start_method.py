@@ -2,7 +2,9 @@
 start method tests.
 """
 
+import os
 import platform
+import subprocess
 import sys
 
 import six
@@ -70,3 +72,75 @@ def test_thread(run_full):
     cu = run_full(settings=wandb.Settings(start_method="thread"))
     telemetry = cu.telemetry
     assert telemetry and 8 in telemetry.get("8", [])
+
+
+@pytest.fixture
+def service_port():
+    grpc_server = pytest.importorskip("wandb.server.grpc_server")
+    server, port = grpc_server.start_server(grpc_server.Backend(), 0)
+    # the service runs in the test process, like the thread start method
+    wandb._set_internal_process(disable=True)
+    yield port
+    server.stop(None)
+    wandb._IS_INTERNAL_PROCESS = False
+
+
+def test_service(run_full, service_port):
+    cu = run_full(settings=wandb.Settings(service=str(service_port)))
+    # the service runs in this process, so its runs log to the mock server too
+    assert cu.summary["val"] == 1
+
+
+def test_service_shared(live_mock_server, service_port):
+    for i in range(2):
+        run = wandb.init(settings=wandb.Settings(service=str(service_port)))
+        assert run._backend._internal_pid == os.getpid()
+        run.log(dict(val=i))
+        run.finish()
+
+
+# logs a step, then holds its run open until the other run has started too
+SERVICE_RUN = """
+import os, sys, time, wandb
+run = wandb.init(project="test", settings=wandb.Settings(service=sys.argv[1]))
+run.log(dict(val=1))
+open(run.id + ".started", "w").close()
+while len([f for f in os.listdir(".") if f.endswith(".started")]) < 2:
+    time.sleep(0.1)
+run.finish()
+print(run.id, os.path.dirname(run.dir))
+"""
+
+
+def test_service_concurrent_runs(live_mock_server, service_port, tmp_path):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(wandb.__file__))]
+        + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    )
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", SERVICE_RUN, str(service_port)],
+            cwd=str(tmp_path),
+            env=env,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        for _ in range(2)
+    ]
+    runs = [p.communicate(timeout=120)[0].split()[-2:] for p in procs]
+    assert [p.returncode for p in procs] == [0, 0]
+
+    for (run_id, run_dir), (other_id, other_dir) in (runs, runs[::-1]):
+        with open(os.path.join(run_dir, "logs", "debug-internal.log")) as f:
+            log = f.read()
+        # each run's internal log only has the records of its own threads
+        assert os.path.basename(run_dir) in log
+        assert os.path.basename(other_dir) not in log
+
+
+def test_service_unavailable(run_full, monkeypatch, capsys):
+    service = pytest.importorskip("wandb.sdk.backend.service")
+    monkeypatch.setattr(service.ServiceProcess, "CONNECT_TIMEOUT", 1)
+    run_full(settings=wandb.Settings(service="localhost:1"))
+    assert "starting a wandb process instead" in capsys.readouterr().err
@@ -0,0 +1,84 @@
+"""
+system stats collection tests
+"""
+
+import time
+
+from wandb.sdk.internal import stats
+
+
+class FakeInterface(object):
+    def __init__(self):
+        self.published = []
+
+    def publish_stats(self, stats_dict):
+        self.published.append(stats_dict)
+
+
+class CountingProbe(stats.Probe):
+    interval = 0.01
+    aggregates = {"count": ("mean", "min", "max")}
+
+    def __init__(self):
+        self.n = 0
+
+    def sample(self):
+        self.n += 1
+        return {"count": self.n, "info": {"n": self.n}}
+
+
+def test_ring_buffer():
+    buf = stats.RingBuffer(3)
+    for v in [1, 2, 3, 4]:
+        buf.add(v)
+    assert len(buf) == 3
+    assert buf.reduce("mean") == 3
+    assert buf.reduce("min") == 2
+    assert buf.reduce("max") == 4
+    assert buf.reduce("last") == 4
+    buf.clear()
+    assert len(buf) == 0
+
+
+def test_probe_aggregates():
+    interface = FakeInterface()
+    probe = CountingProbe()
+    system_stats = stats.SystemStats(pid=0, interface=interface, probes=[probe])
+    for i in range(4):
+        system_stats._sample(0, probe)
+    system_stats.flush()
+    assert interface.published == [
+        {"count": 2.5, "count.min": 1, "count.max": 4, "info": {"n": 4}}
+    ]
+
+
+def test_custom_probe_sampled_on_flush():
+    interface = FakeInterface()
+    system_stats = stats.SystemStats(pid=0, interface=interface, probes=[])
+    system_stats.add_probe(CountingProbe())
+    system_stats.start()
+    system_stats.shutdown()
+    assert interface.published
+    assert interface.published[-1]["count.min"] >= 1
+
+
+def test_high_frequency_probe(tmp_path):
+    interface = FakeInterface()
+    path = str(tmp_path / "wandb-profile.bin")
+    probe = stats.HighFrequencyProbe(50, gpu_count=0, path=path)
+    assert probe.interval == 0.02
+    system_stats = stats.SystemStats(pid=0, interface=interface, probes=[probe])
+    probe.start()
+    for i in range(5):
+        system_stats._sample(0, probe)
+        time.sleep(probe.interval)
+    probe.stop()
+    system_stats.flush()
+
+    channels, samples = stats.load_profile(path)
+    assert channels == ["cpu", "cpu.iowait"]
+    assert len(samples) == 5
+    assert all(len(s) == 3 for s in samples)
+    assert {"profile.cpu", "profile.cpu.min", "profile.cpu.max"} <= set(
+        interface.published[0]
+    )
@@ -119,3 +119,62 @@ def test_tb_watcher_logdir_not_exists(mocked_run, tbwatcher_util, capsys):
     )
     _, err = capsys.readouterr()
     assert err == ""
+
+
+def test_tfrecord_iterator(tmp_path):
+    pytest.importorskip("tensorboard")
+    from tensorboard.summary.writer.record_writer import RecordWriter
+
+    path = str(tmp_path / "records")
+    with open(path, "wb") as f:
+        writer = RecordWriter(f)
+        writer.write(b"first")
+        writer.write(b"second")
+        writer.flush()
+    with open(path, "rb") as f:
+        data = f.read()
+    # the last record is only partly written
+    with open(path, "wb") as f:
+        f.write(data[:-3])
+
+    records = tb_watcher._TFRecordIterator(path)
+    assert list(records) == [b"first"]
+    with open(path, "ab") as f:
+        f.write(data[-3:])
+    assert list(records) == [b"second"]
+    assert list(records) == []
+    records.close()
+
+
+def test_tfrecord_iterator_checks_length_crc(tmp_path):
+    pytest.importorskip("tensorboard")
+    from tensorboard.compat.tensorflow_stub import errors
+    from tensorboard.summary.writer.record_writer import RecordWriter
+
+    path = str(tmp_path / "records")
+    with open(path, "wb") as f:
+        RecordWriter(f).write(b"record")
+    with open(path, "r+b") as f:
+        f.write(b"\xff")
+
+    records = tb_watcher._TFRecordIterator(path)
+    with pytest.raises(errors.DataLossError):
+        next(records)
+    records.close()
+
+
+def test_tb_event_consumer_orders_batches():
+    pytest.importorskip("tensorboard")
+    from six.moves import queue
+    from tensorboard.compat.proto import event_pb2
+
+    q = queue.Queue()
+    for times in [(1, 3, 5), (2, 4)]:
+        q.put([tb_watcher.Event(event_pb2.Event(wall_time=t), None) for t in times])
+
+    class Consumer(object):
+        _queue = q
+
+    events = tb_watcher.TBEventConsumer._get_events(Consumer())
+    assert [e.event.wall_time for e in events] == [1, 2, 3, 4, 5]
+    assert q.empty()
@@ -147,7 +147,8 @@ def run(ctx):
         "events": ['{"cpu": 10}', '{"cpu": 20}', '{"cpu": 30}'],
         "files": {
             # Special weights url by default, if requesting upload we set the name
-            "edges": [{"node": fileNode,}]
+            "edges": [{"node": fileNode,}],
+            "pageInfo": {"endCursor": None, "hasNextPage": False},
         },
         "sampledHistory": [[{"loss": 0, "acc": 100}, {"loss": 1, "acc": 0}]],
         "shouldStop": False,
@@ -476,6 +477,8 @@ def create_app(user_ctx=None):
                     }
                 }
             )
+        if "query RunBlobs(" in body["query"]:
+            return json.dumps({"data": {"project": {"run": run(ctx)}}})
         if "query Run(" in body["query"]:
             # if querying state of run, change context from running to finished
             if "RunFragment" not in body["query"] and "state" in body["query"]:
@@ -590,6 +593,27 @@ def create_app(user_ctx=None):
                 }
             )
 
+        if "query MultiRunHistory(" in body["query"]:
+            runs = {}
+            for var, name in body["variables"].items():
+                if var.startswith("run"):
+                    history = run(ctx)
+                    runs["r" + var[len("run") :]] = {
+                        "history": history["history"],
+                        "sampledHistory": history["sampledHistory"],
+                    }
+            return json.dumps({"data": {"project": runs}})
+        if "query Sweeps(" in body["query"]:
+            sweeps = {}
+            for var, name in body["variables"].items():
+                if var.startswith("name") and name != "missing":
+                    sweeps["s" + var[len("name") :]] = {
+                        "id": name,
+                        "name": name,
+                        "bestLoss": 0.5,
+                        "config": yaml.dump({"method": "random"}),
+                    }
+            return json.dumps({"data": {"project": sweeps}})
         if "query Sweep(" in body["query"]:
             return json.dumps(
                 {
@@ -15,6 +15,22 @@ def _cache_writer(cache_path):
         f.write("".join(random.choice("0123456") for _ in range(10)))
 
 
+def _locked_cache_writer(cache_path):
+    etag = "abcdef"
+    cache = wandb_sdk.wandb_artifacts.ArtifactsCache(cache_path)
+    path, hit, opener = cache.check_etag_obj_path(etag, 10)
+    if hit:
+        return False
+    with cache.lock(path):
+        _, hit, _ = cache.check_etag_obj_path(etag, 10)
+        if hit:
+            return False
+        time.sleep(0.1)
+        with opener() as f:
+            f.write("0123456789")
+        return True
+
+
 def test_check_md5_obj_path(runner):
     with runner.isolated_filesystem():
         os.mkdir("cache")
@@ -68,6 +84,32 @@ def test_check_write_parallel(runner):
         assert os.listdir(path) == ["cdef"]
 
 
+def test_lock_writes_once(runner):
+    with runner.isolated_filesystem() as t:
+        cache = os.path.join(t, "cache")
+        num_parallel = 5
+
+        p = Pool(num_parallel)
+        writes = p.map(_locked_cache_writer, [cache for _ in range(num_parallel)])
+        p.close()
+        p.join()
+
+        assert sum(writes) == 1
+        assert os.listdir(os.path.join(cache, "locks")) == []
+
+
+def test_cleanup_prunes_stale_locks(runner):
+    with runner.isolated_filesystem():
+        cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+        with cache.lock("held"):
+            os.makedirs(os.path.join("cache", "locks"), exist_ok=True)
+            with open(os.path.join("cache", "locks", "stale"), "w"):
+                pass
+            cache.cleanup(0)
+            assert len(os.listdir(os.path.join("cache", "locks"))) == 1
+        assert os.listdir(os.path.join("cache", "locks")) == []
+
+
 def test_artifacts_cache_cleanup_empty(runner):
     with runner.isolated_filesystem():
         os.mkdir("cache")
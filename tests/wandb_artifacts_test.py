@@ -1,7 +1,9 @@
 import base64
+from concurrent import futures
 import hashlib
 import os
 import sys
+import threading
 import pytest
 from wandb import util
 import wandb
@@ -43,7 +45,26 @@ def mock_boto(artifact, path=False):
         def __init__(self, *args, **kwargs):
             self.objects = S3Objects()
 
+    class S3Paginator(object):
+        def paginate(self, **kwargs):
+            objs = [S3Object(), S3Object(name="my_other_object.pb")]
+            yield {
+                "Contents": [
+                    {"Key": obj.key, "ETag": obj.e_tag, "Size": obj.content_length}
+                    for obj in objs
+                ]
+            }
+
+    class S3Client(object):
+        def get_paginator(self, name):
+            return S3Paginator()
+
+    class S3Meta(object):
+        client = S3Client()
+
     class S3Resource(object):
+        meta = S3Meta()
+
         def Object(self, bucket, key):
             return S3Object()
 
@@ -72,7 +93,14 @@ def mock_gcs(artifact, path=False):
             return None if path else Blob()
 
         def list_blobs(self, *args, **kwargs):
-            return [Blob(), Blob(name="my_other_object.pb")]
+            return BlobIterator([Blob(), Blob(name="my_other_object.pb")])
+
+    class BlobIterator(list):
+        prefixes = set()
+
+        @property
+        def pages(self):
+            yield self
 
     class GSClient(object):
         def bucket(self, bucket):
@@ -364,10 +392,11 @@ def test_add_s3_reference_path(runner, mocker, capsys):
 
         assert artifact.digest == "17955d00a20e1074c3bc96c74b724bfe"
         manifest = artifact.manifest.to_manifest_json()
+        # Listings don't include version ids, only the etag.
         assert manifest["contents"]["my_object.pb"] == {
             "digest": "1234567890abcde",
             "ref": "s3://my-bucket/my_object.pb",
-            "extra": {"etag": "1234567890abcde", "versionID": "1"},
+            "extra": {"etag": "1234567890abcde"},
             "size": 10,
         }
         _, err = capsys.readouterr()
@@ -1197,3 +1226,289 @@ def test_communicate_artifact(publish_util, mocked_run):
     artifact_publish = dict(run=mocked_run, artifact=artifact, aliases=["latest"])
     ctx_util = publish_util(artifacts=[artifact_publish])
     assert len(set(ctx_util.manifests_created_ids)) == 1
+
+
+def test_manifest_sorted_paths_follow_entries():
+    manifest = wandb.wandb_sdk.wandb_artifacts.ArtifactManifestV1(None, None)
+    for name in ["b", "a"]:
+        manifest.add_entry(
+            wandb.wandb_sdk.wandb_artifacts.ArtifactManifestEntry(name, None, name)
+        )
+    assert manifest.sorted_paths() == ["a", "b"]
+
+    # changed directly, without add_entry or remove_entry
+    entry = manifest.entries.pop("b")
+    manifest.entries["c"] = entry
+    assert manifest.sorted_paths() == ["a", "c"]
+
+
+def test_plan_download_parts():
+    size = 100 * 1024 * 1024 + 3
+    parts = wandb.wandb_sdk.wandb_artifacts._plan_download_parts(size)
+    assert parts[0][0] == 0
+    assert parts[-1][1] == size - 1
+    for (_, prev_end), (start, _) in zip(parts, parts[1:]):
+        assert start == prev_end + 1
+
+
+class _RangeResponse(object):
+    def __init__(self, content, range_header=None, ranged=True):
+        self.status_code = 200
+        self._content = content
+        if range_header is not None and ranged:
+            start, end = range_header[len("bytes=") :].split("-")
+            self._content = content[int(start) : int(end) + 1]
+            self.status_code = 206
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._content), chunk_size):
+            yield self._content[i : i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class _RangeSession(object):
+    def __init__(self, content, ranged=True):
+        self.content = content
+        self.ranged = ranged
+        self.requests = []
+        self.responses = []
+
+    def get(self, url, headers=None, **kwargs):
+        range_header = (headers or {}).get("Range")
+        self.requests.append(range_header)
+        self.responses.append(_RangeResponse(self.content, range_header, self.ranged))
+        return self.responses[-1]
+
+
+@pytest.mark.parametrize("ranged", [True, False])
+def test_load_file_multipart(runner, monkeypatch, ranged):
+    wandb_artifacts = wandb.wandb_sdk.wandb_artifacts
+    monkeypatch.setattr(wandb_artifacts, "_MULTIPART_DOWNLOAD_THRESHOLD", 1024)
+    monkeypatch.setattr(wandb_artifacts, "_MULTIPART_DOWNLOAD_MIN_PART_SIZE", 1000)
+    with runner.isolated_filesystem():
+        content = os.urandom(10 * 1024 + 7)
+        digest = base64.b64encode(hashlib.md5(content).digest()).decode("ascii")
+        policy = wandb_artifacts.WandbStoragePolicy()
+        policy._cache = wandb_artifacts.ArtifactsCache("cache")
+        policy._session = _RangeSession(content, ranged=ranged)
+        artifact = wandb.Artifact("multipart", "dataset")
+        artifact._logged_artifact = type("Logged", (), {"entity": "ent"})()
+        entry = wandb_artifacts.ArtifactManifestEntry(
+            "big.bin", None, digest, size=len(content)
+        )
+
+        path = policy.load_file(artifact, "big.bin", entry)
+
+        with open(path, "rb") as f:
+            assert f.read() == content
+        if ranged:
+            assert len(policy._session.requests) == 11
+        else:
+            assert policy._session.requests[-1] is None
+
+
+def test_load_file_multipart_shared_pool(runner, monkeypatch):
+    wandb_artifacts = wandb.wandb_sdk.wandb_artifacts
+    monkeypatch.setattr(wandb_artifacts, "_MULTIPART_DOWNLOAD_THRESHOLD", 1024)
+    monkeypatch.setattr(wandb_artifacts, "_MULTIPART_DOWNLOAD_MIN_PART_SIZE", 1000)
+    monkeypatch.setattr(wandb_artifacts, "_MULTIPART_DOWNLOAD_WORKERS", 2)
+    monkeypatch.setattr(wandb_artifacts, "_multipart_executor", None)
+
+    class ThreadSession(_RangeSession):
+        def __init__(self, content):
+            super(ThreadSession, self).__init__(content)
+            self.threads = set()
+
+        def get(self, url, headers=None, **kwargs):
+            self.threads.add(threading.current_thread().name)
+            return super(ThreadSession, self).get(url, headers, **kwargs)
+
+    with runner.isolated_filesystem():
+        content = os.urandom(10 * 1024 + 7)
+        digest = base64.b64encode(hashlib.md5(content).digest()).decode("ascii")
+        policy = wandb_artifacts.WandbStoragePolicy()
+        policy._cache = wandb_artifacts.ArtifactsCache("cache")
+        policy._session = ThreadSession(content)
+        artifact = wandb.Artifact("multipart", "dataset")
+        artifact._logged_artifact = type("Logged", (), {"entity": "ent"})()
+        entry = wandb_artifacts.ArtifactManifestEntry(
+            "big.bin", None, digest, size=len(content)
+        )
+        path = policy.load_file(artifact, "big.bin", entry)
+
+        with open(path, "rb") as f:
+            assert f.read() == content
+        caller = threading.current_thread().name
+        assert 0 < len(policy._session.threads - {caller}) <= 2
+
+
+def test_load_file_multipart_closes_cancelled_first_part(runner, monkeypatch):
+    wandb_artifacts = wandb.wandb_sdk.wandb_artifacts
+    monkeypatch.setattr(wandb_artifacts, "_MULTIPART_DOWNLOAD_THRESHOLD", 1024)
+    monkeypatch.setattr(wandb_artifacts, "_MULTIPART_DOWNLOAD_MIN_PART_SIZE", 1000)
+
+    class QueuedFuture(futures.Future):
+        def cancel(self):
+            # what the executor does once it reaches a cancelled work item
+            cancelled = super(QueuedFuture, self).cancel()
+            if cancelled:
+                self.set_running_or_notify_cancel()
+            return cancelled
+
+    class FailingPool(object):
+        # part 1 fails before part 0 ever runs
+        def submit(self, fn, part_index):
+            future = QueuedFuture()
+            if part_index == 1:
+                future.set_exception(wandb.CommError("part failed"))
+            return future
+
+    monkeypatch.setattr(wandb_artifacts, "_multipart_pool", FailingPool)
+    with runner.isolated_filesystem():
+        content = os.urandom(10 * 1024 + 7)
+        policy = wandb_artifacts.WandbStoragePolicy()
+        policy._session = _RangeSession(content)
+        with open("big.bin", "wb") as f:
+            with pytest.raises(wandb.CommError):
+                policy._download_multipart("https://x/big.bin", len(content), f)
+        assert len(policy._session.responses) == 1
+        assert policy._session.responses[0].closed
+
+
+def test_incremental_prunes_unchanged_entries():
+    def manifest_json(contents):
+        return {
+            "version": 1,
+            "storagePolicy": "wandb-storage-policy-v1",
+            "storagePolicyConfig": {},
+            "contents": contents,
+        }
+
+    base = manifest_json(
+        {
+            "same.txt": {"digest": "aaaa", "birthArtifactID": "base"},
+            "changed.txt": {"digest": "bbbb", "birthArtifactID": "base"},
+            "ref.txt": {"digest": "eeee", "ref": "s3://bucket/old"},
+        }
+    )
+
+    class FakeApi(object):
+        def artifact_manifest_json(self, artifact_id):
+            assert artifact_id == "base-id"
+            return base
+
+    saver = wandb.wandb_sdk.internal.artifacts.ArtifactSaver(
+        api=FakeApi(),
+        digest="",
+        manifest_json=manifest_json(
+            {
+                "same.txt": {"digest": "aaaa"},
+                "changed.txt": {"digest": "cccc"},
+                "added.txt": {"digest": "dddd"},
+                "ref.txt": {"digest": "eeee", "ref": "s3://bucket/new"},
+            }
+        ),
+        file_pusher=None,
+    )
+    saver._prune_unchanged_entries("base-id")
+
+    assert sorted(saver._manifest.entries) == ["added.txt", "changed.txt", "ref.txt"]
+
+
+def test_incremental_keeps_entries_without_base_manifest():
+    class FakeApi(object):
+        def artifact_manifest_json(self, artifact_id):
+            raise wandb.CommError("manifest not found")
+
+    saver = wandb.wandb_sdk.internal.artifacts.ArtifactSaver(
+        api=FakeApi(),
+        digest="",
+        manifest_json={
+            "version": 1,
+            "storagePolicy": "wandb-storage-policy-v1",
+            "storagePolicyConfig": {},
+            "contents": {"a.txt": {"digest": "aaaa"}, "b.txt": {"digest": "bbbb"}},
+        },
+        file_pusher=None,
+    )
+    saver._prune_unchanged_entries("base-id")
+
+    assert sorted(saver._manifest.entries) == ["a.txt", "b.txt"]
+
+
+def test_manifest_lazy_entries():
+    manifest = wandb.wandb_sdk.wandb_artifacts.ArtifactManifestV1.from_manifest_json(
+        None,
+        {
+            "version": 1,
+            "storagePolicy": "wandb-storage-policy-v1",
+            "storagePolicyConfig": {},
+            "contents": {
+                "b.txt": {"digest": "bbbb", "size": 2},
+                "a.txt": {"digest": "aaaa", "size": 1},
+                "c.txt": {"digest": "cccc", "ref": "s3://bucket/c.txt"},
+            },
+        },
+    )
+
+    assert manifest.get_entry_by_path("a.txt").digest == "aaaa"
+    assert manifest.get_entry_by_path("missing.txt") is None
+    assert [e.path for e in manifest.get_reference_entries()] == ["c.txt"]
+    assert sorted(manifest._entries) == ["a.txt", "c.txt"]
+
+    assert manifest.get_entry_by_path("a.txt") is manifest.entries["a.txt"]
+    assert list(manifest.to_manifest_json()["contents"]) == ["a.txt", "b.txt", "c.txt"]
+    digest = manifest.digest()
+    manifest.remove_entry("b.txt")
+    assert manifest.digest() != digest
+    assert not hasattr(manifest.entries["a.txt"], "__dict__")
+
+
+def test_list_prefix_concurrently():
+    tree = {
+        "data/": (["data/a"], ["data/x/", "data/y/"]),
+        "data/x/": (["data/x/b", "data/x/c"], ["data/x/z/"]),
+        "data/x/z/": (["data/x/z/d"], []),
+        "data/y/": (["data/y/e"], []),
+    }
+    list_prefix = wandb.wandb_sdk.wandb_artifacts._list_prefix_concurrently
+
+    def list_level(prefix, budget):
+        objects, prefixes = tree[prefix]
+        budget.take(len(objects))
+        return objects, prefixes
+
+    objects = list_prefix(list_level, "data/", 100)
+    assert sorted(objects) == [
+        "data/a",
+        "data/x/b",
+        "data/x/c",
+        "data/x/z/d",
+        "data/y/e",
+    ]
+    assert len(list_prefix(list_level, "data/", 2)) == 2
+
+
+def test_list_prefix_stops_paging():
+    pages = [["k%d-%d" % (page, i) for i in range(100)] for page in range(100)]
+    listed = []
+
+    def list_level(prefix, budget):
+        # a flat prefix, paged like ListObjectsV2
+        objects = []
+        for page in pages:
+            listed.append(page)
+            objects.extend(page)
+            if not budget.take(len(page)):
+                break
+        return objects, []
+
+    list_prefix = wandb.wandb_sdk.wandb_artifacts._list_prefix_concurrently
+    assert len(list_prefix(list_level, "flat/", 150)) == 150
+    assert len(listed) == 2
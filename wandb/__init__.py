@@ -54,7 +54,7 @@ AlertLevel = wandb_sdk.AlertLevel
 Settings = wandb_sdk.Settings
 Config = wandb_sdk.Config
 
-from wandb.apis import InternalApi, PublicApi
+from wandb.apis import InternalApi
 from wandb.errors import CommError, UsageError
 
 _preinit = wandb_lib.preinit
@@ -77,13 +77,46 @@ from wandb.data_types import Histogram
 from wandb.data_types import Classes
 from wandb.data_types import JoinedTable
 
-from wandb.wandb_agent import agent
+# These are rarely needed by a training script and slow down `import wandb`, so
+# they are only imported the first time they are accessed. Maps each name to the
+# module it comes from and the attribute of that module, or None for the module.
+_lazy_attrs = {
+    "PublicApi": ("wandb.apis", "PublicApi"),
+    "Api": ("wandb.apis", "PublicApi"),
+    "ThreadedAsyncApi": ("wandb.apis", "ThreadedAsyncApi"),
+    "agent": ("wandb.wandb_agent", "agent"),
+    "visualize": ("wandb.viz", "visualize"),
+    "plot": ("wandb.plot", None),
+    "plots": ("wandb.plots", None),  # deprecating this
+    "sagemaker_auth": ("wandb.integration.sagemaker", "sagemaker_auth"),
+}
 
-# from wandb.core import *
-from wandb.viz import visualize
-from wandb import plot
-from wandb import plots  # deprecating this
-from wandb.integration.sagemaker import sagemaker_auth
+
+def _load_lazy_attr(name):
+    import importlib
+
+    module_name, attr = _lazy_attrs[name]
+    value = importlib.import_module(module_name)
+    if attr is not None:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name in _lazy_attrs:
+            return _load_lazy_attr(name)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_lazy_attrs))
+
+
+else:
+    for _name in _lazy_attrs:
+        _load_lazy_attr(_name)
 
 
 # Used to make sure we don't use some code in the incorrect process context
@@ -120,7 +153,6 @@ def _assert_is_user_process():
 # agent()
 
 # globals
-Api = PublicApi
 api = InternalApi()
 run = None
 config = _preinit.PreInitCallable(
@@ -199,6 +231,7 @@ __all__ = [
     "summary",
     "join",
     "Api",
+    "ThreadedAsyncApi",
     "Graph",
     "Image",
     "Plotly",
@@ -27,11 +27,44 @@ if env.ssl_disabled():
 
     requests.Session.merge_environment_settings = merge_environment_settings
 
+import importlib
+import sys
+
 reset_path = util.vendor_setup()
 
 from .internal import Api as InternalApi  # noqa
-from .public import Api as PublicApi  # noqa
 
 reset_path()
 
-__all__ = ["InternalApi", "PublicApi"]
+
+def _load_public_api():
+    """Imports the public api modules, which are slow to import and rarely needed
+    by a training script, and returns the names they provide"""
+    reset_path = util.vendor_setup()
+    try:
+        public = importlib.import_module(".public", __name__)
+        public_async = importlib.import_module(".public_async", __name__)
+    finally:
+        reset_path()
+    return {
+        "public": public,
+        "public_async": public_async,
+        "PublicApi": public.Api,
+        "ThreadedAsyncApi": public_async.ThreadedAsyncApi,
+    }
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name in ("public", "public_async", "PublicApi", "ThreadedAsyncApi"):
+            attrs = _load_public_api()
+            globals().update(attrs)
+            return attrs[name]
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+else:
+    globals().update(_load_public_api())
+
+__all__ = ["InternalApi", "PublicApi", "ThreadedAsyncApi"]
@@ -1,3 +1,6 @@
+import array
+import collections
+from concurrent import futures
 import datetime
 from functools import partial
 import json
@@ -7,13 +10,17 @@ import platform
 import re
 import shutil
 import tempfile
+import threading
 import time
 from typing import Optional
+import weakref
 
 from dateutil.relativedelta import relativedelta
 from gql import Client, gql
 from gql.client import RetryError
 from gql.transport.requests import RequestsHTTPTransport
+from graphql.execution import ExecutionResult
+from graphql.language.printer import print_ast
 import requests
 import six
 from six.moves import urllib
@@ -21,6 +28,7 @@ import wandb
 from wandb import __version__, env, util
 from wandb.apis.internal import Api as InternalApi
 from wandb.apis.normalize import normalize_exceptions
+from wandb.apis.response_cache import ResponseCache
 from wandb.data_types import WBValue
 from wandb.errors import LaunchError
 from wandb.errors.term import termlog
@@ -69,6 +77,36 @@ RUN_FRAGMENT = """fragment RunFragment on Run {
     historyKeys
 }"""
 
+# run fields holding large JSON blobs, keyed by the names they can be projected with
+RUN_BLOB_FIELDS = {
+    "config": "config",
+    "rawconfig": "config",
+    "summary": "summaryMetrics",
+    "summary_metrics": "summaryMetrics",
+    "summaryMetrics": "summaryMetrics",
+    "system_metrics": "systemMetrics",
+    "systemMetrics": "systemMetrics",
+    "history_keys": "historyKeys",
+    "historyKeys": "historyKeys",
+}
+
+
+def _run_fragment(fields=None):
+    """Returns RUN_FRAGMENT with only the JSON blob fields needed by `fields`,
+    e.g. ["summary.val_acc", "config.lr"] keeps summaryMetrics and config."""
+    if fields is None:
+        return RUN_FRAGMENT
+    selected = set()
+    for field in fields:
+        name = field.split(".", 1)[0]
+        if name in RUN_BLOB_FIELDS:
+            selected.add(RUN_BLOB_FIELDS[name])
+    dropped = set(RUN_BLOB_FIELDS.values()) - selected
+    return "\n".join(
+        line for line in RUN_FRAGMENT.split("\n") if line.strip() not in dropped
+    )
+
+
 FILE_FRAGMENT = """fragment RunFilesFragment on Run {
     files(names: $fileNames, after: $fileCursor, first: $fileLimit) {
         edges {
@@ -161,20 +199,75 @@ ARTIFACT_FILES_FRAGMENT = """fragment ArtifactFilesFragment on Artifact {
 }"""
 
 
+class PooledRequestsHTTPTransport(RequestsHTTPTransport):
+    """RequestsHTTPTransport that keeps connections to the server in a pool
+    instead of opening a new one for every query."""
+
+    def __init__(self, url, max_connections=10, **kwargs):
+        super(PooledRequestsHTTPTransport, self).__init__(url, **kwargs)
+        self._max_connections = max_connections
+        self._session = None
+
+    @property
+    def session(self):
+        # created on first use, so an Api that's never queried opens nothing
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self._max_connections,
+                pool_maxsize=self._max_connections,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def execute(self, document, variable_values=None, timeout=None):
+        payload = {"query": print_ast(document), "variables": variable_values or {}}
+        response = self.session.post(
+            self.url,
+            headers=self.headers,
+            auth=self.auth,
+            cookies=self.cookies,
+            timeout=timeout or self.default_timeout,
+            **{"json" if self.use_json else "data": payload},
+        )
+        response.raise_for_status()
+
+        result = response.json()
+        assert (
+            "errors" in result or "data" in result
+        ), 'Received non-compatible response "{}"'.format(result)
+        return ExecutionResult(errors=result.get("errors"), data=result.get("data"))
+
+
 class RetryingClient(object):
-    def __init__(self, client):
+    def __init__(self, client, cache=None):
         self._client = client
+        self.cache = cache
 
     @property
     def app_url(self):
         return util.app_url(self._client.transport.url).replace("/graphql", "/")
 
+    def execute(self, *args, cache_ttl=None, **kwargs):
+        """Executes a query, serving it from the response cache when one is configured
+        and the caller passes how long the response stays valid in `cache_ttl`."""
+        if self.cache is None or cache_ttl is None:
+            return self._execute(*args, **kwargs)
+        key = ResponseCache.query_key(args[0], kwargs.get("variable_values"))
+        response = self.cache.get(key)
+        if response is None:
+            response = self._execute(*args, **kwargs)
+            self.cache.put(key, response, cache_ttl)
+        return response
+
     @retry.retriable(
         retry_timedelta=RETRY_TIMEDELTA,
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def execute(self, *args, **kwargs):
+    def _execute(self, *args, **kwargs):
         try:
             return self._client.execute(*args, **kwargs)
         except requests.exceptions.ReadTimeout:
@@ -200,6 +293,12 @@ class Api(object):
         overrides: (dict) You can set `base_url` if you are using a wandb server
             other than https://api.wandb.ai.
             You can also set defaults for `entity`, `project`, and `run`.
+        cache: (bool or ResponseCache) Keep history and artifact manifests
+            on disk so repeated queries don't go back to the server. Data of finished
+            runs is kept for a day, data of running runs expires after a minute.
+            Defaults to the WANDB_PUBLIC_API_CACHE environment variable.
+        max_connections: (int) Number of connections to the server kept open for
+            reuse. Defaults to 10.
     """
 
     _HTTP_TIMEOUT = env.get_http_timeout(9)
@@ -222,7 +321,13 @@ class Api(object):
     """
     )
 
-    def __init__(self, overrides={}, timeout: Optional[int] = None):
+    def __init__(
+        self,
+        overrides={},
+        timeout: Optional[int] = None,
+        cache=None,
+        max_connections: int = 10,
+    ):
         self.settings = InternalApi().settings()
         if self.api_key is None:
             wandb.login()
@@ -239,7 +344,8 @@ class Api(object):
         self._default_entity = None
         self._timeout = timeout if timeout is not None else self._HTTP_TIMEOUT
         self._base_client = Client(
-            transport=RequestsHTTPTransport(
+            transport=PooledRequestsHTTPTransport(
+                max_connections=max_connections,
                 headers={"User-Agent": self.user_agent, "Use-Admin-Privileges": "true"},
                 use_json=True,
                 # this timeout won't apply when the DNS lookup fails. in that case, it will be 60s
@@ -249,7 +355,11 @@ class Api(object):
                 url="%s/graphql" % self.settings["base_url"],
             )
         )
-        self._client = RetryingClient(self._base_client)
+        if cache is None:
+            cache = env.get_public_api_cache()
+        if cache is True:
+            cache = ResponseCache()
+        self._client = RetryingClient(self._base_client, cache=cache or None)
 
     def create_run(self, **kwargs):
         """Create a new run"""
@@ -284,6 +394,11 @@ class Api(object):
     def client(self):
         return self._client
 
+    @property
+    def cache(self):
+        """The `ResponseCache` queries are served from, or None if caching is off."""
+        return self._client.cache
+
     @property
     def user_agent(self):
         return "W&B Public Client %s" % __version__
@@ -424,7 +539,9 @@ class Api(object):
             )
         return self._reports[key]
 
-    def runs(self, path="", filters=None, order="-created_at", per_page=50):
+    def runs(
+        self, path="", filters=None, order="-created_at", per_page=50, fields=None
+    ):
         """
         Return a set of runs from a project that match the filters provided.
 
@@ -465,13 +582,18 @@ class Api(object):
                 If you prepend order with a + order is ascending.
                 If you prepend order with a - order is descending (default).
                 The default order is run.created_at from newest to oldest.
+            per_page: (int) number of runs to fetch per request, capped at
+                WANDB_PUBLIC_API_MAX_PER_PAGE (1000 by default).
+            fields: ([str]) only download the config, summary and system metrics of runs
+                when they are listed here, e.g. `["summary.val_acc", "config.lr"]`.
+                Fields that weren't requested are fetched for a run on first access.
 
         Returns:
             A `Runs` object, which is an iterable collection of `Run` objects.
         """
         entity, project = self._parse_project_path(path)
         filters = filters or {}
-        key = path + str(filters) + str(order)
+        key = path + str(filters) + str(order) + str(fields)
         if not self._runs.get(key):
             self._runs[key] = Runs(
                 self.client,
@@ -480,6 +602,7 @@ class Api(object):
                 filters=filters,
                 order=order,
                 per_page=per_page,
+                fields=fields,
             )
         return self._runs[key]
 
@@ -588,8 +711,22 @@ class Attrs(object):
             )
 
 
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _prefetch_pool():
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = futures.ThreadPoolExecutor(max_workers=4)
+    return _prefetch_executor
+
+
 class Paginator(object):
     QUERY = None
+    # how long pages may be served from the response cache, None to never cache
+    _cache_ttl = None
 
     def __init__(self, client, variables, per_page=None):
         self.client = client
@@ -598,9 +735,12 @@ class Paginator(object):
         self.per_page = per_page
         if self.per_page is None:
             self.per_page = 50
+        self.per_page = min(self.per_page, env.get_public_api_max_per_page())
         self.objects = []
         self.index = -1
         self.last_response = None
+        self._next_page = None  # future for the page after last_response
+        self._pages_loaded = 0
 
     def __iter__(self):
         self.index = -1
@@ -631,16 +771,38 @@ class Paginator(object):
     def update_variables(self):
         self.variables.update({"perPage": self.per_page, "cursor": self.cursor})
 
-    def _load_page(self):
-        if not self.more:
-            return False
-        self.update_variables()
-        self.last_response = self.client.execute(
-            self.QUERY, variable_values=self.variables
+    def _fetch_page(self, variables):
+        return self.client.execute(
+            self.QUERY, variable_values=variables, cache_ttl=self._cache_ttl
         )
+
+    def _load_page(self):
+        if self._next_page is not None:
+            next_page, self._next_page = self._next_page, None
+            self.last_response = next_page.result()
+        else:
+            if not self.more:
+                return False
+            self.update_variables()
+            self.last_response = self._fetch_page(self.variables)
+        self._pages_loaded += 1
         self.objects.extend(self.convert_objects())
         return True
 
+    def _prefetch_page(self):
+        """Starts fetching the page after the last one loaded in the background,
+        so iterating doesn't wait on a round trip at every page boundary.
+
+        This starts with the third page, callers that only look at the first
+        page, like `wandb artifact ls`, don't pay for a page they never read.
+        """
+        if self._next_page is not None or not self.more or self._pages_loaded < 2:
+            return
+        self.update_variables()
+        self._next_page = _prefetch_pool().submit(
+            self._fetch_page, dict(self.variables)
+        )
+
     def __getitem__(self, index):
         loaded = True
         while loaded and index > len(self.objects) - 1:
@@ -654,6 +816,7 @@ class Paginator(object):
                 raise StopIteration
             if len(self.objects) <= self.index:
                 raise StopIteration
+            self._prefetch_page()
         return self.objects[self.index]
 
     next = __next__
@@ -752,8 +915,7 @@ class Runs(Paginator):
     This is generally used indirectly via the `Api`.runs method
     """
 
-    QUERY = gql(
-        """
+    _QUERY_TEMPLATE = """
         query Runs($project: String!, $entity: String!, $cursor: String, $perPage: Int = 50, $order: String, $filters: JSONString) {
             project(name: $project, entityName: $entity) {
                 runCount(filters: $filters)
@@ -774,14 +936,21 @@ class Runs(Paginator):
         }
         %s
         """
-        % RUN_FRAGMENT
-    )
+    QUERY = gql(_QUERY_TEMPLATE % RUN_FRAGMENT)
+    # bounds on the runs sampled by a single request in `history`
+    _HISTORY_VALUES_PER_REQUEST = 1000000
+    _HISTORY_MAX_RUNS_PER_REQUEST = 100
 
-    def __init__(self, client, entity, project, filters={}, order=None, per_page=50):
+    def __init__(
+        self, client, entity, project, filters={}, order=None, per_page=50, fields=None,
+    ):
         self.entity = entity
         self.project = project
         self.filters = filters
         self.order = order
+        self.fields = fields
+        if fields is not None:
+            self.QUERY = gql(self._QUERY_TEMPLATE % _run_fragment(fields))
         self._sweeps = {}
         variables = {
             "project": self.project,
@@ -826,25 +995,120 @@ class Runs(Paginator):
             )
             objs.append(run)
 
-            if run.sweep_name:
-                if run.sweep_name in self._sweeps:
-                    sweep = self._sweeps[run.sweep_name]
-                else:
-                    sweep = Sweep.get(
-                        self.client,
-                        self.entity,
-                        self.project,
-                        run.sweep_name,
-                        withRuns=False,
-                    )
-                    self._sweeps[run.sweep_name] = sweep
-
-                if sweep is None:
-                    continue
-                run.sweep = sweep
+        # look up every sweep that's new on this page in a single query
+        sweep_names = set(run.sweep_name for run in objs if run.sweep_name)
+        new_sweep_names = sorted(sweep_names - set(self._sweeps))
+        if new_sweep_names:
+            self._sweeps.update(
+                Sweep.get_many(self.client, self.entity, self.project, new_sweep_names)
+            )
+        for run in objs:
+            if run.sweep_name and self._sweeps.get(run.sweep_name) is not None:
+                run.sweep = self._sweeps[run.sweep_name]
 
         return objs
 
+    def history_table(
+        self, keys=None, page_size=1000, min_step=None, max_step=None, format="pandas"
+    ):
+        """
+        Returns the history of every run as one table with a `run_id` column.
+
+        Arguments are the same as `Run.history_table`.
+        """
+        columns = _HistoryColumns()
+        for run in self:
+            for row in run.scan_history(
+                keys=keys, page_size=page_size, min_step=min_step, max_step=max_step
+            ):
+                columns.append(row, extra={"run_id": run.id})
+        return columns.to_table(format)
+
+    @normalize_exceptions
+    def history(
+        self, samples=500, keys=None, x_axis="_step", format="pandas", concurrency=4
+    ):
+        """
+        Returns sampled history metrics for every run as one long table with a
+        `run_id` column.
+
+        Runs are sampled server side like `Run.history`, but many runs share
+        each request and requests are sent concurrently.
+
+        Arguments:
+            samples (int, optional): The number of samples to return per run
+            keys (list, optional): Only return metrics for specific keys
+            x_axis (str, optional): Use this metric as the xAxis defaults to _step
+            format (str, optional): "pandas", "arrow" or "numpy", see `Run.history_table`
+            concurrency (int, optional): Number of requests to send at once
+
+        Returns:
+            The sampled history records of all runs in the requested format.
+        """
+        runs = list(self)
+        # keep (samples x keys x runs) per request bounded, we can't know the
+        # number of keys of a full history row so assume a wide one
+        width = len(keys) + 1 if keys else 50
+        per_request = self._HISTORY_VALUES_PER_REQUEST // (max(samples, 1) * width)
+        per_request = max(1, min(per_request, self._HISTORY_MAX_RUNS_PER_REQUEST))
+        chunks = [runs[i : i + per_request] for i in range(0, len(runs), per_request)]
+
+        with futures.ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            results = executor.map(
+                lambda chunk: self._sampled_history(chunk, samples, keys, x_axis),
+                chunks,
+            )
+            columns = _HistoryColumns()
+            for chunk, histories in zip(chunks, results):
+                for run, rows in zip(chunk, histories):
+                    for row in rows:
+                        columns.append(row, extra={"run_id": run.id})
+        return columns.to_table(format)
+
+    def _sampled_history(self, runs, samples, keys, x_axis):
+        """Fetches the sampled history of several runs with one aliased query."""
+        variables = {"entity": self.entity, "project": self.project}
+        fields = []
+        for i, run in enumerate(runs):
+            variables["run%d" % i] = run.id
+            if keys:
+                fields.append(
+                    "r%d: run(name: $run%d) { sampledHistory(specs: $specs) }"
+                )
+            else:
+                fields.append("r%d: run(name: $run%d) { history(samples: $samples) }")
+        if keys:
+            variables["specs"] = [
+                json.dumps({"keys": [x_axis] + keys, "samples": samples})
+            ]
+            params = "$specs: [JSONString!]!"
+        else:
+            variables["samples"] = samples
+            params = "$samples: Int"
+        query = gql(
+            """
+        query MultiRunHistory($project: String!, $entity: String!, %s, %s) {
+            project(name: $project, entityName: $entity) {
+                %s
+            }
+        }
+        """
+            % (
+                params,
+                ", ".join("$run%d: String!" % i for i in range(len(runs))),
+                "\n".join(field % (i, i) for i, field in enumerate(fields)),
+            )
+        )
+        response = self.client.execute(query, variable_values=variables)
+        histories = []
+        for i in range(len(runs)):
+            run = (response.get("project") or {}).get("r%d" % i) or {}
+            if keys:
+                histories.append((run.get("sampledHistory") or [[]])[0])
+            else:
+                histories.append([json.loads(row) for row in run.get("history") or []])
+        return histories
+
     def __repr__(self):
         return "<Runs {}/{}>".format(self.entity, self.project)
 
@@ -944,6 +1208,7 @@ class Run(Attrs):
         Run is always initialized by calling api.runs() where api is an instance of wandb.Api
         """
         super(Run, self).__init__(dict(attrs))
+        self._parsed = set()  # blob fields already decoded from JSON
         self.client = client
         self._entity = entity
         self.project = project
@@ -1061,6 +1326,7 @@ class Run(Attrs):
             ):
                 raise ValueError("Could not find run %s" % self)
             self._attrs = response["project"]["run"]
+            self._parsed = set()
             self.state = self._attrs["state"]
 
             if self.sweep_name and not self.sweep:
@@ -1074,30 +1340,60 @@ class Run(Attrs):
                     withRuns=False,
                 )
 
-        self._attrs["summaryMetrics"] = (
-            json.loads(self._attrs["summaryMetrics"])
-            if self._attrs.get("summaryMetrics")
-            else {}
-        )
-        self._attrs["systemMetrics"] = (
-            json.loads(self._attrs["systemMetrics"])
-            if self._attrs.get("systemMetrics")
-            else {}
-        )
         if self._attrs.get("user"):
             self.user = User(self._attrs["user"])
-        config_user, config_raw = {}, {}
-        for key, value in six.iteritems(json.loads(self._attrs.get("config") or "{}")):
-            config = config_raw if key in WANDB_INTERNAL_KEYS else config_user
-            if isinstance(value, dict) and "value" in value:
-                config[key] = value["value"]
-            else:
-                config[key] = value
-        config_raw.update(config_user)
-        self._attrs["config"] = config_user
-        self._attrs["rawconfig"] = config_raw
         return self._attrs
 
+    def __getattr__(self, name):
+        blob = RUN_BLOB_FIELDS.get(self.snake_to_camel(name))
+        if blob is not None and not name.startswith("_"):
+            self._parse_blob(blob)
+        return super(Run, self).__getattr__(name)
+
+    def _parse_blob(self, blob):
+        """Decodes a JSON blob field on first access, fetching it first if the run
+        was listed with a field projection that left it out."""
+        if blob in self._parsed:
+            return
+        if blob not in self._attrs:
+            self._load_blobs()
+        self._parsed.add(blob)
+        if blob in ("summaryMetrics", "systemMetrics"):
+            value = self._attrs.get(blob)
+            if isinstance(value, str):
+                value = json.loads(value) if value else None
+            self._attrs[blob] = value or {}
+        elif blob == "config":
+            config_user, config_raw = {}, {}
+            for key, value in six.iteritems(
+                json.loads(self._attrs.get("config") or "{}")
+            ):
+                config = config_raw if key in WANDB_INTERNAL_KEYS else config_user
+                if isinstance(value, dict) and "value" in value:
+                    config[key] = value["value"]
+                else:
+                    config[key] = value
+            config_raw.update(config_user)
+            self._attrs["config"] = config_user
+            self._attrs["rawconfig"] = config_raw
+
+    def _load_blobs(self):
+        missing = sorted(set(RUN_BLOB_FIELDS.values()) - set(self._attrs))
+        query = gql(
+            """
+        query RunBlobs($project: String!, $entity: String!, $name: String!) {
+            project(name: $project, entityName: $entity) {
+                run(name: $name) { %s }
+            }
+        }
+        """
+            % " ".join(missing)
+        )
+        response = self._exec(query)
+        run = (response.get("project") or {}).get("run") or {}
+        for blob in missing:
+            self._attrs[blob] = run.get(blob)
+
     @normalize_exceptions
     def wait_until_finished(self):
         query = gql(
@@ -1197,11 +1493,20 @@ class Run(Attrs):
             config[k] = {"value": v, "desc": None}
         return json.dumps(config)
 
-    def _exec(self, query, **kwargs):
+    def _exec(self, query, cache_ttl=None, **kwargs):
         """Execute a query against the cloud backend"""
         variables = {"entity": self.entity, "project": self.project, "name": self.id}
         variables.update(kwargs)
-        return self.client.execute(query, variable_values=variables)
+        return self.client.execute(
+            query, variable_values=variables, cache_ttl=cache_ttl
+        )
+
+    @property
+    def _cache_ttl(self):
+        cache = getattr(self.client, "cache", None)
+        if cache is None:
+            return None
+        return cache.ttl_for_run_state(self.state)
 
     def _sampled_history(self, keys, x_axis="_step", samples=500):
         spec = {"keys": [x_axis] + keys, "samples": samples}
@@ -1215,7 +1520,9 @@ class Run(Attrs):
         """
         )
 
-        response = self._exec(query, specs=[json.dumps(spec)])
+        response = self._exec(
+            query, specs=[json.dumps(spec)], cache_ttl=self._cache_ttl
+        )
         # sampledHistory returns one list per spec, we only send one spec
         return response["project"]["run"]["sampledHistory"][0]
 
@@ -1232,7 +1539,7 @@ class Run(Attrs):
             % node
         )
 
-        response = self._exec(query, samples=samples)
+        response = self._exec(query, samples=samples, cache_ttl=self._cache_ttl)
         return [json.loads(line) for line in response["project"]["run"][node]]
 
     @normalize_exceptions
@@ -1323,7 +1630,15 @@ class Run(Attrs):
         return lines
 
     @normalize_exceptions
-    def scan_history(self, keys=None, page_size=1000, min_step=None, max_step=None):
+    def scan_history(
+        self,
+        keys=None,
+        page_size=1000,
+        min_step=None,
+        max_step=None,
+        concurrency=4,
+        max_buffered_pages=8,
+    ):
         """
         Returns an iterable collection of all history records for a run.
 
@@ -1340,9 +1655,14 @@ class Run(Attrs):
         Arguments:
             keys ([str], optional): only fetch these keys, and only fetch rows that have all of keys defined.
             page_size (int, optional): size of pages to fetch from the api
+            concurrency (int, optional): number of pages to fetch from the api at once
+            max_buffered_pages (int, optional): maximum number of fetched or in flight pages
+                held in memory ahead of iteration
 
         Returns:
-            An iterable collection over history records (dict).
+            An iterable collection over history records (dict). Pages are fetched
+            ahead of iteration, call `close()` on it or use it in a `with` block
+            when stopping early to cancel them right away.
         """
         if keys is not None and not isinstance(keys, list):
             wandb.termerror("keys must be specified in a list")
@@ -1367,6 +1687,8 @@ class Run(Attrs):
                 page_size=page_size,
                 min_step=min_step,
                 max_step=max_step,
+                concurrency=concurrency,
+                max_buffered_pages=max_buffered_pages,
             )
         else:
             return SampledHistoryScan(
@@ -1376,8 +1698,60 @@ class Run(Attrs):
                 page_size=page_size,
                 min_step=min_step,
                 max_step=max_step,
+                concurrency=concurrency,
+                max_buffered_pages=max_buffered_pages,
             )
 
+    @normalize_exceptions
+    def history_table(
+        self,
+        keys=None,
+        page_size=1000,
+        min_step=None,
+        max_step=None,
+        format="pandas",
+        concurrency=4,
+        max_buffered_pages=8,
+    ):
+        """
+        Returns all history records for a run as a table built column by column.
+
+        Rows are decoded a page at a time straight into one typed buffer per key,
+        which takes a fraction of the memory of building a list of dicts with
+        `scan_history` first.
+
+        Example:
+            Export the loss of an example run to a DataFrame
+
+            ```python
+            run = api.run("l2k2/examples-numpy-boston/i0wt6xua")
+            df = run.history_table(keys=["Loss"])
+            ```
+
+        Arguments:
+            keys ([str], optional): only fetch these keys, and only fetch rows that have all of keys defined.
+            page_size (int, optional): size of pages to fetch from the api
+            format (str, optional): "pandas" for a `pandas.DataFrame`, "arrow" for a
+                `pyarrow.Table` or "numpy" for a dict of numpy arrays
+            concurrency (int, optional): number of pages to fetch from the api at once
+            max_buffered_pages (int, optional): maximum number of fetched or in flight pages
+                held in memory ahead of iteration
+
+        Returns:
+            The history records in the requested format.
+        """
+        columns = _HistoryColumns()
+        for row in self.scan_history(
+            keys=keys,
+            page_size=page_size,
+            min_step=min_step,
+            max_step=max_step,
+            concurrency=concurrency,
+            max_buffered_pages=max_buffered_pages,
+        ):
+            columns.append(row)
+        return columns.to_table(format)
+
     @normalize_exceptions
     def logged_artifacts(self, per_page=100):
         return RunArtifacts(self.client, self, mode="logged", per_page=per_page)
@@ -1479,7 +1853,7 @@ class Run(Attrs):
         }
         """
         )
-        response = self._exec(query)
+        response = self._exec(query, cache_ttl=self._cache_ttl)
         if (
             response is None
             or response.get("project") is None
@@ -1650,6 +2024,62 @@ class Sweep(Attrs):
 
         return sweep
 
+    @classmethod
+    def get_many(cls, client, entity, project, sids):
+        """Fetches several sweeps in one query, returns a dict of sweep id to `Sweep`
+        (or None for sweeps that don't exist)."""
+        sids = list(sids)
+        fields = [
+            "s%d: sweep(sweepName: $name%d) { id name bestLoss config }" % (i, i)
+            for i in range(len(sids))
+        ]
+        query = gql(
+            """
+        query Sweeps($project: String!, $entity: String, %s) {
+            project(name: $project, entityName: $entity) {
+                %s
+            }
+        }
+        """
+            % (
+                ", ".join("$name%d: String!" % i for i in range(len(sids))),
+                "\n".join(fields),
+            )
+        )
+        variables = {"entity": entity, "project": project}
+        variables.update({"name%d" % i: sid for i, sid in enumerate(sids)})
+        response = client.execute(query, variable_values=variables)
+
+        sweeps = {}
+        for i, sid in enumerate(sids):
+            sweep_response = (response.get("project") or {}).get("s%d" % i)
+            if sweep_response is None:
+                sweeps[sid] = None
+                continue
+            sweep = cls(client, entity, project, sid, attrs=sweep_response)
+            sweep.runs = Runs(
+                client,
+                entity,
+                project,
+                per_page=10,
+                filters={"$and": [{"sweep": sweep.id}]},
+            )
+            sweeps[sid] = sweep
+        return sweeps
+
+    def history(
+        self, samples=500, keys=None, x_axis="_step", format="pandas", concurrency=4
+    ):
+        """Returns sampled history metrics for every run of the sweep as one long
+        table with a `run_id` column, see `Runs.history`."""
+        return self.runs.history(
+            samples=samples,
+            keys=keys,
+            x_axis=x_axis,
+            format=format,
+            concurrency=concurrency,
+        )
+
     def __repr__(self):
         return "<Sweep {}>".format("/".join(self.path))
 
@@ -1657,6 +2087,9 @@ class Sweep(Attrs):
 class Files(Paginator):
     """An iterable collection of `File` objects."""
 
+    # file listings are never cached, their signed download urls expire
+    _cache_ttl = None
+
     QUERY = gql(
         """
         query Run($project: String!, $entity: String!, $name: String!, $fileCursor: String,
@@ -1716,6 +2149,56 @@ class Files(Paginator):
             for r in self.last_response["project"]["run"]["files"]["edges"]
         ]
 
+    @normalize_exceptions
+    def download(self, root=".", replace=False, parallelism=8, callback=None):
+        """Downloads every file in the collection, fetching several at once while
+        paging through the listing.
+
+        Files that already exist under `root` with the same size and md5 are skipped.
+
+        Arguments:
+            root (str): Local directory to save the files.  Defaults to ".".
+            replace (boolean): If `True`, overwrite local files that differ from the
+                ones saved by the run, otherwise raise.  Defaults to `False`.
+            parallelism (int): Number of files to download at once.  Defaults to 8.
+            callback (callable): Called with each `File` and whether it was downloaded
+                (`False` when the local copy was already up to date) as files finish.
+
+        Returns:
+            A list of the local paths of the files.
+        """
+        api_key = Api().api_key
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=parallelism, pool_maxsize=parallelism
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        paths = []
+        pending = set()
+
+        def finish(return_when):
+            done, not_done = futures.wait(pending, return_when=return_when)
+            pending.intersection_update(not_done)
+            for future in done:
+                file, downloaded = future.result()
+                if callback:
+                    callback(file, downloaded)
+
+        with futures.ThreadPoolExecutor(max_workers=parallelism) as executor:
+            for file in self:
+                path = os.path.join(root, file.name)
+                paths.append(path)
+                pending.add(
+                    executor.submit(file._sync, path, replace, api_key, session)
+                )
+                # bound the files in flight so huge runs don't queue everything up
+                if len(pending) >= 2 * parallelism:
+                    finish(futures.FIRST_COMPLETED)
+            finish(futures.ALL_COMPLETED)
+        return paths
+
     def __repr__(self):
         return "<Files {} ({})>".format("/".join(self.run.path), len(self))
 
@@ -1803,6 +2286,28 @@ class File(object):
         util.download_file_from_url(path, self.url, Api().api_key)
         return open(path, "r")
 
+    def _is_current(self, path):
+        return (
+            os.path.isfile(path)
+            and os.path.getsize(path) == self.size
+            and util.md5_file(path) == self.md5
+        )
+
+    @retry.retriable(
+        retry_timedelta=RETRY_TIMEDELTA,
+        check_retry_fn=util.no_retry_auth,
+        retryable_exceptions=(RetryError, requests.RequestException),
+    )
+    def _sync(self, path, replace, api_key, session):
+        """Downloads the file to path unless it is already there, returns whether
+        it was downloaded."""
+        if self._is_current(path):
+            return self, False
+        if os.path.exists(path) and not replace:
+            raise ValueError("File already exists, pass replace=True to overwrite")
+        util.download_file_from_url(path, self.url, api_key, session=session)
+        return self, True
+
     @normalize_exceptions
     def delete(self):
         mutation = gql(
@@ -2066,30 +2571,164 @@ class BetaReport(Attrs):
         return self._attrs["updatedAt"]
 
 
-class HistoryScan(object):
-    QUERY = gql(
-        """
-        query HistoryPage($entity: String!, $project: String!, $run: String!, $minStep: Int64!, $maxStep: Int64!, $pageSize: Int!) {
-            project(name: $project, entityName: $entity) {
-                run(name: $run) {
-                    history(minStep: $minStep, maxStep: $maxStep, samples: $pageSize)
-                }
-            }
-        }
-        """
-    )
+class _HistoryColumns(object):
+    """Accumulates history rows into one typed buffer per key.
+
+    Numeric columns live in `array.array` buffers: int64 until a float or a
+    missing value shows up, float64 with NaN for missing values after that.
+    Any other column falls back to a list of objects with None for missing
+    values. Rows can be dropped as soon as they are appended, so exporting a
+    long history holds only one page of row dicts at a time.
+    """
+
+    def __init__(self):
+        self._columns = collections.OrderedDict()
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append(self, row, extra=None):
+        n = self._length
+        extra = extra or {}
+        for key, value in six.iteritems(extra):
+            self._append_value(key, value, n)
+        for key, value in six.iteritems(row):
+            # extra columns win over logged keys with the same name
+            if key not in extra:
+                self._append_value(key, value, n)
+        self._length = n + 1
+        for key, column in six.iteritems(self._columns):
+            if len(column) == n:
+                self._append_missing(key)
+
+    @staticmethod
+    def _is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def _new_column(self, value, length):
+        if self._is_number(value):
+            if length == 0 and isinstance(value, int):
+                return array.array("q")
+            return array.array("d", [float("nan")]) * length
+        return [None] * length
+
+    def _append_value(self, key, value, length):
+        column = self._columns.get(key)
+        if value is None:
+            if column is not None:
+                self._append_missing(key)
+            return
+        if column is None:
+            column = self._columns[key] = self._new_column(value, length)
+        if isinstance(column, array.array):
+            if column.typecode == "q" and isinstance(value, float):
+                column = self._columns[key] = array.array("d", column)
+            if self._is_number(value):
+                try:
+                    column.append(value)
+                    return
+                except OverflowError:
+                    pass
+            column = self._columns[key] = column.tolist()
+        column.append(value)
+
+    def _append_missing(self, key):
+        column = self._columns[key]
+        if isinstance(column, array.array):
+            if column.typecode == "q":
+                column = self._columns[key] = array.array("d", column)
+            column.append(float("nan"))
+        else:
+            column.append(None)
+
+    def to_numpy(self):
+        np = util.get_module(
+            "numpy", required="Exporting history columns requires numpy"
+        )
+        columns = collections.OrderedDict()
+        for key, column in six.iteritems(self._columns):
+            if isinstance(column, array.array):
+                dtype = np.int64 if column.typecode == "q" else np.float64
+                columns[key] = np.frombuffer(column, dtype=dtype)
+            else:
+                columns[key] = np.array(column, dtype=object)
+        return columns
+
+    def to_pandas(self):
+        pandas = util.get_module(
+            "pandas", required="Exporting history to a DataFrame requires pandas"
+        )
+        return pandas.DataFrame(self.to_numpy(), columns=list(self._columns))
+
+    def to_arrow(self):
+        pa = util.get_module(
+            "pyarrow", required="Exporting history to an Arrow table requires pyarrow"
+        )
+        arrays = []
+        for key, column in six.iteritems(self.to_numpy()):
+            try:
+                arrays.append(pa.array(column, from_pandas=True))
+            except pa.ArrowException:
+                # mixed types or nested values with differing shapes
+                arrays.append(
+                    pa.array(
+                        [None if v is None else json.dumps(v) for v in column],
+                        type=pa.string(),
+                    )
+                )
+        return pa.Table.from_arrays(arrays, names=list(self._columns))
+
+    def to_table(self, format="pandas"):
+        if format == "pandas":
+            return self.to_pandas()
+        elif format == "arrow":
+            return self.to_arrow()
+        elif format == "numpy":
+            return self.to_numpy()
+        raise ValueError(
+            "format must be one of 'pandas', 'arrow' or 'numpy', got %r" % format
+        )
+
+
+class _StepWindowScan(object):
+    """Iterates over history rows fetched in fixed windows of steps.
+
+    The windows are known up front and independent of each other, so up to
+    `concurrency` of them are requested at once on a thread pool while rows are
+    still returned in step order. `max_buffered_pages` caps how many pages
+    (fetched or in flight) are held in memory at any time.
+
+    Pending requests are cancelled and the threads stopped once the scan is
+    exhausted, closed or garbage collected. It can also be used as a context
+    manager that closes it on exit.
+    """
 
-    def __init__(self, client, run, min_step, max_step, page_size=1000):
+    def __init__(
+        self,
+        client,
+        run,
+        min_step,
+        max_step,
+        page_size=1000,
+        concurrency=4,
+        max_buffered_pages=8,
+    ):
         self.client = client
         self.run = run
         self.page_size = page_size
         self.min_step = min_step
         self.max_step = max_step
+        self.concurrency = max(1, concurrency)
+        self.max_buffered_pages = max(1, max_buffered_pages)
         self.page_offset = min_step  # minStep for next page
         self.scan_offset = 0  # index within current page of rows
         self.rows = []  # current page of rows
+        self._pages = collections.deque()  # pending page futures, in step order
+        self._executor = None
 
     def __iter__(self):
+        self.close()
         self.page_offset = self.min_step
         self.scan_offset = 0
         self.rows = []
@@ -2101,38 +2740,103 @@ class HistoryScan(object):
                 row = self.rows[self.scan_offset]
                 self.scan_offset += 1
                 return row
-            if self.page_offset >= self.max_step:
+            if not self._pages and self.page_offset >= self.max_step:
+                self.close()
                 raise StopIteration()
             self._load_next()
 
     next = __next__
 
+    def _next_window(self):
+        min_step = self.page_offset
+        max_step = min(self.page_offset + self.page_size, self.max_step)
+        self.page_offset += self.page_size
+        return min_step, max_step
+
+    def _load_next(self):
+        if self.concurrency == 1:
+            self.rows = self._fetch_window(*self._next_window())
+        else:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(
+                    max_workers=self.concurrency
+                )
+            while (
+                self.page_offset < self.max_step
+                and len(self._pages) < self.max_buffered_pages
+            ):
+                # the pool only holds a weak reference, so a scan the caller
+                # dropped is garbage collected and closed right away
+                self._pages.append(
+                    self._executor.submit(
+                        type(self)._fetch_window,
+                        weakref.proxy(self),
+                        *self._next_window(),
+                    )
+                )
+            self.rows = self._pages.popleft().result()
+        self.scan_offset = 0
+
+    def close(self):
+        """Cancels the pages not fetched yet, for callers that stop early."""
+        for page in self._pages:
+            page.cancel()
+        self._pages.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # the attributes are missing if __init__ raised
+        if getattr(self, "_pages", None) is not None:
+            self.close()
+
+    def _fetch_window(self, min_step, max_step):
+        raise NotImplementedError
+
+
+class HistoryScan(_StepWindowScan):
+    QUERY = gql(
+        """
+        query HistoryPage($entity: String!, $project: String!, $run: String!, $minStep: Int64!, $maxStep: Int64!, $pageSize: Int!) {
+            project(name: $project, entityName: $entity) {
+                run(name: $run) {
+                    history(minStep: $minStep, maxStep: $maxStep, samples: $pageSize)
+                }
+            }
+        }
+        """
+    )
+
     @normalize_exceptions
     @retry.retriable(
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def _load_next(self):
-        max_step = self.page_offset + self.page_size
-        if max_step > self.max_step:
-            max_step = self.max_step
+    def _fetch_window(self, min_step, max_step):
         variables = {
             "entity": self.run.entity,
             "project": self.run.project,
             "run": self.run.id,
-            "minStep": int(self.page_offset),
+            "minStep": int(min_step),
             "maxStep": int(max_step),
             "pageSize": int(self.page_size),
         }
 
-        res = self.client.execute(self.QUERY, variable_values=variables)
+        res = self.client.execute(
+            self.QUERY, variable_values=variables, cache_ttl=self.run._cache_ttl
+        )
         res = res["project"]["run"]["history"]
-        self.rows = [json.loads(row) for row in res]
-        self.page_offset += self.page_size
-        self.scan_offset = 0
+        return [json.loads(row) for row in res]
 
 
-class SampledHistoryScan(object):
+class SampledHistoryScan(_StepWindowScan):
     QUERY = gql(
         """
         query SampledHistoryPage($entity: String!, $project: String!, $run: String!, $spec: JSONString!) {
@@ -2145,44 +2849,18 @@ class SampledHistoryScan(object):
         """
     )
 
-    def __init__(self, client, run, keys, min_step, max_step, page_size=1000):
-        self.client = client
-        self.run = run
+    def __init__(self, client, run, keys, min_step, max_step, page_size=1000, **kwargs):
+        super(SampledHistoryScan, self).__init__(
+            client, run, min_step, max_step, page_size=page_size, **kwargs
+        )
         self.keys = keys
-        self.page_size = page_size
-        self.min_step = min_step
-        self.max_step = max_step
-        self.page_offset = min_step  # minStep for next page
-        self.scan_offset = 0  # index within current page of rows
-        self.rows = []  # current page of rows
-
-    def __iter__(self):
-        self.page_offset = self.min_step
-        self.scan_offset = 0
-        self.rows = []
-        return self
-
-    def __next__(self):
-        while True:
-            if self.scan_offset < len(self.rows):
-                row = self.rows[self.scan_offset]
-                self.scan_offset += 1
-                return row
-            if self.page_offset >= self.max_step:
-                raise StopIteration()
-            self._load_next()
-
-    next = __next__
 
     @normalize_exceptions
     @retry.retriable(
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def _load_next(self):
-        max_step = self.page_offset + self.page_size
-        if max_step > self.max_step:
-            max_step = self.max_step
+    def _fetch_window(self, min_step, max_step):
         variables = {
             "entity": self.run.entity,
             "project": self.run.project,
@@ -2190,18 +2868,18 @@ class SampledHistoryScan(object):
             "spec": json.dumps(
                 {
                     "keys": self.keys,
-                    "minStep": int(self.page_offset),
+                    "minStep": int(min_step),
                     "maxStep": int(max_step),
                     "samples": int(self.page_size),
                 }
             ),
         }
 
-        res = self.client.execute(self.QUERY, variable_values=variables)
+        res = self.client.execute(
+            self.QUERY, variable_values=variables, cache_ttl=self.run._cache_ttl
+        )
         res = res["project"]["run"]["sampledHistory"]
-        self.rows = res[0]
-        self.page_offset += self.page_size
-        self.scan_offset = 0
+        return res[0]
 
 
 class ProjectArtifactTypes(Paginator):
@@ -2664,12 +3342,12 @@ class _DownloadedArtifactEntry(artifacts.ArtifactEntry):
             cache_path = manifest.storage_policy.load_reference(
                 self._parent_artifact,
                 self.name,
-                manifest.entries[self.name],
+                manifest.get_entry_by_path(self.name),
                 local=True,
             )
         else:
             cache_path = manifest.storage_policy.load_file(
-                self._parent_artifact, self.name, manifest.entries[self.name]
+                self._parent_artifact, self.name, manifest.get_entry_by_path(self.name)
             )
 
         return self.copy(cache_path, os.path.join(root, self.name))
@@ -2680,7 +3358,7 @@ class _DownloadedArtifactEntry(artifacts.ArtifactEntry):
             return manifest.storage_policy.load_reference(
                 self._parent_artifact,
                 self.name,
-                manifest.entries[self.name],
+                manifest.get_entry_by_path(self.name),
                 local=False,
             )
         raise ValueError("Only reference entries support ref_target().")
@@ -3054,14 +3732,14 @@ class Artifact(artifacts.Artifact):
         for artifact_type_str in type_mapping:
             wb_class = type_mapping[artifact_type_str]
             wandb_file_name = wb_class.with_suffix(name)
-            entry = self._manifest.entries.get(wandb_file_name)
+            entry = self._manifest.get_entry_by_path(wandb_file_name)
             if entry is not None:
                 return entry, wb_class
         return None, None
 
     def get_path(self, name):
         manifest = self._load_manifest()
-        entry = manifest.entries.get(name)
+        entry = manifest.get_entry_by_path(name)
         if entry is None:
             entry = self._get_obj_entry(name)[0]
             if entry is None:
@@ -3100,6 +3778,15 @@ class Artifact(artifacts.Artifact):
             return result
 
     def download(self, root=None, recursive=False):
+        if env.get_artifact_download_leader():
+            # The first process to get here downloads the whole artifact while
+            # every other process sharing the cache waits, then finds all of
+            # its files already cached.
+            with artifacts.get_artifacts_cache().lock("artifact:%s" % self.id):
+                return self._download(root=root, recursive=recursive)
+        return self._download(root=root, recursive=recursive)
+
+    def _download(self, root=None, recursive=False):
         dirpath = root or self._default_root()
         self._add_download_root(dirpath)
         manifest = self._load_manifest()
@@ -3120,7 +3807,15 @@ class Artifact(artifacts.Artifact):
         import multiprocessing.dummy  # this uses threads
 
         pool = multiprocessing.dummy.Pool(32)
-        pool.map(partial(self._download_file, root=dirpath), manifest.entries)
+        # Start the largest files first and hand out one file at a time, so a
+        # huge entry never sits in a chunk behind thousands of small ones while
+        # the small ones fill in the remaining workers around it.
+        names = sorted(
+            manifest.entries,
+            key=lambda name: manifest.entries[name].size or 0,
+            reverse=True,
+        )
+        pool.map(partial(self._download_file, root=dirpath), names, chunksize=1)
         if recursive:
             pool.map(lambda artifact: artifact.download(), self._dependent_artifacts)
         pool.close()
@@ -3327,54 +4022,66 @@ class Artifact(artifacts.Artifact):
 
     def _load_manifest(self):
         if self._manifest is None:
-            query = gql(
-                """
-            query ArtifactManifest(
-                $entityName: String!,
-                $projectName: String!,
-                $name: String!
-            ) {
-                project(name: $projectName, entityName: $entityName) {
-                    artifact(name: $name) {
-                        currentManifest {
+            # committed artifacts never change, so their manifest can be cached
+            cache = getattr(self.client, "cache", None)
+            if cache is not None and self.state == "COMMITTED":
+                key = "artifact-manifest:%s" % self.id
+                manifest_json = cache.get(key)
+                if manifest_json is None:
+                    manifest_json = self._fetch_manifest_json()
+                    cache.put(key, manifest_json)
+            else:
+                manifest_json = self._fetch_manifest_json()
+            self._manifest = artifacts.ArtifactManifest.from_manifest_json(
+                self, manifest_json
+            )
+
+            self._load_dependent_manifests()
+
+        return self._manifest
+
+    def _fetch_manifest_json(self):
+        query = gql(
+            """
+        query ArtifactManifest(
+            $entityName: String!,
+            $projectName: String!,
+            $name: String!
+        ) {
+            project(name: $projectName, entityName: $entityName) {
+                artifact(name: $name) {
+                    currentManifest {
+                        id
+                        file {
                             id
-                            file {
-                                id
-                                directUrl
-                            }
+                            directUrl
                         }
                     }
                 }
             }
-            """
-            )
-            response = self.client.execute(
-                query,
-                variable_values={
-                    "entityName": self.entity,
-                    "projectName": self.project,
-                    "name": self._artifact_name,
-                },
-            )
-
-            index_file_url = response["project"]["artifact"]["currentManifest"]["file"][
-                "directUrl"
-            ]
-            with requests.get(index_file_url) as req:
-                req.raise_for_status()
-                self._manifest = artifacts.ArtifactManifest.from_manifest_json(
-                    self, json.loads(six.ensure_text(req.content))
-                )
-
-            self._load_dependent_manifests()
+        }
+        """
+        )
+        response = self.client.execute(
+            query,
+            variable_values={
+                "entityName": self.entity,
+                "projectName": self.project,
+                "name": self._artifact_name,
+            },
+        )
 
-        return self._manifest
+        index_file_url = response["project"]["artifact"]["currentManifest"]["file"][
+            "directUrl"
+        ]
+        with requests.get(index_file_url) as req:
+            req.raise_for_status()
+            return json.loads(six.ensure_text(req.content))
 
     def _load_dependent_manifests(self):
         """Helper function to interrogate entries and ensure we have loaded their manifests"""
         # Make sure dependencies are avail
-        for entry_key in self._manifest.entries:
-            entry = self._manifest.entries[entry_key]
+        for entry in self._manifest.get_reference_entries():
             if self._manifest_entry_is_artifact_reference(entry):
                 dep_artifact = self._get_ref_artifact_from_entry(entry)
                 if dep_artifact not in self._dependent_artifacts:
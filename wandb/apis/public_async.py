@@ -0,0 +1,146 @@
+"""
+Asyncio front end to the public API that offloads calls to threads.
+
+This is not an async transport: every call runs the regular synchronous public
+API on a thread pool sized by `concurrency`, and the coroutines only wait for
+those threads. It lets code already running an event loop fan out over hundreds
+of runs without blocking the loop, while the number of requests in flight, and
+of pooled connections to the server, stays bounded by the pool. Retries are
+handled by the underlying `RetryingClient`.
+"""
+
+import asyncio
+from concurrent import futures
+import functools
+from typing import Optional
+
+from wandb.apis import public
+
+
+def _take(iterator, count):
+    # not a for loop: iter() on a Paginator rewinds it
+    items = []
+    while len(items) < count:
+        try:
+            items.append(next(iterator))
+        except StopIteration:
+            break
+    return items
+
+
+class ThreadedAsyncApi(object):
+    """
+    Awaitable version of `Api` for high fan-out queries, backed by a thread pool.
+
+    Methods mirror `Api` but are coroutines that run the blocking `Api` calls on
+    up to `concurrency` threads, and return the same `Run`, `Runs`, `Sweep` and
+    `Artifact` objects. Anything else that would block, such as reading a
+    property that loads data, must be awaited through `call`.
+
+    Examples:
+        Fetch the history of every run in a project concurrently
+        ```python
+        async with wandb.ThreadedAsyncApi(concurrency=64) as api:
+            runs = await api.runs("my_entity/my_project")
+            histories = await asyncio.gather(*[api.history(run) for run in runs])
+        ```
+
+    Arguments:
+        overrides: (dict) Same as for `Api`.
+        timeout: (int) Same as for `Api`.
+        cache: (bool or ResponseCache) Same as for `Api`.
+        concurrency: (int) Number of threads, and so the maximum number of
+            requests in flight at once.
+    """
+
+    def __init__(
+        self,
+        overrides={},
+        timeout: Optional[int] = None,
+        cache=None,
+        concurrency: int = 32,
+    ):
+        self.api = public.Api(
+            overrides, timeout=timeout, cache=cache, max_connections=concurrency
+        )
+        self._executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def call(self, fn, *args, **kwargs):
+        """Runs a blocking call from the public API on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def iterate(self, iterable, chunk_size=50):
+        """Asynchronously iterates over a `Paginator` or any blocking iterable,
+        pulling `chunk_size` items per call."""
+        iterator = iter(iterable)
+        while True:
+            items = await self.call(_take, iterator, chunk_size)
+            if not items:
+                return
+            for item in items:
+                yield item
+
+    async def run(self, path=""):
+        return await self.call(self.api.run, path)
+
+    async def runs(
+        self, path="", filters=None, order="-created_at", per_page=50, fields=None
+    ):
+        """Returns a list of every run matching the filters, see `Api.runs`."""
+        # resolving the default entity may query the server
+        runs = await self.call(
+            self.api.runs,
+            path,
+            filters=filters,
+            order=order,
+            per_page=per_page,
+            fields=fields,
+        )
+        return [run async for run in self.iterate(runs, chunk_size=per_page)]
+
+    async def sweep(self, path=""):
+        return await self.call(self.api.sweep, path)
+
+    async def artifact(self, name, type=None):
+        return await self.call(self.api.artifact, name, type=type)
+
+    async def history(self, run, **kwargs):
+        """Sampled history of a run, see `Run.history`."""
+        return await self.call(run.history, **kwargs)
+
+    async def scan_history(self, run, **kwargs):
+        """Asynchronously iterates over every history row of a run, see
+        `Run.scan_history`."""
+        scan = await self.call(run.scan_history, **kwargs)
+        async for row in self.iterate(
+            scan, chunk_size=getattr(scan, "page_size", 1000)
+        ):
+            yield row
+
+    async def history_table(self, run, **kwargs):
+        """Full history of a run as a table, see `Run.history_table`."""
+        return await self.call(run.history_table, **kwargs)
+
+    async def files(self, run, names=[], per_page=50):
+        """Returns a list of the files of a run, see `Run.files`."""
+        files = await self.call(run.files, names=names, per_page=per_page)
+        return [file async for file in self.iterate(files, chunk_size=per_page)]
+
+    async def download_files(self, run, root=".", replace=False, parallelism=8):
+        """Downloads every file of a run, see `Files.download`."""
+        files = await self.call(run.files)
+        return await self.call(
+            files.download, root=root, replace=replace, parallelism=parallelism
+        )
@@ -0,0 +1,158 @@
+"""
+Persistent cache for public API responses.
+
+Entries are keyed on a GraphQL query and its variables (or any other string
+key) and stored as JSON files under the wandb cache directory. History of runs
+that reached a terminal state rarely changes, so it is kept for a day; data for
+runs that are still going is kept for a short time only. Responses with signed
+urls in them expire with those urls and must not be cached here.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+from graphql.language.printer import print_ast
+from wandb import env, util
+
+logger = logging.getLogger(__name__)
+
+# run states whose history can no longer grow
+FINAL_RUN_STATES = ("finished", "crashed", "failed", "killed")
+FOREVER = math.inf
+
+
+class ResponseCache(object):
+    """Size bounded on-disk cache of public API responses.
+
+    Arguments:
+        cache_dir (str, optional): where to keep entries, defaults to
+            `public-api` under the wandb cache directory
+        max_bytes (int, optional): total size entries may take before the least
+            recently used ones are evicted
+        running_ttl (float, optional): seconds to keep responses about runs that
+            are still running
+        final_ttl (float, optional): seconds to keep responses about runs in a
+            final state, their tags, summary and files can still be edited
+    """
+
+    def __init__(
+        self, cache_dir=None, max_bytes=1024 ** 3, running_ttl=60, final_ttl=24 * 3600
+    ):
+        self._cache_dir = cache_dir or os.path.join(env.get_cache_dir(), "public-api")
+        self._max_bytes = max_bytes
+        self._running_ttl = running_ttl
+        self._final_ttl = final_ttl
+        self._lock = threading.Lock()
+        self._sizes = None  # path -> size, scanned on first write
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def ttl_for_run_state(self, state):
+        if state in FINAL_RUN_STATES:
+            return self._final_ttl
+        return self._running_ttl
+
+    @staticmethod
+    def query_key(query, variables):
+        return "%s\n%s" % (
+            print_ast(query) if not isinstance(query, str) else query,
+            json.dumps(variables, sort_keys=True, default=str),
+        )
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, digest[:2], digest[2:] + ".json")
+
+    def get(self, key):
+        """Returns the value stored for key, or None if it is missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            entry = None
+        if entry is not None and (
+            entry["expires"] is None or entry["expires"] > time.time()
+        ):
+            try:
+                # bump the mtime, eviction drops the least recently used entries
+                os.utime(path, None)
+            except OSError:
+                pass
+            with self._lock:
+                self.hits += 1
+            return entry["value"]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value, ttl=FOREVER):
+        expires = None if ttl == FOREVER else time.time() + ttl
+        path = self._path(key)
+        util.mkdir_exists_ok(os.path.dirname(path))
+        tmp_path = "%s.tmp.%s" % (path, util.generate_id())
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"expires": expires, "value": value}, f)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except (IOError, OSError, TypeError, ValueError):
+            logger.exception("failed to write public api cache entry")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            sizes = self._scan()
+            sizes[path] = size
+            if sum(sizes.values()) > self._max_bytes:
+                self._evict(sizes)
+
+    def _scan(self):
+        if self._sizes is None:
+            self._sizes = {}
+            for root, _, files in os.walk(self._cache_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        self._sizes[path] = os.path.getsize(path)
+                    except OSError:
+                        pass
+        return self._sizes
+
+    def _evict(self, sizes):
+        def mtime(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0
+
+        total = sum(sizes.values())
+        # evict down to 3/4 of the budget so we don't evict on every write
+        target = self._max_bytes * 3 // 4
+        for path in sorted(sizes, key=mtime):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= sizes.pop(path)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for path in list(self._scan()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._sizes = {}
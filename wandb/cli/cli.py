@@ -229,7 +229,10 @@ def login(key, host, cloud, relogin, anonymously, no_offline=False):
 
 
 @cli.command(
-    context_settings=CONTEXT, help="Run a grpc server", name="grpc-server", hidden=True
+    context_settings=CONTEXT,
+    help="Run a grpc server, also used by runs with WANDB_SERVICE set to its port",
+    name="grpc-server",
+    hidden=True,
 )
 @click.option("--port", default=None, help="The host port to bind grpc service.")
 @display_error
@@ -420,6 +423,9 @@ def init(ctx, project, entity, reset, mode):
     help="Mark runs as synced",
 )
 @click.option("--sync-all", is_flag=True, default=False, help="Sync all runs")
+@click.option(
+    "--jobs", "-j", default=1, type=int, help="Number of runs to sync in parallel.",
+)
 @click.option("--clean", is_flag=True, default=False, help="Delete synced runs")
 @click.option(
     "--clean-old-hours",
@@ -457,6 +463,7 @@ def sync(
     clean=None,
     clean_old_hours=24,
     clean_force=None,
+    jobs=1,
 ):
     # TODO: rather unfortunate, needed to avoid creating a `wandb` directory
     os.environ["WANDB_DIR"] = TMPDIR.name
@@ -528,6 +535,7 @@ def sync(
             view=view,
             verbose=verbose,
             sync_tensorboard=sync_tensorboard,
+            jobs=jobs,
         )
         for p in path:
             sm.add(p)
@@ -1580,12 +1588,19 @@ def cleanup(target_size):
     envvar=env.ENTITY,
     help="The entity to scope the listing to.",
 )
+@click.option(
+    "--parallelism",
+    default=8,
+    type=int,
+    help="The number of files to download at once.",
+)
 @display_error
-def pull(run, project, entity):
+def pull(run, project, entity, parallelism):
     api = InternalApi()
     project, run = api.parse_slug(run, project=project)
-    urls = api.download_urls(project, run=run, entity=entity)
-    if len(urls) == 0:
+    path = "/".join([entity, project, run]) if entity else "/".join([project, run])
+    files = PublicApi().run(path).files(per_page=1000)
+    if len(files) == 0:
         raise ClickException("Run has no files")
     click.echo(
         "Downloading: {project}/{run}".format(
@@ -1593,25 +1608,13 @@ def pull(run, project, entity):
         )
     )
 
-    for name in urls:
-        if api.file_current(name, urls[name]["md5"]):
-            click.echo("File %s is up to date" % name)
+    def report(file, downloaded):
+        if downloaded:
+            click.echo("File %s" % file.name)
         else:
-            length, response = api.download_file(urls[name]["url"])
-            # TODO: I had to add this because some versions in CI broke click.progressbar
-            sys.stdout.write("File %s\r" % name)
-            dirname = os.path.dirname(name)
-            if dirname != "":
-                wandb.util.mkdir_exists_ok(dirname)
-            with click.progressbar(
-                length=length,
-                label="File %s" % name,
-                fill_char=click.style("&", fg="green"),
-            ) as bar:
-                with open(name, "wb") as f:
-                    for data in response.iter_content(chunk_size=4096):
-                        f.write(data)
-                        bar.update(len(data))
+            click.echo("File %s is up to date" % file.name)
+
+    files.download(replace=True, parallelism=parallelism, callback=report)
 
 
 @cli.command(
@@ -14,7 +14,6 @@ import os
 import sys
 import json
 import wandb
-from distutils.util import strtobool
 
 CONFIG_PATHS = "WANDB_CONFIG_PATHS"
 SWEEP_PARAM_PATH = "WANDB_SWEEP_PARAM_PATH"
@@ -64,6 +63,9 @@ JUPYTER = "WANDB_JUPYTER"
 CONFIG_DIR = "WANDB_CONFIG_DIR"
 CACHE_DIR = "WANDB_CACHE_DIR"
 DISABLE_SSL = "WANDB_INSECURE_DISABLE_SSL"
+ARTIFACT_DOWNLOAD_LEADER = "WANDB_ARTIFACT_DOWNLOAD_LEADER"
+PUBLIC_API_CACHE = "WANDB_PUBLIC_API_CACHE"
+PUBLIC_API_MAX_PER_PAGE = "WANDB_PUBLIC_API_MAX_PER_PAGE"
 
 # For testing, to be removed in future version
 USE_V1_ARTIFACTS = "_WANDB_USE_V1_ARTIFACTS"
@@ -104,6 +106,17 @@ def immutable_keys():
     ]
 
 
+def strtobool(val):
+    """Converts a string representation of truth to 1 or 0, like the function of
+    the same name in distutils, which is slow to import."""
+    val = val.lower()
+    if val in ("y", "yes", "t", "true", "on", "1"):
+        return 1
+    if val in ("n", "no", "f", "false", "off", "0"):
+        return 0
+    raise ValueError("invalid truth value %r" % (val,))
+
+
 def _env_as_bool(var, default=None, env=None):
     if env is None:
         env = os.environ
@@ -300,6 +313,23 @@ def get_use_v1_artifacts(env=None):
     return val
 
 
+def get_artifact_download_leader(default=False, env=None):
+    return _env_as_bool(ARTIFACT_DOWNLOAD_LEADER, default=default, env=env)
+
+
+def get_public_api_cache(default=False, env=None):
+    return _env_as_bool(PUBLIC_API_CACHE, default=default, env=env)
+
+
+def get_public_api_max_per_page(default=1000, env=None):
+    if env is None:
+        env = os.environ
+    try:
+        return int(env.get(PUBLIC_API_MAX_PER_PAGE, default))
+    except ValueError:
+        return default
+
+
 def get_agent_max_initial_failures(default=None, env=None):
     if env is None:
         env = os.environ
@@ -1,8 +1,11 @@
+import heapq
 import logging
 import os
 import fnmatch
 import six
 from six.moves import queue
+import sys
+import threading
 import time
 
 from wandb import util
@@ -10,6 +13,12 @@ import glob
 
 wd_polling = util.vendor_import("watchdog.observers.polling")
 wd_events = util.vendor_import("watchdog.events")
+wd_inotify = None
+if sys.platform.startswith("linux"):
+    try:
+        wd_inotify = util.vendor_import("watchdog.observers.inotify")
+    except Exception:
+        pass
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +44,11 @@ class FileEventHandler(object):
     def on_modified(self, force=False):
         pass
 
+    def retry_time(self):
+        """When to look at the file again for a change that on_modified held back,
+        None if there is nothing to retry."""
+        return None
+
     def on_renamed(self, new_path, new_name):
         self.file_path = new_path
         self.save_name = new_name
@@ -60,7 +74,10 @@ class PolicyNow(FileEventHandler):
             self._last_sync = os.path.getmtime(self.file_path)
 
     def finish(self):
-        pass
+        # inotify events for files created just before the end of the run can
+        # be dropped when the observer stops
+        if self._last_sync is None:
+            self.on_modified()
 
     @property
     def policy(self):
@@ -141,6 +158,15 @@ class PolicyLive(FileEventHandler):
         elif force and not self.synced:
             self.save_file()
 
+    def retry_time(self):
+        if not self._last_uploaded_time or self.synced:
+            return None
+        wait = max(self.RATE_LIMIT_SECONDS, self.min_wait_for_size(self.current_size))
+        retry = self._last_uploaded_time + wait + 0.5
+        # if the time has passed it is the size increase we are waiting for, a
+        # later write will bring us back here
+        return retry if retry > time.time() else None
+
     def save_file(self):
         self._last_sync = os.path.getmtime(self.file_path)
         self._last_uploaded_time = time.time()
@@ -153,6 +179,16 @@ class PolicyLive(FileEventHandler):
 
 
 class DirWatcher(object):
+    """Uploads the files of a run directory according to their policies.
+
+    Changes are reported by inotify on Linux, and by scanning the directory
+    elsewhere or when inotify is not available. The events for a file are
+    handled once per COALESCE_SECONDS, and files whose upload is rate limited
+    are looked at again when the limit expires, not on every scan.
+    """
+
+    COALESCE_SECONDS = 0.5
+
     def __init__(self, settings, api, file_pusher, file_dir=None):
         self._api = api
         self._file_count = 0
@@ -161,13 +197,36 @@ class DirWatcher(object):
         self._user_file_policies = {"end": set(), "live": set(), "now": set()}
         self._file_pusher = file_pusher
         self._file_event_handlers = {}
-        self._file_observer = wd_polling.PollingObserver()
-        self._file_observer.schedule(
-            self._per_file_event_handler(), self._dir, recursive=True
-        )
-        self._file_observer.start()
+        # save_name -> (due time, file_path), and a heap of (due time, save_name)
+        self._pending = {}
+        self._pending_heap = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._thread_body)
+        self._thread.daemon = True
+        self._thread.start()
+        self._file_observer = self._start_observer()
         logger.info("watching files in: %s", settings.files_dir)
 
+    def _start_observer(self):
+        if wd_inotify:
+            observer = wd_inotify.InotifyObserver()
+            observer.schedule(self._per_file_event_handler(), self._dir, recursive=True)
+            try:
+                observer.start()
+                return observer
+            except OSError as e:
+                # e.g. out of inotify watches or instances
+                logger.info("inotify failed, polling %s instead: %s", self._dir, e)
+        observer = wd_polling.PollingObserver()
+        observer.schedule(self._per_file_event_handler(), self._dir, recursive=True)
+        observer.start()
+        return observer
+
+    @property
+    def _polling(self):
+        return isinstance(self._file_observer, wd_polling.PollingObserver)
+
     @property
     def emitter(self):
         try:
@@ -219,19 +278,66 @@ class DirWatcher(object):
             return None
         self._file_count += 1
         # We do the directory scan less often as it grows
-        if self._file_count % 100 == 0:
+        if self._polling and self._file_count % 100 == 0:
             emitter = self.emitter
             if emitter:
                 emitter._timeout = int(self._file_count / 100) + 1
-        save_name = os.path.relpath(event.src_path, self._dir)
-        self._get_file_event_handler(event.src_path, save_name).on_modified()
+        self._queue(event.src_path)
 
     def _on_file_modified(self, event):
-        logger.info("file/dir modified: %s", event.src_path)
         if os.path.isdir(event.src_path):
             return None
-        save_name = os.path.relpath(event.src_path, self._dir)
-        self._get_file_event_handler(event.src_path, save_name).on_modified()
+        self._queue(event.src_path)
+
+    def _queue(self, file_path, due=None):
+        """Handles a change to file_path after COALESCE_SECONDS or at due, together
+        with any other change to it until then."""
+        save_name = os.path.relpath(file_path, self._dir)
+        if due is None:
+            due = time.time() + self.COALESCE_SECONDS
+        with self._cond:
+            pending = self._pending.get(save_name)
+            if pending and pending[0] <= due:
+                return
+            self._pending[save_name] = (due, file_path)
+            heapq.heappush(self._pending_heap, (due, save_name))
+            self._cond.notify()
+
+    def _thread_body(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    now = time.time()
+                    if self._pending_heap and self._pending_heap[0][0] <= now:
+                        break
+                    timeout = (
+                        self._pending_heap[0][0] - now if self._pending_heap else None
+                    )
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                ready = []
+                while self._pending_heap and self._pending_heap[0][0] <= now:
+                    due, save_name = heapq.heappop(self._pending_heap)
+                    pending = self._pending.get(save_name)
+                    # skip entries superseded by an earlier due time
+                    if pending and pending[0] == due:
+                        del self._pending[save_name]
+                        ready.append((save_name, pending[1]))
+            for save_name, file_path in ready:
+                self._process(save_name, file_path)
+
+    def _process(self, save_name, file_path):
+        logger.info("file/dir modified: %s", file_path)
+        try:
+            handler = self._get_file_event_handler(file_path, save_name)
+            handler.on_modified()
+            retry = handler.retry_time()
+        except OSError:
+            # the file was deleted or moved since the event
+            return
+        if retry is not None:
+            self._queue(handler.file_path, retry)
 
     def _on_file_moved(self, event):
         # TODO: test me...
@@ -241,6 +347,8 @@ class DirWatcher(object):
         old_save_name = os.path.relpath(event.src_path, self._dir)
         new_save_name = os.path.relpath(event.dest_path, self._dir)
 
+        with self._cond:
+            self._pending.pop(old_save_name, None)
         # We have to move the existing file handler to the new name
         handler = self._get_file_event_handler(event.src_path, old_save_name)
         self._file_event_handlers[new_save_name] = handler
@@ -281,9 +389,15 @@ class DirWatcher(object):
 
     def finish(self):
         logger.info("shutting down directory watcher")
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
         try:
+            if not self._polling:
+                self._file_observer.stop()
             # avoid hanging if we crashed before the observer was started
-            if self._file_observer.is_alive():
+            elif self._file_observer.is_alive():
                 # rather unfortunatly we need to manually do a final scan of the dir
                 # with `queue_events`, then iterate through all events before stopping
                 # the observer to catch all files written.  First we need to prevent the
@@ -308,6 +422,16 @@ class DirWatcher(object):
         except SystemError:
             pass
 
+        # Handle the changes that weren't due yet, including those found by the
+        # final dispatch above, since files with the "now" policy are only
+        # uploaded when they change.
+        with self._cond:
+            pending = self._pending
+            self._pending = {}
+            self._pending_heap = []
+        for save_name, (_, file_path) in sorted(pending.items()):
+            self._process(save_name, file_path)
+
         # Ensure we've at least noticed every file in the run directory. Sometimes
         # we miss things because asynchronously watching filesystems isn't reliable.
         logger.info("scan: %s", self._dir)
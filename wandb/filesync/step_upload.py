@@ -19,12 +19,22 @@ RequestFinish = collections.namedtuple("RequestFinish", ("callback"))
 
 
 class StepUpload(object):
-    def __init__(self, api, stats, event_queue, max_jobs, file_stream, silent=False):
+    def __init__(
+        self,
+        api,
+        stats,
+        event_queue,
+        max_jobs,
+        file_stream,
+        silent=False,
+        upload_slots=None,
+    ):
         self._api = api
         self._stats = stats
         self._event_queue = event_queue
         self._max_jobs = max_jobs
         self._file_stream = file_stream
+        self._upload_slots = upload_slots
 
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
@@ -137,6 +147,7 @@ class StepUpload(object):
             event.copied,
             event.save_fn,
             event.digest,
+            upload_slots=self._upload_slots,
         )
         self._running_jobs[event.save_name] = job
         job.start()
@@ -24,6 +24,7 @@ class UploadJob(threading.Thread):
         copied,
         save_fn,
         digest,
+        upload_slots=None,
     ):
         """A file upload thread.
 
@@ -35,6 +36,8 @@ class UploadJob(threading.Thread):
             save_name: string logical location of the file relative to the run
                 directory.
             path: actual string path of the file to upload on the filesystem.
+            upload_slots: optional semaphore held while uploading, shared to
+                bound the uploads of several pushers together.
         """
         self._done_queue = done_queue
         self._stats = stats
@@ -48,12 +51,17 @@ class UploadJob(threading.Thread):
         self.copied = copied
         self.save_fn = save_fn
         self.digest = digest
+        self._upload_slots = upload_slots
         super(UploadJob, self).__init__()
 
     def run(self):
         success = False
         try:
-            success = self.push()
+            if self._upload_slots is not None:
+                with self._upload_slots:
+                    success = self.push()
+            else:
+                success = self.push()
         finally:
             if self.copied and os.path.isfile(self.save_path):
                 os.remove(self.save_path)
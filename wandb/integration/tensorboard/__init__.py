@@ -3,6 +3,6 @@ wandb integration tensorboard module.
 """
 
 from .monkeypatch import patch, unpatch
-from .log import log, tf_summary_to_dict, reset_state
+from .log import log, new_steps, tf_summary_to_dict, reset_state
 
-__all__ = ["patch"]
+__all__ = ["patch", "new_steps"]
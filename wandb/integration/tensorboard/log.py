@@ -5,12 +5,19 @@ import six
 import wandb
 from wandb.viz import create_custom_chart
 
-# We have atleast the default namestep and a global step to track
+
+def new_steps():
+    """Returns the step state of one stream of events, see `log`."""
+    # We have atleast the default namestep and a global step to track
+    return {"": {"step": 0}, "global": {"step": 0, "last_log": None}}
+
+
 # TODO: reset this structure on wandb.join
-STEPS = {"": {"step": 0}, "global": {"step": 0, "last_log": None}}
+STEPS = new_steps()
 # TODO(cling): Set these when tensorboard behavior is configured.
 # We support rate limited logging by setting this to number of seconds,
-# can be a floating point.
+# can be a floating point. This applies to every run in the process, including
+# the runs handled by the wandb service.
 RATE_LIMIT_SECONDS = None
 IGNORE_KINDS = ["graphs"]
 tensor_util = wandb.util.get_module("tensorboard.util.tensor_util")
@@ -120,9 +127,14 @@ def tf_summary_to_dict(tf_summary_str_or_pb, namespace=""):  # noqa: C901
         elif kind == "tensor":
             plugin_name = value.metadata.plugin_data.plugin_name
             if plugin_name == "scalars" or plugin_name == "":
-                values[namespaced_tag(value.tag, namespace)] = make_ndarray(
-                    value.tensor
-                )
+                tensor = value.tensor
+                # fast path for the common single float scalar
+                if not tensor.tensor_shape.dim and len(tensor.float_val) == 1:
+                    values[namespaced_tag(value.tag, namespace)] = tensor.float_val[0]
+                elif not tensor.tensor_shape.dim and len(tensor.double_val) == 1:
+                    values[namespaced_tag(value.tag, namespace)] = tensor.double_val[0]
+                else:
+                    values[namespaced_tag(value.tag, namespace)] = make_ndarray(tensor)
             elif plugin_name == "images":
                 img_strs = value.tensor.string_val[2:]  # First two items are dims.
                 encode_images(img_strs, value)
@@ -240,24 +252,25 @@ def tf_summary_to_dict(tf_summary_str_or_pb, namespace=""):  # noqa: C901
 def reset_state():
     """Internal method for reseting state, called by wandb.join"""
     global STEPS
-    STEPS = {"": {"step": 0}, "global": {"step": 0, "last_log": None}}
+    STEPS = new_steps()
 
 
-def log(tf_summary_str_or_pb, history=None, step=0, namespace="", **kwargs):
+def log(tf_summary_str_or_pb, history=None, step=0, namespace="", steps=None, **kwargs):
     """Logs a tfsummary to wandb
 
     Can accept a tf summary string or parsed event.  Will use wandb.run.history unless a
     history object is passed.  Can optionally namespace events.  Results are commited
-    when step increases for this namespace.
+    when step increases for this namespace.  The steps seen so far are tracked in
+    `steps` if it is passed, a dict from `new_steps`, or else in the module's STEPS.
 
     NOTE: This assumes that events being passed in are in chronological order
     """
-    global STEPS
-    global RATE_LIMIT
     history = history or wandb.run.history
+    if steps is None:
+        steps = STEPS
     # To handle multiple global_steps, we keep track of them here instead
     # of the global log
-    last_step = STEPS.get(namespace, {"step": 0})
+    last_step = steps.get(namespace, {"step": 0})
 
     # Commit our existing data if this namespace increased its step
     commit = False
@@ -272,26 +285,26 @@ def log(tf_summary_str_or_pb, history=None, step=0, namespace="", **kwargs):
     # Pass timestamp to history for loading historic data
     timestamp = log_dict.get("_timestamp", time.time())
     # Store our initial timestamp
-    if STEPS["global"]["last_log"] is None:
-        STEPS["global"]["last_log"] = timestamp
+    if steps["global"]["last_log"] is None:
+        steps["global"]["last_log"] = timestamp
     # Rollup events that share the same step across namespaces
-    if commit and step == STEPS["global"]["step"]:
+    if commit and step == steps["global"]["step"]:
         commit = False
     # Always add the biggest global_step key for non-default namespaces
-    if step > STEPS["global"]["step"]:
-        STEPS["global"]["step"] = step
+    if step > steps["global"]["step"]:
+        steps["global"]["step"] = step
     if namespace != "":
-        log_dict["global_step"] = STEPS["global"]["step"]
+        log_dict["global_step"] = steps["global"]["step"]
 
     # Keep internal step counter
-    STEPS[namespace] = {"step": step}
+    steps[namespace] = {"step": step}
 
     if commit:
         # Only commit our data if we're below the rate limit or don't have one
         if (
             RATE_LIMIT_SECONDS is None
-            or timestamp - STEPS["global"]["last_log"] >= RATE_LIMIT_SECONDS
+            or timestamp - steps["global"]["last_log"] >= RATE_LIMIT_SECONDS
         ):
             history.add({}, **kwargs)
-        STEPS["global"]["last_log"] = timestamp
+        steps["global"]["last_log"] = timestamp
     history._row_update(log_dict)
@@ -16,7 +16,6 @@ import threading
 import wandb
 
 from ..interface import interface
-from ..internal.internal import wandb_internal
 
 logger = logging.getLogger("wandb")
 
@@ -77,6 +76,9 @@ class Backend(object):
 
     def ensure_launched(self):
         """Launch backend worker if not running."""
+        # the internal process modules are only needed once a run starts
+        from ..internal.internal import wandb_internal
+
         settings = dict(self._settings or ())
         settings["_log_level"] = self._log_level or logging.DEBUG
 
@@ -86,6 +88,9 @@ class Backend(object):
         if "_early_logger" in settings:
             del settings["_early_logger"]
 
+        if settings.get("service") and self._service_launch(settings):
+            return
+
         self.record_q = self._multiprocessing.Queue()
         self.result_q = self._multiprocessing.Queue()
         if settings.get("start_method") != "thread":
@@ -151,6 +156,26 @@ class Backend(object):
             process=self.wandb_process, record_q=self.record_q, result_q=self.result_q,
         )
 
+    def _service_launch(self, settings):
+        """Start the run in a running wandb service instead of a new process."""
+        try:
+            from . import service
+
+            process = service.ServiceProcess(settings["service"], settings)
+            process.start()
+        except (ImportError, wandb.Error) as e:
+            wandb.termwarn("{}, starting a wandb process instead".format(e))
+            return False
+        logger.info("started run in wandb service with pid: {}".format(process.pid))
+        self.record_q = process.record_q
+        self.result_q = process.result_q
+        self.wandb_process = process
+        self._internal_pid = process.pid
+        self.interface = interface.BackendSender(
+            process=self.wandb_process, record_q=self.record_q, result_q=self.result_q,
+        )
+        return True
+
     def server_connect(self):
         """Connect to server."""
         pass
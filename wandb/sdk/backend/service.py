@@ -0,0 +1,159 @@
+#
+# -*- coding: utf-8 -*-
+"""Service - Send to a shared internal service
+
+Runs started with the `service` setting are handled by a long lived
+`wandb grpc-server` process instead of a new internal process. Each run opens
+one RunStream to the service: the first message in each direction is a JSON
+hello, the rest are serialized Record and Result protos.
+
+"""
+
+import datetime
+import enum
+import json
+import logging
+import os
+import sys
+import threading
+
+import grpc
+from six.moves import queue
+import wandb
+from wandb.errors import CommError
+from wandb.proto import wandb_internal_pb2 as pb
+
+logger = logging.getLogger("wandb")
+
+SERVICE_NAME = "wandb_internal.InternalService"
+RUN_STREAM_METHOD = "RunStream"
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": (value - datetime.datetime(1970, 1, 1)).total_seconds()}
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError("{!r} is not JSON serializable".format(value))
+
+
+def _decode_value(obj):
+    if list(obj) == ["__datetime__"]:
+        return datetime.datetime(1970, 1, 1) + datetime.timedelta(
+            seconds=obj["__datetime__"]
+        )
+    return obj
+
+
+def encode_hello(hello):
+    return json.dumps(hello, default=_encode_value).encode("utf-8")
+
+
+def decode_hello(data):
+    return json.loads(data.decode("utf-8"), object_hook=_decode_value)
+
+
+def client_hello(settings):
+    """Returns what a run tells the service about itself when it connects.
+
+    The service runs the internal threads of the run in its own process, so it
+    has to be the same wandb in the same python environment as the run.
+    """
+    return dict(
+        settings=settings,
+        pid=os.getpid(),
+        cwd=os.getcwd(),
+        executable=sys.executable,
+        version=wandb.__version__,
+    )
+
+
+class ServiceQueue(queue.Queue):
+    """A thread queue that can stand in for a multiprocessing queue."""
+
+    def close(self):
+        pass
+
+
+class ServiceProcess(object):
+    """Stands in for the internal process of a run handled by the service.
+
+    Records put on record_q are streamed to the service and results streamed
+    back are put on result_q. The process is alive until the service ends the
+    stream, which it does once the internal threads of the run have stopped.
+    """
+
+    CONNECT_TIMEOUT = 10
+
+    def __init__(self, address, settings):
+        self.name = "wandb_internal"
+        self.pid = None
+        self.record_q = ServiceQueue()
+        self.result_q = ServiceQueue()
+        self._address = address
+        self._settings = settings
+        self._channel = None
+        self._responses = None
+        self._reader = None
+        self._closed = threading.Event()
+
+    def start(self):
+        self._channel = grpc.insecure_channel(self._address)
+        run_stream = self._channel.stream_stream(
+            "/{}/{}".format(SERVICE_NAME, RUN_STREAM_METHOD)
+        )
+        try:
+            grpc.channel_ready_future(self._channel).result(
+                timeout=self.CONNECT_TIMEOUT
+            )
+            self._responses = run_stream(self._requests())
+            # the service queues the stream when it is handling too many runs
+            timer = threading.Timer(self.CONNECT_TIMEOUT, self._responses.cancel)
+            timer.start()
+            try:
+                hello = decode_hello(next(self._responses))
+            finally:
+                timer.cancel()
+        except (grpc.FutureTimeoutError, grpc.RpcError, StopIteration) as e:
+            self._closed.set()
+            self._channel.close()
+            details = e.details() if isinstance(e, grpc.RpcError) else None
+            raise CommError(
+                "Could not start run in wandb service at {}: {}".format(
+                    self._address, details or "not reachable"
+                ),
+                e,
+            )
+        self.pid = hello["pid"]
+        self._reader = threading.Thread(target=self._read_results)
+        self._reader.name = "ServiceReader"
+        self._reader.daemon = True
+        self._reader.start()
+
+    def _requests(self):
+        yield encode_hello(client_hello(self._settings))
+        while not self._closed.is_set():
+            try:
+                record = self.record_q.get(timeout=1)
+            except queue.Empty:
+                continue
+            yield record.SerializeToString()
+
+    def _read_results(self):
+        try:
+            for data in self._responses:
+                self.result_q.put(pb.Result.FromString(data))
+        except grpc.RpcError as e:
+            logger.error("wandb service stream failed: %s", e.details())
+        finally:
+            self._closed.set()
+
+    def is_alive(self):
+        return self._reader is not None and self._reader.is_alive()
+
+    def join(self, timeout=None):
+        if self._reader:
+            self._reader.join(timeout)
+        if not self.is_alive():
+            self._closed.set()
+            self._channel.close()
@@ -22,7 +22,6 @@ from typing import (
     Union,
 )
 
-from pkg_resources import parse_version
 import six
 from six.moves.collections_abc import Sequence as SixSequence
 import wandb
@@ -97,6 +96,8 @@ def _server_accepts_client_ids() -> bool:
     max_cli_version = _get_max_cli_version()
     if max_cli_version is None:
         return False
+    from pkg_resources import parse_version
+
     return parse_version("0.11.0") <= parse_version(max_cli_version)
 
 
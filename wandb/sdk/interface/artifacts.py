@@ -8,6 +8,8 @@ import random
 from typing import (
     Callable,
     Dict,
+    Generator,
+    IO,
     List,
     Optional,
     Sequence,
@@ -21,6 +23,14 @@ from wandb import env
 from wandb import util
 from wandb.data_types import WBValue
 
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None  # type: ignore
+try:
+    import msvcrt
+except ImportError:  # posix
+    msvcrt = None  # type: ignore
 
 if TYPE_CHECKING:
     import wandb.filesync.step_prepare.StepPrepare as StepPrepare  # type: ignore
@@ -94,9 +104,15 @@ class ArtifactManifest(object):
             raise ValueError("Cannot add the same path twice: %s" % entry.path)
         self.entries[entry.path] = entry
 
+    def remove_entry(self, path: str) -> None:
+        del self.entries[path]
+
     def get_entry_by_path(self, path: str) -> Optional["ArtifactEntry"]:
         return self.entries.get(path)
 
+    def get_reference_entries(self) -> List["ArtifactEntry"]:
+        return [entry for entry in self.entries.values() if entry.ref is not None]
+
     def get_entries_in_directory(self, directory):
         return [
             self.entries[entry_key]
@@ -108,6 +124,10 @@ class ArtifactManifest(object):
 
 
 class ArtifactEntry(object):
+    # Manifests can hold millions of entries, so subclasses that are stored in
+    # them should declare __slots__ too.
+    __slots__ = ()
+
     path: str
     ref: Optional[str]
     digest: str
@@ -820,6 +840,70 @@ class StorageHandler(object):
         pass
 
 
+def _lock_file(file: IO) -> None:
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        file.seek(0)
+        while True:
+            try:
+                # LK_LOCK only retries for ~10s before giving up, keep waiting.
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass
+
+
+def _try_lock_file(file: IO) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock_file(file: IO) -> None:
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _is_current_lock_file(file: IO, path: str) -> bool:
+    """Whether `file` is still the lock file at `path`, which is removed when the
+    lock is released."""
+    try:
+        return os.path.samestat(os.fstat(file.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+
+def _release_lock_file(file: IO, path: str) -> None:
+    if fcntl is not None:
+        # Remove the file while still holding the lock, processes waiting on it
+        # notice that it's gone once they get it and retry with a new one.
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        _unlock_file(file)
+        file.close()
+    else:
+        _unlock_file(file)
+        file.close()
+        # Open files can't be removed here, so this only succeeds when no other
+        # process is waiting for the lock.
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 class ArtifactsCache(object):
 
     _TMP_PREFIX = "tmp"
@@ -829,6 +913,7 @@ class ArtifactsCache(object):
         util.mkdir_exists_ok(self._cache_dir)
         self._md5_obj_dir = os.path.join(self._cache_dir, "obj", "md5")
         self._etag_obj_dir = os.path.join(self._cache_dir, "obj", "etag")
+        self._lock_dir = os.path.join(self._cache_dir, "locks")
         self._artifacts_by_id = {}
         self._random = random.Random()
         self._random.seed()
@@ -851,6 +936,32 @@ class ArtifactsCache(object):
         util.mkdir_exists_ok(os.path.dirname(path))
         return path, False, opener
 
+    @contextlib.contextmanager
+    def lock(self, key: str) -> Generator[None, None, None]:
+        """Holds an exclusive lock on `key` for every process sharing this cache.
+
+        Used so that only one process downloads a given object while the others
+        wait for it and then read it from the cache.
+        """
+        util.mkdir_exists_ok(self._lock_dir)
+        lock_path = os.path.join(
+            self._lock_dir, hashlib.md5(key.encode("utf-8")).hexdigest()
+        )
+        while True:
+            f = open(lock_path, "a+")
+            try:
+                _lock_file(f)
+            except BaseException:
+                f.close()
+                raise
+            if _is_current_lock_file(f, lock_path):
+                break
+            f.close()
+        try:
+            yield
+        finally:
+            _release_lock_file(f, lock_path)
+
     def get_artifact(self, artifact_id):
         return self._artifacts_by_id.get(artifact_id)
 
@@ -868,6 +979,10 @@ class ArtifactsCache(object):
         paths: Dict[os.PathLike, os.stat_result] = {}
         total_size: int = 0
         for root, _, files in os.walk(self._cache_dir):
+            if root.startswith(self._lock_dir):
+                for file in files:
+                    self._prune_lock_file(os.path.join(root, file))
+                continue
             for file in files:
                 path = os.path.join(root, file)
                 stat = os.stat(path)
@@ -897,6 +1012,17 @@ class ArtifactsCache(object):
             bytes_reclaimed += stat.st_size
         return bytes_reclaimed
 
+    def _prune_lock_file(self, path: str) -> None:
+        """Removes a lock file left behind by a process that died holding it."""
+        try:
+            f = open(path, "a+")
+        except OSError:
+            return
+        if _try_lock_file(f) and _is_current_lock_file(f, path):
+            _release_lock_file(f, path)
+        else:
+            f.close()
+
     def _cache_opener(self, path):
         @contextlib.contextmanager
         def helper(mode="w"):
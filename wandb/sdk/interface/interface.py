@@ -11,11 +11,12 @@ import logging
 from multiprocessing import Process
 import threading
 import typing as t
-from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from typing import cast
 from typing import TYPE_CHECKING
 import uuid
 
+from google.protobuf import timestamp_pb2 as tspb
 import six
 from six.moves import queue
 import wandb
@@ -167,7 +168,9 @@ class BackendSender(object):
     def _hack_set_run(self, run: "Run") -> None:
         self._run = run
 
-    def publish_output(self, name: str, data: str) -> None:
+    def publish_output(
+        self, name: str, data: str, timestamp: tspb.Timestamp = None
+    ) -> None:
         # from vendor.protobuf import google3.protobuf.timestamp
         # ts = timestamp.Timestamp()
         # ts.GetCurrentTime()
@@ -180,9 +183,26 @@ class BackendSender(object):
             # TODO(jhr): throw error?
             print("unknown type")
         o = pb.OutputRecord(output_type=otype, line=data)
-        o.timestamp.GetCurrentTime()
+        if timestamp is not None:
+            o.timestamp.CopyFrom(timestamp)
+        else:
+            o.timestamp.GetCurrentTime()
         self._publish_output(o)
 
+    def publish_output_batch(self, outputs: List[Tuple[str, str]]) -> None:
+        """Publishes console output captured at the same time, as one record per
+        stream sharing one timestamp."""
+        timestamp = tspb.Timestamp()
+        timestamp.GetCurrentTime()
+        merged: List[Tuple[str, str]] = []
+        for name, data in outputs:
+            if merged and merged[-1][0] == name:
+                merged[-1] = (name, merged[-1][1] + data)
+            else:
+                merged.append((name, data))
+        for name, data in merged:
+            self.publish_output(name, data, timestamp=timestamp)
+
     def _publish_output(self, outdata: pb.OutputRecord) -> None:
         rec = pb.Record()
         rec.output.CopyFrom(outdata)
@@ -781,13 +801,20 @@ class BackendSender(object):
         assert poll_exit_response
         return poll_exit_response
 
-    def communicate_check_version(
-        self, current_version: str = None
-    ) -> Optional[pb.CheckVersionResponse]:
+    def _make_check_version(self, current_version: str = None) -> pb.Record:
         check_version = pb.CheckVersionRequest()
         if current_version:
             check_version.current_version = current_version
-        rec = self._make_request(check_version=check_version)
+        return self._make_request(check_version=check_version)
+
+    def communicate_check_version_async(self, current_version: str = None) -> _Future:
+        rec = self._make_check_version(current_version)
+        return self._communicate_async(rec)
+
+    def communicate_check_version(
+        self, current_version: str = None
+    ) -> Optional[pb.CheckVersionResponse]:
+        rec = self._make_check_version(current_version)
         result = self._communicate(rec)
         if result is None:
             # Note: timeouts handled by callers: wandb_init.py
@@ -1,5 +1,6 @@
 #
 import json
+import logging
 import os
 import tempfile
 import threading
@@ -18,6 +19,9 @@ if TYPE_CHECKING:
     from wandb.proto import wandb_internal_pb2
 
 
+logger = logging.getLogger(__name__)
+
+
 def _manifest_json_from_proto(manifest: "wandb_internal_pb2.ArtifactManifest") -> Dict:
     if manifest.version == 1:
         contents = {
@@ -139,6 +143,9 @@ class ArtifactSaver(object):
                 'Unknown artifact state "{}"'.format(self._server_artifact["state"])
             )
 
+        if incremental and latest_artifact_id is not None:
+            self._prune_unchanged_entries(latest_artifact_id)
+
         manifest_type = "FULL"
         manifest_filename = "wandb_manifest.json"
         if incremental:
@@ -232,6 +239,43 @@ class ArtifactSaver(object):
 
         return self._server_artifact
 
+    def _prune_unchanged_entries(self, base_artifact_id: str) -> None:
+        """Drops entries that are identical in the base artifact.
+
+        An incremental manifest is applied on top of its base, so entries
+        whose path, digest and ref already match the base don't need to be
+        prepared, uploaded or sent again: the committed artifact keeps the
+        base's copy of them, birth artifact id included. This is only an
+        optimization, so every entry is kept if the base manifest can't be fetched.
+        """
+        try:
+            base_manifest = self._api.artifact_manifest_json(base_artifact_id)
+        except Exception:
+            logger.exception(
+                "incremental artifact: failed to fetch base manifest %s, "
+                "uploading every entry",
+                base_artifact_id,
+            )
+            return
+        if base_manifest is None:
+            return
+        base_contents = base_manifest.get("contents", {})
+        unchanged = [
+            path
+            for path, entry in self._manifest.entries.items()
+            if path in base_contents
+            and base_contents[path]["digest"] == entry.digest
+            and base_contents[path].get("ref") == entry.ref
+        ]
+        for path in unchanged:
+            self._manifest.remove_entry(path)
+        if unchanged:
+            logger.info(
+                "incremental artifact: skipping %d unchanged of %d entries",
+                len(unchanged),
+                len(unchanged) + len(self._manifest.entries),
+            )
+
     def _resolve_client_id_manifest_references(self) -> None:
         for entry_path in self._manifest.entries:
             entry = self._manifest.entries[entry_path]
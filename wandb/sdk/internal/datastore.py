@@ -95,6 +95,16 @@ class DataStore(object):
         self._opened_for_scan = True
         self._read_header()
 
+    def get_offset(self):
+        """Returns the file offset of the next record to scan."""
+        return self._index
+
+    def seek(self, offset):
+        """Continue scanning at an offset returned by get_offset()."""
+        assert self._opened_for_scan, "file not open for scanning"
+        self._fp.seek(offset)
+        self._index = offset
+
     def in_last_block(self):
         """When reading, we want to know if we're in the last block to
            handle in progress writes"""
@@ -45,12 +45,13 @@ class FilePusher(object):
     This manages uploading multiple files in parallel. It will restart a given file's
     upload job if it receives a notification that that file has been modified.
     The finish() method will block until all events have been processed and all
-    uploads are complete.
+    uploads are complete. Pushers that share an upload_slots semaphore share its
+    bound on concurrent uploads.
     """
 
     MAX_UPLOAD_JOBS = 64
 
-    def __init__(self, api, file_stream, silent=False):
+    def __init__(self, api, file_stream, silent=False, upload_slots=None):
         self._api = api
 
         self._tempdir = tempfile.TemporaryDirectory("wandb")
@@ -76,6 +77,7 @@ class FilePusher(object):
             self.MAX_UPLOAD_JOBS,
             file_stream=file_stream,
             silent=silent,
+            upload_slots=upload_slots,
         )
         self._step_upload.start()
 
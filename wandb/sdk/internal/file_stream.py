@@ -154,9 +154,13 @@ class FileStreamApi(object):
     Finish = collections.namedtuple("Finish", ("exitcode"))
     Preempting = collections.namedtuple("Preempting", ())
     PushSuccess = collections.namedtuple("PushSuccess", ("artifact_id", "save_name"))
+    Checkpoint = collections.namedtuple("Checkpoint", ("callback"))
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
     MAX_ITEMS_PER_PUSH = 10000
+    # connection pools shared by the file streams of all the runs in a process,
+    # like the wandb service or a parallel sync
+    HTTP_ADAPTER = requests.adapters.HTTPAdapter(pool_maxsize=64)
 
     def __init__(self, api, run_id, start_time, settings=None):
         if settings is None:
@@ -168,6 +172,8 @@ class FileStreamApi(object):
         self._run_id = run_id
         self._start_time = start_time
         self._client = requests.Session()
+        self._client.mount("http://", self.HTTP_ADAPTER)
+        self._client.mount("https://", self.HTTP_ADAPTER)
         self._client.auth = ("api", api.api_key)
         self._client.timeout = self.HTTP_TIMEOUT
         self._client.headers.update(
@@ -263,6 +269,14 @@ class FileStreamApi(object):
                     uploaded = set()
                 elif isinstance(item, self.PushSuccess):
                     uploaded.add(item.save_name)
+                elif isinstance(item, self.Checkpoint):
+                    # everything pushed before the checkpoint is posted first
+                    if ready_chunks:
+                        posted_data_time = time.time()
+                        posted_anything_time = posted_data_time
+                        self._send(ready_chunks)
+                        ready_chunks = []
+                    item.callback(self._chunk_offsets())
                 else:
                     # item is Chunk
                     ready_chunks.append(item)
@@ -304,6 +318,12 @@ class FileStreamApi(object):
             },
         )
 
+    def _chunk_offsets(self):
+        return {
+            filename: policy._chunk_id
+            for filename, policy in self._file_policies.items()
+        }
+
     def _thread_except_body(self):
         # TODO: Consolidate with internal_util.ExceptionThread
         try:
@@ -376,6 +396,15 @@ class FileStreamApi(object):
         """
         self._queue.put(Chunk(filename, data))
 
+    def enqueue_checkpoint(self, callback):
+        """Notify once everything pushed so far has been posted.
+
+        Arguments:
+            callback: Called from the streaming thread with a dict mapping each
+                file name to the number of chunks posted for it.
+        """
+        self._queue.put(self.Checkpoint(callback))
+
     def push_success(self, artifact_id, save_name):
         """Notification that a file upload has been successfully completed
 
@@ -33,7 +33,7 @@ from . import meta, sample, stats
 from . import tb_watcher
 from .settings_static import SettingsStatic
 from ..interface.interface import BackendSender
-from ..lib import handler_util, proto_util
+from ..lib import filenames, filesystem, handler_util, proto_util
 
 SummaryDict = Dict[str, Any]
 
@@ -64,7 +64,10 @@ class HandleManager(object):
     _writer_q: "Queue[Record]"
     _interface: BackendSender
     _system_stats: Optional[stats.SystemStats]
+    _run_meta: Optional[meta.Meta]
     _tb_watcher: Optional[tb_watcher.TBWatcher]
+    _output_log: Optional[filesystem.CRDedupedFile]
+    _output_log_offset: int
     _metric_defines: Dict[str, wandb_internal_pb2.MetricRecord]
     _metric_globs: Dict[str, wandb_internal_pb2.MetricRecord]
     _metric_track: Dict[Tuple[str, ...], float]
@@ -92,6 +95,9 @@ class HandleManager(object):
 
         self._tb_watcher = None
         self._system_stats = None
+        self._run_meta = None
+        self._output_log = None
+        self._output_log_offset = 0
         self._step = 0
 
         self._track_time = None
@@ -143,6 +149,8 @@ class HandleManager(object):
         logger.info("handle defer: {}".format(state))
         # only handle flush tb (sender handles the rest)
         if state == defer.FLUSH_STATS:
+            # metadata files are published before the sender flushes files
+            self._join_run_meta()
             if self._system_stats:
                 # TODO(jhr): this could block so we dont really want to call shutdown
                 # from handler thread
@@ -154,6 +162,9 @@ class HandleManager(object):
                 self._tb_watcher = None
         elif state == defer.FLUSH_SUM:
             self._save_summary(self._consolidated_summary, flush=True)
+        elif state == defer.FLUSH_DIR:
+            # output.log is uploaded by the dir watcher, complete it first
+            self._close_output_log()
 
         # defer is used to drive the sender finish state machine
         self._dispatch_record(record, always_send=True)
@@ -171,8 +182,35 @@ class HandleManager(object):
         self._dispatch_record(record)
 
     def handle_output(self, record: Record) -> None:
+        self._write_output_log(record.output)
         self._dispatch_record(record)
 
+    def _write_output_log(self, output: wandb_internal_pb2.OutputRecord) -> None:
+        # output.log is written here rather than in the user process, where console
+        # capture should do as little as possible
+        if self._output_log is None:
+            path = os.path.join(self._settings.files_dir, filenames.OUTPUT_FNAME)
+            try:
+                self._output_log = filesystem.CRDedupedFile(open(path, "wb"))
+            except (IOError, OSError):
+                logger.exception("failed to open %s", path)
+                return
+        self._output_log.write(output.line.encode("utf-8"))
+        # byte offset of the end of output.log, the last line of a chunk is only
+        # written once the next chunk (or the close) completes it
+        self._output_log_offset = self._output_log.tell()
+
+    def _close_output_log(self) -> None:
+        if self._output_log:
+            self._output_log.close()
+            self._output_log = None
+            path = os.path.join(self._settings.files_dir, filenames.OUTPUT_FNAME)
+            try:
+                self._output_log_offset = os.path.getsize(path)
+            except OSError:
+                logger.exception("failed to stat %s", path)
+            logger.info("output.log: wrote %d bytes", self._output_log_offset)
+
     def handle_files(self, record: Record) -> None:
         self._dispatch_record(record)
 
@@ -537,12 +575,23 @@ class HandleManager(object):
         if not self._settings._disable_stats:
             pid = os.getpid()
             self._system_stats = stats.SystemStats(pid=pid, interface=self._interface)
+            if self._settings.stats_sample_rate_hz:
+                self._system_stats.add_probe(
+                    stats.HighFrequencyProbe(
+                        float(self._settings.stats_sample_rate_hz),
+                        gpu_count=self._system_stats.gpu_count,
+                        path=os.path.join(
+                            self._settings.files_dir, filenames.PROFILE_FNAME
+                        ),
+                    )
+                )
             self._system_stats.start()
 
         if not self._settings._disable_meta and not run_start.run.resumed:
-            run_meta = meta.Meta(settings=self._settings, interface=self._interface)
-            run_meta.probe()
-            run_meta.write()
+            self._run_meta = meta.Meta(
+                settings=self._settings, interface=self._interface
+            )
+            self._run_meta.start()
 
         self._tb_watcher = tb_watcher.TBWatcher(
             self._settings, interface=self._interface, run_proto=run_start.run
@@ -679,10 +728,17 @@ class HandleManager(object):
         self._result_q.put(result)
         self._stopped.set()
 
+    def _join_run_meta(self) -> None:
+        if self._run_meta:
+            self._run_meta.join()
+            self._run_meta = None
+
     def finish(self) -> None:
         logger.info("shutting down handler")
+        self._join_run_meta()
         if self._tb_watcher:
             self._tb_watcher.finish()
+        self._close_output_log()
 
     def __next__(self) -> Record:
         return self._record_q.get(block=True)
@@ -51,10 +51,17 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def handle_exit(*args: "Any") -> None:
+    logger.info("Internal process exited")
+
+
 def wandb_internal(
     settings: "Dict[str, Union[str, float]]",
     record_q: "Queue[Record]",
     result_q: "Queue[Result]",
+    parent_pid: "Optional[int]" = None,
+    log_filter: "Optional[logging.Filter]" = None,
+    thread_name_prefix: str = "",
 ) -> None:
     """Internal process function entrypoint.
 
@@ -64,23 +71,30 @@ def wandb_internal(
         settings: dictionary of configuration parameters.
         record_q: records to be handled
         result_q: for sending results back
+        parent_pid: the user process to watch, defaults to the parent process
+        log_filter: filters what is written to the internal log, the wandb
+            service uses this to keep the runs it handles apart
+        thread_name_prefix: prepended to the names of the threads started here
 
     """
     # mark this process as internal
     wandb._set_internal_process()
     started = time.time()
 
-    # register the exit handler only when wandb_internal is called, not on import
-    @atexit.register
-    def handle_exit(*args: "Any") -> None:
-        logger.info("Internal process exited")
+    # register the exit handler only when wandb_internal is called, not on import,
+    # and only once when the wandb service calls it for many runs
+    atexit.unregister(handle_exit)
+    atexit.register(handle_exit)
 
     # Lets make sure we dont modify settings so use a static object
     _settings = settings_static.SettingsStatic(settings)
     if _settings.log_internal:
-        configure_logging(_settings.log_internal, _settings._log_level)
+        configure_logging(
+            _settings.log_internal, _settings._log_level, log_filter=log_filter
+        )
 
-    parent_pid = os.getppid()
+    if parent_pid is None:
+        parent_pid = os.getppid()
     pid = os.getpid()
 
     logger.info(
@@ -129,6 +143,7 @@ def wandb_internal(
     process_check = ProcessCheck(settings=_settings, pid=parent_pid)
 
     for thread in threads:
+        thread.name = thread_name_prefix + thread.name
         thread.start()
 
     interrupt_count = 0
@@ -162,7 +177,12 @@ def wandb_internal(
             sys.exit(-1)
 
 
-def configure_logging(log_fname: str, log_level: int, run_id: str = None) -> None:
+def configure_logging(
+    log_fname: str,
+    log_level: int,
+    run_id: str = None,
+    log_filter: "Optional[logging.Filter]" = None,
+) -> None:
     # TODO: we may want make prints and stdout make it into the logs
     # sys.stdout = open(settings.log_internal, "a")
     # sys.stderr = open(settings.log_internal, "a")
@@ -188,6 +208,8 @@ def configure_logging(log_fname: str, log_level: int, run_id: str = None) -> Non
     log_handler.setFormatter(formatter)
     if run_id:
         log_handler.addFilter(WBFilter())
+    if log_filter:
+        log_handler.addFilter(log_filter)
     # If this is called without "wandb", backend logs from this module
     # are not streamed to `debug-internal.log` when we spawn with fork
     # TODO: (cvp) we should really take another pass at logging in general
@@ -5,7 +5,6 @@ from gql.transport.requests import RequestsHTTPTransport  # type: ignore
 import datetime
 import ast
 import os
-from pkg_resources import parse_version  # type: ignore
 import json
 import yaml
 import re
@@ -77,7 +76,10 @@ class Api(object):
         self._settings = Settings(
             load_settings=load_settings, root_dir=self.default_settings.get("root_dir")
         )
-        self.git = GitRepo(remote=self.settings("git_remote"))
+        # the wandb service handles runs started in other directories
+        self.git = GitRepo(
+            root=self.default_settings.get("_cwd"), remote=self.settings("git_remote")
+        )
         # Mutable settings set by the _file_stream_api
         self.dynamic_settings = {
             "system_sample_seconds": 2,
@@ -600,7 +602,8 @@ class Api(object):
             patch.seek(0)
         cwd = "."
         if self.git.enabled:
-            cwd = cwd + os.getcwd().replace(self.git.repo.working_dir, "")
+            run_cwd = self.default_settings.get("_cwd") or os.getcwd()
+            cwd = cwd + run_cwd.replace(self.git.repo.working_dir, "")
         return self.gql(
             query,
             variable_values={
@@ -1939,6 +1942,8 @@ class Api(object):
         distributed_id=None,
         is_user_created=False,
     ):
+        from pkg_resources import parse_version  # type: ignore
+
         # TODO: Ignore clientID and sequenceClientID if server can't handle it
         _, server_info = self.viewer_server_info()
         max_cli_version = server_info.get("cliVersionInfo", {}).get(
@@ -2206,6 +2211,37 @@ class Api(object):
             response["updateArtifactManifest"]["artifactManifest"]["file"],
         )
 
+    @normalize_exceptions
+    def artifact_manifest_json(self, artifact_id):
+        """Fetches the current manifest of an artifact.
+
+        Arguments:
+            artifact_id (str): The id of the artifact
+
+        Returns:
+            The manifest json as a dict, or None if the artifact has no manifest
+        """
+        query = gql(
+            """
+        query ArtifactManifestByID($id: ID!) {
+            artifact(id: $id) {
+                currentManifest {
+                    file {
+                        directUrl
+                    }
+                }
+            }
+        }
+        """
+        )
+        response = self.gql(query, variable_values={"id": artifact_id})
+        artifact = response.get("artifact") or {}
+        manifest = artifact.get("currentManifest")
+        if manifest is None:
+            return None
+        _, resp = self.download_file(manifest["file"]["directUrl"])
+        return resp.json()
+
     def _resolve_client_id(
         self, client_id,
     ):
@@ -5,15 +5,18 @@ meta.
 """
 
 from datetime import datetime
+import hashlib
 import json
 import logging
 import multiprocessing
 import os
 from shutil import copyfile
 import sys
+import threading
+import time
 from urllib.parse import unquote
 
-from wandb import util
+from wandb import env, util
 from wandb.vendor.pynvml import pynvml
 
 from ..lib.filenames import (
@@ -32,30 +35,145 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# seconds an entry of the metadata cache is kept after it was last used
+_CACHE_MAX_AGE = 7 * 24 * 3600
+
+
+def _environment_key(*paths):
+    """Returns a key for results that only change when the python environment
+    does, i.e. when packages are added to or removed from any of paths, or when
+    one of them is created or removed."""
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append((path, os.stat(path or os.curdir).st_mtime_ns))
+        except OSError:
+            stamps.append((path, None))
+    key = json.dumps([sys.prefix, sys.executable, stamps])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _prune_cache(cache_dir):
+    """Removes the entries of cache_dir that weren't used for _CACHE_MAX_AGE."""
+    expired = time.time() - _CACHE_MAX_AGE
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            if os.path.getmtime(path) < expired:
+                os.remove(path)
+        except OSError:
+            pass
+
 
 class Meta(object):
     """Used to store metadata during and after a run."""
 
+    # seconds before a single probe is abandoned
+    PROBE_TIMEOUT = 15
+
     def __init__(self, settings=None, interface=None):
         logger.debug("meta init")
         self._settings = settings
         self.data = {}
         self.fname = os.path.join(self._settings.files_dir, METADATA_FNAME)
         self._interface = interface
+        # set when the wandb service handles a run started in another directory,
+        # otherwise the repo root is looked up from the cwd on first use
+        self._cwd = self._settings._cwd
         self._git = GitRepo(
+            root=self._cwd,
             remote=self._settings["git_remote"]
             if "git_remote" in self._settings.keys()
-            else "origin"
+            else "origin",
         )
         # Location under "code" directory in files where program was saved.
         self._saved_program = None
         # Locations under files directory where diff patches were saved.
         self._saved_patches = []
+        # Names of the files describing the python environment that were saved.
+        self._saved_environment = []
+        self._thread = None
         logger.debug("meta init done")
 
+    def start(self):
+        """Probes and writes the metadata in a background thread."""
+        self._thread = threading.Thread(target=self._thread_body, name="MetaThread")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def join(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _thread_body(self):
+        try:
+            self.probe()
+            self.write()
+        except Exception:
+            logger.exception("Error probing run metadata")
+
+    def _run_probe(self, probe):
+        """Runs probe in its own thread, abandoning it after PROBE_TIMEOUT."""
+
+        def run():
+            try:
+                probe()
+            except Exception:
+                logger.exception("Error in metadata probe %s", probe.__name__)
+
+        thread = threading.Thread(target=run, name="MetaProbe")
+        thread.daemon = True
+        thread.start()
+        thread.join(self.PROBE_TIMEOUT)
+        if thread.is_alive():
+            logger.warning(
+                "metadata probe %s timed out after %ss",
+                probe.__name__,
+                self.PROBE_TIMEOUT,
+            )
+
+    def _save_cached(self, fname, key, save):
+        """Saves fname to the files directory with save(path), which returns
+        whether it succeeded, reusing the result of an earlier run with the
+        same key from the cache directory."""
+        path = os.path.join(self._settings.files_dir, fname)
+        cache_dir = os.path.join(env.get_cache_dir(), "meta")
+        cached = os.path.join(cache_dir, key + "-" + fname)
+        if os.path.exists(cached):
+            copyfile(cached, path)
+            self._saved_environment.append(fname)
+            try:
+                # entries are pruned by age since they were last used
+                os.utime(cached)
+            except OSError:
+                pass
+            return
+        if not save(path):
+            return
+        self._saved_environment.append(fname)
+        _prune_cache(cache_dir)
+        try:
+            util.mkdir_exists_ok(cache_dir)
+            tmp_path = "{}.{}.tmp".format(cached, os.getpid())
+            copyfile(path, tmp_path)
+            os.replace(tmp_path, cached)
+        except OSError:
+            logger.exception("Error caching %s", fname)
+
     def _save_pip(self):
         """Saves the current working set of pip packages to {REQUIREMENTS_FNAME}"""
         logger.debug("save pip")
+        # packages can be importable from any entry of sys.path
+        self._save_cached(
+            REQUIREMENTS_FNAME, _environment_key(*sys.path), self._write_pip
+        )
+        logger.debug("save pip done")
+
+    def _write_pip(self, path):
         try:
             import pkg_resources
 
@@ -63,28 +181,35 @@ class Meta(object):
             installed_packages_list = sorted(
                 ["%s==%s" % (i.key, i.version) for i in installed_packages]
             )
-            with open(
-                os.path.join(self._settings.files_dir, REQUIREMENTS_FNAME), "w"
-            ) as f:
+            with open(path, "w") as f:
                 f.write("\n".join(installed_packages_list))
+            return True
         except Exception:
             logger.exception("Error saving pip packages")
-        logger.debug("save pip done")
+            return False
 
     def _save_conda(self):
-        current_shell_is_conda = os.path.exists(os.path.join(sys.prefix, "conda-meta"))
+        conda_meta = os.path.join(sys.prefix, "conda-meta")
+        current_shell_is_conda = os.path.exists(conda_meta)
         if not current_shell_is_conda:
             return False
 
         logger.debug("save conda")
+        self._save_cached(
+            CONDA_ENVIRONMENTS_FNAME, _environment_key(conda_meta), self._write_conda
+        )
+        logger.debug("save conda done")
+
+    def _write_conda(self, path):
         try:
-            with open(
-                os.path.join(self._settings.files_dir, CONDA_ENVIRONMENTS_FNAME), "w"
-            ) as f:
-                subprocess.call(["conda", "env", "export"], stdout=f)
+            with open(path, "w") as f:
+                returncode = subprocess.call(
+                    ["conda", "env", "export"], stdout=f, timeout=self.PROBE_TIMEOUT
+                )
+            return returncode == 0
         except Exception:
             logger.exception("Error saving conda packages")
-        logger.debug("save conda done")
+            return False
 
     def _save_code(self):
         logger.debug("save code")
@@ -92,7 +217,7 @@ class Meta(object):
             logger.warning("unable to save code -- program entry not found")
             return
 
-        root = self._git.root or os.getcwd()
+        root = self._git.root or self._cwd or os.getcwd()
         program_relative = self._settings.program_relpath
         util.mkdir_exists_ok(
             os.path.join(
@@ -204,7 +329,9 @@ class Meta(object):
                 "commit": self._git.last_commit,
             }
             self.data["email"] = self._git.email
-            self.data["root"] = self._git.root or self.data["root"] or os.getcwd()
+            self.data["root"] = (
+                self._git.root or self.data["root"] or self._cwd or os.getcwd()
+            )
             logger.debug("setup git done")
 
     def probe(self):
@@ -229,7 +356,7 @@ class Meta(object):
                     else:
                         self.data["program"] = self._settings._jupyter_path
                         self.data["root"] = self._settings._jupyter_root
-            self._setup_git()
+            self._run_probe(self._setup_git)
 
         if self._settings.anonymous != "true":
             self.data["host"] = self._settings.host
@@ -240,17 +367,22 @@ class Meta(object):
             self.data.pop("root", None)
 
         if self._settings.save_code:
-            self._save_code()
-            self._save_patches()
+            self._run_probe(self._save_code)
+            self._run_probe(self._save_patches)
 
         if self._settings._save_requirements:
-            self._save_pip()
-            self._save_conda()
+            self._run_probe(self._save_pip)
+            self._run_probe(self._save_conda)
         logger.debug("probe done")
 
     def write(self):
+        # abandoned probes may still be adding to data
+        data = dict(self.data)
+        if self._settings.anonymous == "true":
+            data.pop("email", None)
+            data.pop("root", None)
         with open(self.fname, "w") as f:
-            s = json.dumps(self.data, indent=4)
+            s = json.dumps(data, indent=4)
             f.write(s)
             f.write("\n")
         base_name = os.path.basename(self.fname)
@@ -261,5 +393,7 @@ class Meta(object):
             files["files"].append((saved_program, "now"))
         for patch in self._saved_patches:
             files["files"].append((patch, "now"))
+        for fname in self._saved_environment:
+            files["files"].append((fname, "now"))
 
         self._interface.publish_files(files)
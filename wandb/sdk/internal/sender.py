@@ -7,10 +7,12 @@ sender.
 from __future__ import print_function
 
 from collections import defaultdict
+from concurrent import futures
 from datetime import datetime
 import json
 import logging
 import os
+import threading
 import time
 from typing import Any, Dict, Generator, List, NewType, Optional, Tuple
 
@@ -63,12 +65,13 @@ class SendManager(object):
     _telemetry_obj: telemetry.TelemetryRecord
 
     def __init__(
-        self, settings, record_q, result_q, interface,
+        self, settings, record_q, result_q, interface, upload_slots=None,
     ):
         self._settings = settings
         self._record_q = record_q
         self._result_q = result_q
         self._interface = interface
+        self._upload_slots = upload_slots
 
         self._fs = None
         self._pusher = None
@@ -130,9 +133,10 @@ class SendManager(object):
         self._exit_code = 0
 
     @classmethod
-    def setup(cls, root_dir):
+    def setup(cls, root_dir, upload_slots=None):
         """This is a helper class method to setup a standalone SendManager.
-        Currently we're using this primarily for `sync.py`.
+        Currently we're using this primarily for `sync.py`, where upload_slots
+        bounds the file uploads of all runs synced in parallel.
         """
         files_dir = os.path.join(root_dir, "files")
         sd = dict(
@@ -140,6 +144,7 @@ class SendManager(object):
             root_dir=root_dir,
             _start_time=0,
             git_remote=None,
+            _cwd=None,
             resume=None,
             program=None,
             ignore_globs=(),
@@ -164,6 +169,7 @@ class SendManager(object):
             record_q=record_q,
             result_q=result_q,
             interface=publish_interface,
+            upload_slots=upload_slots,
         )
 
     def __len__(self):
@@ -211,11 +217,23 @@ class SendManager(object):
 
     def send_request_check_version(self, record):
         assert record.control.req_resp
+        # pypi can be slow to answer, don't hold up the run upsert behind it
+        thread = threading.Thread(target=self._check_version, args=(record,))
+        thread.name = "CheckVersion"
+        thread.daemon = True
+        thread.start()
+
+    def _check_version(self, record):
+        start = time.time()
         result = wandb_internal_pb2.Result(uuid=record.uuid)
         current_version = (
             record.request.check_version.current_version or wandb.__version__
         )
-        messages = update.check_available(current_version)
+        try:
+            messages = update.check_available(current_version)
+        except Exception as e:
+            logger.warning("Failed to check for a newer version: %s", e)
+            messages = None
         if messages:
             upgrade_message = messages.get("upgrade_message")
             if upgrade_message:
@@ -226,6 +244,7 @@ class SendManager(object):
             delete_message = messages.get("delete_message")
             if delete_message:
                 result.response.check_version_response.delete_message = delete_message
+        logger.debug("checked version in %.3fs", time.time() - start)
         self._result_q.put(result)
 
     def send_request_stop_status(self, record):
@@ -350,7 +369,7 @@ class SendManager(object):
                 transition_state()
         elif state == defer.FLUSH_FS:
             if self._fs:
-                # TODO(jhr): now is a good time to output pending output lines
+                self._flush_output()
                 self._fs.finish(self._exit_code)
                 self._fs = None
             transition_state()
@@ -591,12 +610,13 @@ class SendManager(object):
             config_value_dict = self._config_format(self._consolidated_config)
             self._config_save(config_value_dict)
 
+        repo_info = None
         if is_wandb_init:
             # Ensure we have a project to query for status
             if run.project == "":
                 run.project = util.auto_project_name(self._settings.program)
             # Only check resume status on `wandb.init`
-            error = self._maybe_setup_resume(run)
+            error, repo_info = self._init_queries(run)
 
         if error is not None:
             if data.control.req_resp:
@@ -626,7 +646,9 @@ class SendManager(object):
             config_value_dict = self._config_format(None)
             self._config_save(config_value_dict)
 
-        self._init_run(run, config_value_dict)
+        start = time.time()
+        self._init_run(run, config_value_dict, repo_info=repo_info)
+        logger.info("upserted run in %.3fs", time.time() - start)
 
         if data.control.req_resp:
             resp = wandb_internal_pb2.Result(uuid=data.uuid)
@@ -642,10 +664,36 @@ class SendManager(object):
         else:
             logger.info("updated run: %s", self._run.run_id)
 
-    def _init_run(self, run, config_dict):
+    def _init_queries(
+        self, run
+    ) -> "Tuple[Optional[wandb_internal_pb2.ErrorInfo], Tuple[Optional[str], ...]]":
+        """Runs the queries that wandb.init needs before the run upsert.
+
+        The resume status query and the git probing don't depend on each other,
+        so they are run concurrently.
+
+        Returns:
+            The resume error, if any, and the remote url and commit of the repo.
+        """
+        start = time.time()
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            repo_info = executor.submit(self._repo_info)
+            error = self._maybe_setup_resume(run)
+            resume_time = time.time() - start
+            repo_info = repo_info.result()
+        logger.info(
+            "init queries took %.3fs (resume %.3fs)", time.time() - start, resume_time
+        )
+        return error, repo_info
+
+    def _repo_info(self) -> "Tuple[Optional[str], ...]":
+        repo = GitRepo(root=self._settings._cwd, remote=self._settings.git_remote)
+        return repo.remote_url, repo.last_commit
+
+    def _init_run(self, run, config_dict, repo_info=None):
         # We subtract the previous runs runtime when resuming
         start_time = run.start_time.ToSeconds() - self._resume_state["runtime"]
-        repo = GitRepo(remote=self._settings.git_remote)
+        remote_url, last_commit = repo_info or self._repo_info()
         # TODO: we don't check inserted currently, ultimately we should make
         # the upsert know the resume state and fail transactionally
         server_run, inserted = self._api.upsert_run(
@@ -661,8 +709,8 @@ class SendManager(object):
             sweep_name=run.sweep_id or None,
             host=run.host or None,
             program_path=self._settings.program or None,
-            repo=repo.remote_url,
-            commit=repo.last_commit,
+            repo=remote_url,
+            commit=last_commit,
         )
         self._run = run
         if self._resume_state.get("resumed"):
@@ -739,7 +787,12 @@ class SendManager(object):
             email=self._settings.email,
         )
         self._fs.start()
-        self._pusher = FilePusher(self._api, self._fs, silent=self._settings.silent)
+        self._pusher = FilePusher(
+            self._api,
+            self._fs,
+            silent=self._settings.silent,
+            upload_slots=self._upload_slots,
+        )
         self._dir_watcher = DirWatcher(
             self._settings, self._api, self._pusher, file_dir
         )
@@ -799,29 +852,42 @@ class SendManager(object):
         if not self._fs:
             return
         out = data.output
-        prepend = ""
         stream = "stdout"
         if out.output_type == wandb_internal_pb2.OutputRecord.OutputType.STDERR:
             stream = "stderr"
-            prepend = "ERROR "
-        line = out.line
-        if not line.endswith("\n"):
-            self._partial_output.setdefault(stream, "")
-            if line.startswith("\r"):
-                self._partial_output[stream] = ""
-            self._partial_output[stream] += line
-            # TODO(jhr): how do we make sure this gets flushed?
-            # we might need this for other stuff like telemetry
-        else:
-            # TODO(jhr): use time from timestamp proto
-            # TODO(jhr): do we need to make sure we write full lines?
-            # seems to be some issues with line breaks
-            cur_time = time.time()
-            timestamp = datetime.utcfromtimestamp(cur_time).isoformat() + " "
-            prev_str = self._partial_output.get(stream, "")
-            line = u"{}{}{}{}".format(prepend, timestamp, prev_str, line)
-            self._fs.push(filenames.OUTPUT_FNAME, line)
+        # a record holds everything captured since the last one, many lines of which
+        # only the last can be incomplete
+        complete, newline, partial = out.line.rpartition("\n")
+        if newline:
+            timestamp = (
+                out.timestamp.ToDatetime() if out.HasField("timestamp") else None
+            )
+            self._push_output(
+                stream,
+                self._partial_output.get(stream, "") + complete + newline,
+                timestamp,
+            )
             self._partial_output[stream] = ""
+        if partial:
+            if partial.startswith("\r"):
+                self._partial_output[stream] = ""
+            self._partial_output[stream] = (
+                self._partial_output.get(stream, "") + partial
+            )
+
+    def _push_output(self, stream, text, timestamp=None):
+        prepend = "ERROR " if stream == "stderr" else ""
+        timestamp = timestamp or datetime.utcnow()
+        self._fs.push(
+            filenames.OUTPUT_FNAME,
+            u"{}{} {}".format(prepend, timestamp.isoformat(), text),
+        )
+
+    def _flush_output(self):
+        for stream, partial in self._partial_output.items():
+            if partial:
+                self._push_output(stream, partial + "\n")
+        self._partial_output = dict()
 
     def _update_config(self):
         self._config_needs_debounce = True
@@ -17,10 +17,12 @@ class SettingsStatic(object):
     _offline: "Optional[bool]"
     _disable_stats: "Optional[bool]"
     _disable_meta: "Optional[bool]"
+    stats_sample_rate_hz: "Optional[float]"
     _start_time: float
     files_dir: str
     log_internal: str
     _internal_check_process: bool
+    _cwd: "Optional[str]"
 
     # TODO(jhr): clean this up, it is only in SettingsStatic and not in Settings
     _log_level: int
@@ -1,12 +1,15 @@
 #
 from __future__ import absolute_import
 
+import array
 import json
+import math
 import platform
+import struct
 import subprocess
 import threading
 import time
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import psutil
 import wandb
@@ -19,7 +22,6 @@ from ..lib import telemetry
 
 
 GPUHandle = object
-SamplerDict = Dict[str, List[float]]
 StatsDict = Dict[str, Union[float, Dict[str, float]]]
 
 
@@ -28,10 +30,7 @@ StatsDict = Dict[str, Union[float, Dict[str, float]]]
 M1_MAX_POWER_WATTS = 16.5
 
 
-def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
-    if not psutil:
-        return False
-
+def _our_pids() -> Set[int]:
     # NOTE: this optimizes for the case where wandb was initialized from
     # iniside the user script (i.e. `wandb.init()`). If we ran using
     # `wandb run` on the command line, the shell will be detected as the
@@ -43,8 +42,10 @@ def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
     our_processes = base_process.children(recursive=True)
     our_processes.append(base_process)
 
-    our_pids = set([process.pid for process in our_processes])
+    return set([process.pid for process in our_processes])
+
 
+def _gpu_pids(gpu_handle: GPUHandle) -> Set[int]:
     compute_pids = set(
         [
             process.pid
@@ -57,59 +58,441 @@ def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
             for process in pynvml.nvmlDeviceGetGraphicsRunningProcesses(gpu_handle)
         ]
     )
+    return compute_pids | graphics_pids
+
+
+def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
+    if not psutil:
+        return False
+    return len(_gpu_pids(gpu_handle) & _our_pids()) > 0
+
+
+class RingBuffer(object):
+    """Fixed size buffer of the last `size` samples of a stat."""
+
+    __slots__ = ("_values", "_next", "_count")
+
+    def __init__(self, size: int) -> None:
+        self._values = array.array("d", [0.0]) * max(1, size)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, value: float) -> None:
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        self._count = min(self._count + 1, len(self._values))
+
+    def clear(self) -> None:
+        self._next = 0
+        self._count = 0
+
+    def reduce(self, how: str) -> float:
+        values = self._values[: self._count]
+        if how == "mean":
+            return sum(values) / self._count
+        elif how == "min":
+            return min(values)
+        elif how == "max":
+            return max(values)
+        elif how == "last":
+            return self._values[self._next - 1]
+        raise ValueError("unknown reduction: {}".format(how))
+
+
+class Probe(object):
+    """A source of system metrics, sampled every `interval` seconds.
+
+    Subclasses implement `sample`, which returns a dict of stats. Numbers are
+    aggregated over the samples between two flushes, by default into their mean.
+    List the reductions to report for a stat in `aggregates`, any but "mean" are
+    reported as "<stat>.<reduction>". Anything else than a number is reported as
+    last sampled.
+    """
+
+    interval: float = 2
+    aggregates: Dict[str, Tuple[str, ...]] = {}
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def sample(self) -> StatsDict:
+        raise NotImplementedError
+
+
+class NvmlProbe(Probe):
+    """Utilization, memory, temperature and power of every NVIDIA GPU.
+
+    Device handles and power limits are looked up once. Which GPUs our processes
+    use involves enumerating processes, so it is only refreshed every
+    `process_refresh_seconds`.
+    """
+
+    process_refresh_seconds = 30
+
+    def __init__(self, gpu_count: int) -> None:
+        self._handles = []
+        self._power_limits: Dict[int, Optional[float]] = {}
+        for i in range(gpu_count):
+            try:
+                self._handles.append(pynvml.nvmlDeviceGetHandleByIndex(i))
+            except pynvml.NVMLError:
+                self._handles.append(None)
+        self._in_use: Dict[int, bool] = {}
+        self._in_use_time = 0.0
+
+    def _refresh_in_use(self) -> None:
+        now = time.time()
+        if now - self._in_use_time < self.process_refresh_seconds:
+            return
+        self._in_use_time = now
+        our_pids = _our_pids() if psutil else set()
+        for i, handle in enumerate(self._handles):
+            try:
+                self._in_use[i] = bool(our_pids and _gpu_pids(handle) & our_pids)
+            except pynvml.NVMLError:
+                self._in_use[i] = False
+
+    def _power_limit(self, i: int, handle: GPUHandle) -> Optional[float]:
+        if i not in self._power_limits:
+            try:
+                limit = pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
+            except pynvml.NVMLError:
+                limit = None
+            self._power_limits[i] = limit
+        return self._power_limits[i]
+
+    def sample(self) -> StatsDict:
+        stats: StatsDict = {}
+        self._refresh_in_use()
+        for i, handle in enumerate(self._handles):
+            if handle is None:
+                continue
+            try:
+                utilz = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                temp = pynvml.nvmlDeviceGetTemperature(
+                    handle, pynvml.NVML_TEMPERATURE_GPU
+                )
+            except pynvml.NVMLError:
+                continue
+            gpu_stats = {
+                "gpu": utilz.gpu,
+                "memory": utilz.memory,
+                "memoryAllocated": (memory.used / float(memory.total)) * 100,
+                "temp": temp,
+            }
+            # Some GPUs don't provide information about power usage
+            power_capacity_watts = self._power_limit(i, handle)
+            if power_capacity_watts:
+                try:
+                    power_watts = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
+                    gpu_stats["powerWatts"] = power_watts
+                    gpu_stats["powerPercent"] = (
+                        power_watts / power_capacity_watts
+                    ) * 100
+                except pynvml.NVMLError:
+                    pass
+            for k, v in gpu_stats.items():
+                stats["gpu.{}.{}".format(i, k)] = v
+                if self._in_use.get(i):
+                    stats["gpu.process.{}.{}".format(i, k)] = v
+        return stats
+
+
+class AppleGpuProbe(Probe):
+    """GPU of Apple M1 systems, read from the apple_gpu_stats helper binary."""
+
+    def __init__(self, interface: Optional[BackendSender]) -> None:
+        self._interface = interface
+        self._telem = telemetry.TelemetryRecord()
+
+    def sample(self) -> StatsDict:
+        stats: StatsDict = {}
+        try:
+            out = subprocess.check_output([util.apple_gpu_stats_binary(), "--json"])
+            m1_stats = json.loads(out.split(b"\n")[0])
+            stats["gpu.0.gpu"] = m1_stats["utilization"]
+            stats["gpu.0.memoryAllocated"] = m1_stats["mem_used"]
+            stats["gpu.0.temp"] = m1_stats["temperature"]
+            stats["gpu.0.powerWatts"] = m1_stats["power"]
+            stats["gpu.0.powerPercent"] = (m1_stats["power"] / M1_MAX_POWER_WATTS) * 100
+            # TODO: this stat could be useful eventually, it was consistently
+            # 0 in my experimentation and requires a frontend change
+            # so leaving it out for now.
+            # stats["gpu.0.cpuWaitMs"] = m1_stats["cpu_wait_ms"]
+
+            if self._interface and not self._telem.env.m1_gpu:
+                self._telem.env.m1_gpu = True
+                self._interface.publish_telemetry(self._telem)
+
+        except (OSError, ValueError, TypeError, subprocess.CalledProcessError) as e:
+            wandb.termwarn("GPU stats error {}".format(e))
+        return stats
+
+
+class CpuMemoryProbe(Probe):
+    """System CPU and memory, and memory and threads of the process `pid`."""
+
+    def __init__(self, pid: int) -> None:
+        self._proc = psutil.Process(pid=pid)
+
+    def sample(self) -> StatsDict:
+        sysmem = psutil.virtual_memory()
+        stats: StatsDict = {
+            "cpu": psutil.cpu_percent(),
+            "memory": sysmem.percent,
+            "proc.memory.availableMB": sysmem.available / 1048576.0,
+        }
+        try:
+            with self._proc.oneshot():
+                stats["proc.memory.rssMB"] = self._proc.memory_info().rss / 1048576.0
+                stats["proc.memory.percent"] = self._proc.memory_percent()
+                stats["proc.cpu.threads"] = self._proc.num_threads()
+        except psutil.NoSuchProcess:
+            pass
+        return stats
+
+
+class NetworkProbe(Probe):
+    """Bytes sent and received since the probe was created."""
 
-    pids_using_device = compute_pids | graphics_pids
+    def __init__(self) -> None:
+        net = psutil.net_io_counters()
+        self._init = {"sent": net.bytes_sent, "recv": net.bytes_recv}
 
-    return len(pids_using_device & our_pids) > 0
+    def sample(self) -> StatsDict:
+        net = psutil.net_io_counters()
+        return {
+            "network": {
+                "sent": net.bytes_sent - self._init["sent"],
+                "recv": net.bytes_recv - self._init["recv"],
+            }
+        }
+
+
+class DiskProbe(Probe):
+    """Usage of the root partition, which changes slowly."""
+
+    interval = 10
+
+    def sample(self) -> StatsDict:
+        # TODO: maybe show other partitions, will likely need user to configure
+        return {"disk": psutil.disk_usage("/").percent}
+
+
+class TpuProbe(Probe):
+    def __init__(self, profiler: Any) -> None:
+        self._profiler = profiler
+
+    def start(self) -> None:
+        self._profiler.start()
+
+    def stop(self) -> None:
+        self._profiler.stop()
+
+    def sample(self) -> StatsDict:
+        return {"tpu": self._profiler.get_tpu_utilization()}
+
+
+class HighFrequencyProbe(Probe):
+    """GPU utilization, memory and PCIe throughput, and host CPU and IO wait,
+    sampled `sample_rate_hz` times a second to catch short stalls.
+
+    Every sample is appended to a compact binary file, see `load_profile`. The
+    stats are reported as "profile.<stat>" with their mean, min and max. PCIe
+    throughput is measured by NVML over 20ms, so it is only sampled every
+    `pcie_interval` seconds and repeated in between.
+    """
+
+    max_sample_rate_hz = 100
+    pcie_interval = 1.0
+    buffer_bytes = 64 * 1024
+
+    def __init__(self, sample_rate_hz: float, gpu_count: int, path: str) -> None:
+        self.interval = 1.0 / min(sample_rate_hz, self.max_sample_rate_hz)
+        self._path = path
+        self._handles = []
+        for i in range(gpu_count):
+            try:
+                self._handles.append(pynvml.nvmlDeviceGetHandleByIndex(i))
+            except pynvml.NVMLError:
+                pass
+        self.channels = ["cpu", "cpu.iowait"]
+        for i in range(len(self._handles)):
+            self.channels.extend(
+                "gpu.{}.{}".format(i, k)
+                for k in ("gpu", "memory", "memoryAllocated", "pcieTxKBs", "pcieRxKBs")
+            )
+        self.aggregates = {
+            "profile." + c: ("mean", "min", "max") for c in self.channels
+        }
+        self._record = struct.Struct("<d%df" % len(self.channels))
+        self._pcie = [(0.0, 0.0)] * len(self._handles)
+        self._pcie_time = 0.0
+        self._cpu_times = None
+        self._buffer = bytearray()
+        self._file = None
+
+    def start(self) -> None:
+        self._file = open(self._path, "wb")
+        header = {
+            "record": self._record.format,
+            "channels": self.channels,
+            "sample_rate_hz": 1.0 / self.interval,
+        }
+        self._file.write(json.dumps(header).encode("utf-8") + b"\n")
+
+    def stop(self) -> None:
+        if self._file:
+            self._file.write(self._buffer)
+            self._file.close()
+            self._file = None
+            self._buffer = bytearray()
+
+    def _cpu(self) -> Tuple[float, float]:
+        times = psutil.cpu_times()
+        last, self._cpu_times = self._cpu_times, times
+        total = sum(times) - sum(last) if last else 0
+        if total <= 0:
+            return math.nan, math.nan
+        idle = times.idle - last.idle
+        iowait = getattr(times, "iowait", 0.0) - getattr(last, "iowait", 0.0)
+        return (total - idle - iowait) / total * 100, iowait / total * 100
+
+    def sample(self) -> StatsDict:
+        now = time.time()
+        values = list(self._cpu())
+        refresh_pcie = now - self._pcie_time >= self.pcie_interval
+        if refresh_pcie:
+            self._pcie_time = now
+        for i, handle in enumerate(self._handles):
+            try:
+                utilz = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                if refresh_pcie:
+                    self._pcie[i] = (
+                        pynvml.nvmlDeviceGetPcieThroughput(
+                            handle, pynvml.NVML_PCIE_UTIL_TX_BYTES
+                        ),
+                        pynvml.nvmlDeviceGetPcieThroughput(
+                            handle, pynvml.NVML_PCIE_UTIL_RX_BYTES
+                        ),
+                    )
+                values.extend(
+                    [
+                        utilz.gpu,
+                        utilz.memory,
+                        (memory.used / float(memory.total)) * 100,
+                    ]
+                )
+            except pynvml.NVMLError:
+                values.extend([math.nan] * 3)
+            values.extend(self._pcie[i])
+        if self._file:
+            self._buffer += self._record.pack(now, *values)
+            if len(self._buffer) >= self.buffer_bytes:
+                self._file.write(self._buffer)
+                self._buffer = bytearray()
+        return {
+            "profile." + c: v
+            for c, v in zip(self.channels, values)
+            if not math.isnan(v)
+        }
+
+
+def load_profile(path: str) -> Tuple[List[str], List[Tuple[float, ...]]]:
+    """Reads a file written by `HighFrequencyProbe`.
+
+    Arguments:
+        path: path to the file
+
+    Returns:
+        The channel names, and a (timestamp, *values) tuple per sample.
+    """
+    with open(path, "rb") as f:
+        header = json.loads(f.readline().decode("utf-8"))
+        data = f.read()
+    record = struct.Struct(header["record"])
+    data = data[: len(data) - len(data) % record.size]
+    return header["channels"], list(record.iter_unpack(data))
 
 
 class SystemStats(object):
+    """Samples every probe at its own interval on one thread, and publishes the
+    aggregated stats every `sample_rate_seconds * samples_to_average` seconds."""
 
     _pid: int
     _interface: BackendSender
-    sampler: SamplerDict
-    samples: int
+    _probes: List[Probe]
+    _buffers: Dict[Tuple[int, str], RingBuffer]
+    _latest: StatsDict
+    _sampled: Set[int]
     _thread: Optional[threading.Thread]
     gpu_count: int
 
-    def __init__(self, pid: int, interface: BackendSender) -> None:
+    def __init__(
+        self, pid: int, interface: BackendSender, probes: List[Probe] = None
+    ) -> None:
         try:
             pynvml.nvmlInit()
             self.gpu_count = pynvml.nvmlDeviceGetCount()
         except pynvml.NVMLError:
             self.gpu_count = 0
-        # self.run = run
         self._pid = pid
         self._interface = interface
-        self.sampler = {}
-        self.samples = 0
-        self._shutdown = False
-        self._telem = telemetry.TelemetryRecord()
+        self._buffers = {}
+        self._latest = {}
+        self._sampled = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        if probes is None:
+            probes = self._default_probes()
+        self._probes = []
+        for probe in probes:
+            self.add_probe(probe)
+
+    def _default_probes(self) -> List[Probe]:
+        probes: List[Probe] = []
+        if self.gpu_count:
+            probes.append(NvmlProbe(self.gpu_count))
+        # On Apple M1 systems let's look for the gpu
+        elif platform.system() == "Darwin" and platform.processor() == "arm":
+            probes.append(AppleGpuProbe(self._interface))
         if psutil:
-            net = psutil.net_io_counters()
-            self.network_init = {"sent": net.bytes_sent, "recv": net.bytes_recv}
+            probes.extend([CpuMemoryProbe(self._pid), NetworkProbe(), DiskProbe()])
         else:
             wandb.termlog(
                 "psutil not installed, only GPU stats will be reported.  Install with pip install psutil"
             )
-        self._thread = None
-        self._tpu_profiler = None
-
         if tpu.is_tpu_available():
             try:
-                self._tpu_profiler = tpu.get_profiler()
+                probes.append(TpuProbe(tpu.get_profiler()))
             except Exception as e:
                 wandb.termlog("Error initializing TPUProfiler: " + str(e))
+        return probes
+
+    def add_probe(self, probe: Probe) -> None:
+        """Adds a source of stats, it is sampled from the next round on."""
+        with self._lock:
+            self._probes.append(probe)
 
     def start(self) -> None:
         if self._thread is None:
-            self._shutdown = False
+            self._stopped.clear()
             self._thread = threading.Thread(target=self._thread_body)
             self._thread.daemon = True
         if not self._thread.is_alive():
+            for probe in self._probes:
+                probe.start()
             self._thread.start()
-        if self._tpu_profiler:
-            self._tpu_profiler.start()
 
     @property
     def proc(self) -> psutil.Process:
@@ -127,148 +510,83 @@ class SystemStats(object):
         return 15
         # return min(30, max(2, self._api.dynamic_settings["system_samples"]))
 
+    @property
+    def flush_seconds(self) -> float:
+        return self.sample_rate_seconds * self.samples_to_average
+
     def _thread_body(self) -> None:
-        while True:
-            stats = self.stats()
-            for stat, value in stats.items():
-                if isinstance(value, (int, float)):
-                    self.sampler[stat] = self.sampler.get(stat, [])
-                    self.sampler[stat].append(value)
-            self.samples += 1
-            if self._shutdown or self.samples >= self.samples_to_average:
+        next_sample: Dict[int, float] = {}
+        next_flush = time.time() + self.flush_seconds
+        while not self._stopped.is_set():
+            now = time.time()
+            with self._lock:
+                probes = list(enumerate(self._probes))
+            for i, probe in probes:
+                due = next_sample.get(i, now)
+                if due <= now:
+                    self._sample(i, probe)
+                    # keep the rate of fast probes unless we fell behind
+                    due += probe.interval
+                    next_sample[i] = due if due > now else now + probe.interval
+            if next_flush <= now:
                 self.flush()
-                if self._shutdown:
-                    break
-            seconds = 0.0
-            while seconds < self.sample_rate_seconds:
-                time.sleep(0.1)
-                seconds += 0.1
-                if self._shutdown:
-                    self.flush()
-                    return
+                next_flush = now + self.flush_seconds
+            self._stopped.wait(
+                max(0, min([next_flush] + list(next_sample.values())) - now)
+            )
+        self.flush()
+
+    def _sample(self, i: int, probe: Probe) -> None:
+        try:
+            stats = probe.sample()
+        except Exception as e:
+            wandb.termwarn("System stats error {}".format(e))
+            return
+        self._sampled.add(i)
+        window = self.flush_seconds
+        for stat, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                buf = self._buffers.get((i, stat))
+                if buf is None:
+                    size = int(math.ceil(window / max(probe.interval, 0.1))) + 1
+                    buf = self._buffers[(i, stat)] = RingBuffer(size)
+                buf.add(value)
+            else:
+                self._latest[stat] = value
 
     def shutdown(self) -> None:
-        self._shutdown = True
+        self._stopped.set()
         try:
             if self._thread is not None:
                 self._thread.join()
         finally:
             self._thread = None
-        if self._tpu_profiler:
-            self._tpu_profiler.stop()
+        for probe in self._probes:
+            probe.stop()
 
     def flush(self) -> None:
-        stats = self.stats()
-        for stat, value in stats.items():
-            # TODO: a bit hacky, we assume all numbers should be averaged.  If you want
-            # max for a stat, you must put it in a sub key, like ["network"]["sent"]
-            if isinstance(value, (float, int)):
-                # samples = list(self.sampler.get(stat, [stats[stat]]))
-                samples = list(self.sampler.get(stat, [value]))
-                stats[stat] = round(sum(samples) / len(samples), 2)
-        # self.run.events.track("system", stats, _wandb=True)
-        if self._interface:
+        with self._lock:
+            probes = list(enumerate(self._probes))
+        # probes slower than the flush interval may not have a sample yet
+        for i, probe in probes:
+            if i not in self._sampled:
+                self._sample(i, probe)
+        stats = dict(self._latest)
+        for (i, stat), buf in self._buffers.items():
+            if not len(buf):
+                continue
+            for how in probes[i][1].aggregates.get(stat, ("mean",)):
+                key = stat if how == "mean" else "{}.{}".format(stat, how)
+                stats[key] = round(buf.reduce(how), 2)
+            buf.clear()
+        if self._interface and stats:
             self._interface.publish_stats(stats)
-        self.samples = 0
-        self.sampler = {}
+        self._latest = {}
+        self._sampled = set()
 
     def stats(self) -> StatsDict:
+        """Samples every probe once."""
         stats: StatsDict = {}
-        for i in range(0, self.gpu_count):
-            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-            try:
-                utilz = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                temp = pynvml.nvmlDeviceGetTemperature(
-                    handle, pynvml.NVML_TEMPERATURE_GPU
-                )
-                in_use_by_us = gpu_in_use_by_this_process(handle)
-
-                stats["gpu.{}.{}".format(i, "gpu")] = utilz.gpu
-                stats["gpu.{}.{}".format(i, "memory")] = utilz.memory
-                stats["gpu.{}.{}".format(i, "memoryAllocated")] = (
-                    memory.used / float(memory.total)
-                ) * 100
-                stats["gpu.{}.{}".format(i, "temp")] = temp
-
-                if in_use_by_us:
-                    stats["gpu.process.{}.{}".format(i, "gpu")] = utilz.gpu
-                    stats["gpu.process.{}.{}".format(i, "memory")] = utilz.memory
-                    stats["gpu.process.{}.{}".format(i, "memoryAllocated")] = (
-                        memory.used / float(memory.total)
-                    ) * 100
-                    stats["gpu.process.{}.{}".format(i, "temp")] = temp
-
-                    # Some GPUs don't provide information about power usage
-                try:
-                    power_watts = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
-                    power_capacity_watts = (
-                        pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
-                    )
-                    power_usage = (power_watts / power_capacity_watts) * 100
-
-                    stats["gpu.{}.{}".format(i, "powerWatts")] = power_watts
-                    stats["gpu.{}.{}".format(i, "powerPercent")] = power_usage
-
-                    if in_use_by_us:
-                        stats["gpu.process.{}.{}".format(i, "powerWatts")] = power_watts
-                        stats[
-                            "gpu.process.{}.{}".format(i, "powerPercent")
-                        ] = power_usage
-
-                except pynvml.NVMLError:
-                    pass
-
-            except pynvml.NVMLError:
-                pass
-
-        # On Apple M1 systems let's look for the gpu
-        if (
-            platform.system() == "Darwin"
-            and platform.processor() == "arm"
-            and self.gpu_count == 0
-        ):
-            try:
-                out = subprocess.check_output([util.apple_gpu_stats_binary(), "--json"])
-                m1_stats = json.loads(out.split(b"\n")[0])
-                stats["gpu.0.gpu"] = m1_stats["utilization"]
-                stats["gpu.0.memoryAllocated"] = m1_stats["mem_used"]
-                stats["gpu.0.temp"] = m1_stats["temperature"]
-                stats["gpu.0.powerWatts"] = m1_stats["power"]
-                stats["gpu.0.powerPercent"] = (
-                    m1_stats["power"] / M1_MAX_POWER_WATTS
-                ) * 100
-                # TODO: this stat could be useful eventually, it was consistently
-                # 0 in my experimentation and requires a frontend change
-                # so leaving it out for now.
-                # stats["gpu.0.cpuWaitMs"] = m1_stats["cpu_wait_ms"]
-
-                if self._interface and not self._telem.env.m1_gpu:
-                    self._telem.env.m1_gpu = True
-                    self._interface.publish_telemetry(self._telem)
-
-            except (OSError, ValueError, TypeError, subprocess.CalledProcessError) as e:
-                wandb.termwarn("GPU stats error {}".format(e))
-                pass
-
-        if psutil:
-            net = psutil.net_io_counters()
-            sysmem = psutil.virtual_memory()
-            stats["cpu"] = psutil.cpu_percent()
-            stats["memory"] = sysmem.percent
-            stats["network"] = {
-                "sent": net.bytes_sent - self.network_init["sent"],
-                "recv": net.bytes_recv - self.network_init["recv"],
-            }
-            # TODO: maybe show other partitions, will likely need user to configure
-            stats["disk"] = psutil.disk_usage("/").percent
-            stats["proc.memory.availableMB"] = sysmem.available / 1048576.0
-            try:
-                stats["proc.memory.rssMB"] = self.proc.memory_info().rss / 1048576.0
-                stats["proc.memory.percent"] = self.proc.memory_percent()
-                stats["proc.cpu.threads"] = self.proc.num_threads()
-            except psutil.NoSuchProcess:
-                pass
-        if self._tpu_profiler:
-            stats["tpu"] = self._tpu_profiler.get_tpu_utilization()
+        for probe in self._probes:
+            stats.update(probe.sample())
         return stats
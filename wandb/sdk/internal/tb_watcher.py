@@ -3,9 +3,11 @@
 tensor b watcher.
 """
 
+import collections
 import logging
 import os
 import socket
+import struct
 import sys
 import threading
 import time
@@ -23,9 +25,9 @@ from . import run as internal_run
 if TYPE_CHECKING:
     from ..interface.interface import BackendSender
     from .settings_static import SettingsStatic
-    from typing import Dict, List, Optional
+    from typing import Any, Deque, Dict, Iterator, List, Optional
     from wandb.proto.wandb_internal_pb2 import RunRecord
-    from six.moves.queue import PriorityQueue
+    from six.moves.queue import Queue
     from tensorboard.compat.proto.event_pb2 import ProtoEvent
     from tensorboard.backend.event_processing.event_file_loader import EventFileLoader
 
@@ -34,6 +36,10 @@ if TYPE_CHECKING:
 # Give some time for tensorboard data to be flushed
 SHUTDOWN_DELAY = 5
 ERROR_DELAY = 5
+# Event files are polled again after MIN_POLL_DELAY when they had new events,
+# backing off up to MAX_POLL_DELAY while they don't grow
+MIN_POLL_DELAY = 0.1
+MAX_POLL_DELAY = 4
 REMOTE_FILE_TOKEN = "://"
 logger = logging.getLogger(__name__)
 
@@ -95,9 +101,101 @@ def is_tfevents_file_created_by(path: str, hostname: str, start_time: float) ->
     return created_time >= int(start_time)  # noqa: W503
 
 
+class _TFRecordIterator(object):
+    """Iterates over the records of a local TFRecord file as it grows.
+
+    Only the checksum of the 8 byte length is verified, a corrupt length raises
+    DataLossError like tensorboard's reader. Without TensorFlow, tensorboard also
+    checks the data with a crc computed in Python, which dominates the time spent
+    loading large files. A record that is not completely written yet is returned
+    by a later call.
+    """
+
+    _CHUNK_BYTES = 4 * 1024 * 1024
+    # uint64 length, uint32 length crc, data, uint32 data crc
+    _HEADER = struct.Struct("<QI")
+
+    def __init__(self, file_path: str) -> None:
+        from tensorboard.compat.tensorflow_stub import errors, pywrap_tensorflow
+
+        self._errors = errors
+        self._masked_crc32c = pywrap_tensorflow.masked_crc32c
+        self._file_path = file_path
+        self._file = open(file_path, "rb")
+        self._buf = b""
+        self._pos = 0
+
+    def __iter__(self) -> "_TFRecordIterator":
+        return self
+
+    def _fill(self, n: int) -> bool:
+        while len(self._buf) - self._pos < n:
+            chunk = self._file.read(max(n, self._CHUNK_BYTES))
+            if not chunk:
+                return False
+            self._buf = self._buf[self._pos :] + chunk
+            self._pos = 0
+        return True
+
+    def __next__(self) -> bytes:
+        header_size = self._HEADER.size
+        if not self._fill(header_size):
+            raise StopIteration
+        length, length_crc = self._HEADER.unpack_from(self._buf, self._pos)
+        if self._masked_crc32c(self._buf[self._pos : self._pos + 8]) != length_crc:
+            raise self._errors.DataLossError(
+                None, None, "{} failed header crc32 check".format(self._file_path)
+            )
+        if not self._fill(header_size + length + 4):
+            raise StopIteration
+        start = self._pos + header_size
+        self._pos = start + length + 4
+        return self._buf[start : start + length]
+
+    next = __next__
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _SimpleScalarFilter(object):
+    """Wraps a record iterator and diverts the events that only hold simple_value
+    scalars to `diverted`, returning the other records.
+
+    EventFileLoader converts every simple_value into a scalar tensor summary, which
+    is most of the time spent loading scalars, while tf_summary_to_dict reads
+    simple_value directly. Diverted events skip the conversion.
+    """
+
+    def __init__(self, records: "Iterator[bytes]") -> None:
+        from tensorboard.compat.proto import event_pb2
+
+        self._records = records
+        self._event_from_string = event_pb2.Event.FromString
+        self.diverted: "Deque[ProtoEvent]" = collections.deque()
+
+    def __iter__(self) -> "_SimpleScalarFilter":
+        return self
+
+    def __next__(self) -> bytes:
+        while True:
+            record = next(self._records)
+            event = self._event_from_string(record)
+            values = event.summary.value
+            if not values or not all(v.HasField("simple_value") for v in values):
+                return record
+            self.diverted.append(event)
+
+    next = __next__
+
+    def __getattr__(self, name: str) -> "Any":
+        # e.g. close and reopen
+        return getattr(self._records, name)
+
+
 class TBWatcher(object):
     _logdirs: "Dict[str, TBDirWatcher]"
-    _watcher_queue: "PriorityQueue"
+    _watcher_queue: "Queue"
 
     def __init__(
         self,
@@ -112,9 +210,10 @@ class TBWatcher(object):
         self._interface = interface
         self._run_proto = run_proto
         self._force = force
-        # TODO(jhr): do we need locking in this queue?
-        self._watcher_queue = queue.PriorityQueue()
-        wandb.tensorboard.reset_state()
+        self._watcher_queue = queue.Queue()
+        # the wandb service runs many watchers in one process, so each keeps its
+        # own steps instead of the module state of wandb.tensorboard
+        self._steps = wandb.tensorboard.new_steps()
 
     def _calculate_namespace(self, logdir: str, rootdir: str) -> "Optional[str]":
         namespace: "Optional[str]"
@@ -180,7 +279,7 @@ class TBDirWatcher(object):
         logdir: str,
         save: bool,
         namespace: "Optional[str]",
-        queue: "PriorityQueue",
+        queue: "Queue",
         force: bool = False,
     ) -> None:
         self.directory_watcher = util.get_module(
@@ -199,6 +298,7 @@ class TBDirWatcher(object):
             logdir, self._loader(save, namespace), self._is_our_tfevents_file
         )
         self._thread = threading.Thread(target=self._thread_body)
+        self._lock = threading.Lock()
         self._first_event_timestamp = None
         self._shutdown = threading.Event()
         self._queue = queue
@@ -234,6 +334,15 @@ class TBDirWatcher(object):
         class EventFileLoader(event_file_loader.EventFileLoader):
             def __init__(self, file_path: str) -> None:
                 super(EventFileLoader, self).__init__(file_path)
+                # tensorboard>=2.1 reads the records through self._iterator
+                if hasattr(self, "_iterator"):
+                    # without TensorFlow, read local files with our own reader
+                    if (
+                        REMOTE_FILE_TOKEN not in file_path
+                        and event_file_loader.tf.__version__ == "stub"
+                    ):
+                        self._iterator = _TFRecordIterator(file_path)
+                    self._iterator = _SimpleScalarFilter(self._iterator)
                 if save:
                     if REMOTE_FILE_TOKEN in file_path:
                         logger.warning(
@@ -253,38 +362,70 @@ class TBDirWatcher(object):
                             settings=_loader_settings,
                         )
 
+            def Load(self) -> "Iterator[ProtoEvent]":  # noqa: N802
+                if not isinstance(
+                    getattr(self, "_iterator", None), _SimpleScalarFilter
+                ):
+                    for event in super(EventFileLoader, self).Load():
+                        yield event
+                    return
+                # the events diverted while reading up to an event precede it
+                diverted = self._iterator.diverted
+                for event in super(EventFileLoader, self).Load():
+                    while diverted:
+                        yield diverted.popleft()
+                    yield event
+                while diverted:
+                    yield diverted.popleft()
+
         return EventFileLoader
 
-    def _process_events(self, shutdown_call: bool = False) -> None:
-        try:
-            for event in self._generator.Load():
-                self.process_event(event)
-        except (
-            self.directory_watcher.DirectoryDeletedError,
-            StopIteration,
-            RuntimeError,
-            OSError,
-        ) as e:
-            # When listing s3 the directory may not yet exist, or could be empty
-            logger.debug("Encountered tensorboard directory watcher error: %s", e)
-            if not self._shutdown.is_set() and not shutdown_call:
-                time.sleep(ERROR_DELAY)
+    def _process_events(self, shutdown_call: bool = False) -> int:
+        """Queues the new events as one batch, returns how many there were."""
+        events: "List[Event]" = []
+        error = False
+        # shutdown() loads from the caller's thread while ours may be loading
+        with self._lock:
+            try:
+                for event in self._generator.Load():
+                    self.process_event(event, events)
+            except (
+                self.directory_watcher.DirectoryDeletedError,
+                StopIteration,
+                RuntimeError,
+                OSError,
+            ) as e:
+                # When listing s3 the directory may not yet exist, or could be empty
+                logger.debug("Encountered tensorboard directory watcher error: %s", e)
+                error = True
+            if events:
+                self._queue.put(events)
+        if error and not self._shutdown.is_set() and not shutdown_call:
+            time.sleep(ERROR_DELAY)
+        return len(events)
 
     def _thread_body(self) -> None:
-        """Check for new events every second"""
+        """Check for new events, more often while the files are growing"""
         shutdown_time: "Optional[float]" = None
+        delay = MIN_POLL_DELAY
         while True:
-            self._process_events()
+            if self._process_events():
+                delay = MIN_POLL_DELAY
+            else:
+                delay = min(delay * 2, MAX_POLL_DELAY)
             if self._shutdown.is_set():
                 now = time.time()
                 if not shutdown_time:
                     shutdown_time = now + SHUTDOWN_DELAY
                 elif now > shutdown_time:
                     break
-            time.sleep(1)
+                time.sleep(1)
+            else:
+                self._shutdown.wait(delay)
 
-    def process_event(self, event: "ProtoEvent") -> None:
-        # print("\nEVENT:::", self._logdir, self._namespace, event, "\n")
+    def process_event(
+        self, event: "ProtoEvent", events: "Optional[List[Event]]" = None
+    ) -> None:
         if self._first_event_timestamp is None:
             self._first_event_timestamp = event.wall_time
 
@@ -292,7 +433,10 @@ class TBDirWatcher(object):
             self._file_version = event.file_version
 
         if event.HasField("summary"):
-            self._queue.put(Event(event, self._namespace))
+            if events is None:
+                self._queue.put([Event(event, self._namespace)])
+            else:
+                events.append(Event(event, self._namespace))
 
     def shutdown(self) -> None:
         self._process_events(shutdown_call=True)
@@ -304,7 +448,7 @@ class TBDirWatcher(object):
 
 
 class Event(object):
-    """An event wrapper to enable priority queueing"""
+    """An event wrapper to order events by time"""
 
     def __init__(self, event: "ProtoEvent", namespace: "Optional[str]"):
         self.event = event
@@ -318,16 +462,17 @@ class Event(object):
 
 
 class TBEventConsumer(object):
-    """Consumes tfevents from a priority queue.  There should always
+    """Consumes batches of tfevents from a queue.  There should always
     only be one of these per run_manager.  We wait for 10 seconds of queued
     events to reduce the chance of multiple tfevent files triggering
-    out of order steps.
+    out of order steps, and handle the events of all batches queued at the
+    same time in order of their time.
     """
 
     def __init__(
         self,
         tbwatcher: TBWatcher,
-        queue: "PriorityQueue",
+        queue: "Queue",
         run_proto: "RunRecord",
         settings: "SettingsStatic",
         delay: int = 10,
@@ -355,38 +500,35 @@ class TBEventConsumer(object):
     def finish(self) -> None:
         self._delay = 0
         self._shutdown.set()
-        try:
-            event = self._queue.get(True, 1)
-        except queue.Empty:
-            event = None
-        if event:
-            self._handle_event(event, history=self.tb_history)
-            items = self.tb_history._get_and_reset()
-            for item in items:
-                self._save_row(item,)
         self._thread.join()
 
-    def _thread_body(self) -> None:
+    def _get_events(self) -> "List[Event]":
+        """Waits up to a second for a batch of events, and returns the events of all
+        queued batches in time order."""
+        try:
+            events = self._queue.get(True, 1)
+        except queue.Empty:
+            return []
         while True:
             try:
-                event = self._queue.get(True, 1)
-                # Wait self._delay seconds from consumer start before logging events
-                if (
-                    time.time() < self._start_time + self._delay
-                    and not self._shutdown.is_set()
-                ):
-                    self._queue.put(event)
-                    time.sleep(0.1)
-                    continue
+                events.extend(self._queue.get_nowait())
             except queue.Empty:
-                event = None
-                if self._shutdown.is_set():
-                    break
-            if event:
+                break
+        # the batches are mostly in order already, which the sort takes advantage of
+        events.sort(key=lambda e: e.event.wall_time)
+        return events
+
+    def _thread_body(self) -> None:
+        # Wait self._delay seconds from consumer start before logging events
+        self._shutdown.wait(max(0, self._start_time + self._delay - time.time()))
+        while True:
+            events = self._get_events()
+            if not events and self._shutdown.is_set():
+                break
+            for event in events:
                 self._handle_event(event, history=self.tb_history)
-                items = self.tb_history._get_and_reset()
-                for item in items:
-                    self._save_row(item,)
+            for item in self.tb_history._get_and_reset():
+                self._save_row(item)
         # flush uncommitted data
         self.tb_history._flush()
         items = self.tb_history._get_and_reset()
@@ -399,6 +541,7 @@ class TBEventConsumer(object):
             step=event.event.step,
             namespace=event.namespace,
             history=history,
+            steps=self._tbwatcher._steps,
         )
 
     def _save_row(self, row: "HistoryDict") -> None:
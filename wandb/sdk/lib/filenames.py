@@ -13,6 +13,7 @@ METADATA_FNAME = "wandb-metadata.json"
 REQUIREMENTS_FNAME = "requirements.txt"
 HISTORY_FNAME = "wandb-history.jsonl"
 EVENTS_FNAME = "wandb-events.jsonl"
+PROFILE_FNAME = "wandb-profile.bin"
 JOBSPEC_FNAME = "wandb-jobspec.json"
 CONDA_ENVIRONMENTS_FNAME = "conda-environment.yaml"
 
@@ -34,6 +34,11 @@ class WriteSerializingFile(object):
         finally:
             self.lock.release()
 
+    def tell(self) -> int:
+        """Returns the number of bytes written to the underlying file so far."""
+        with self.lock:
+            return self.f.tell()
+
     def close(self) -> None:
         self.lock.acquire()  # wait for pending writes
         try:
@@ -10,6 +10,21 @@ from six.moves.urllib.parse import urlparse, urlunparse
 
 logger = logging.getLogger(__name__)
 
+# GitPython is slow to import, _import_git() fills these in on first use
+Repo = None
+exc = None
+
+
+def _import_git():
+    """Returns whether GitPython could be imported."""
+    global Repo, exc
+    if Repo is None:
+        try:
+            from git import Repo, exc  # type: ignore
+        except ImportError:  # import fails if user doesn't have git
+            return False
+    return True
+
 
 class GitRepo(object):
     def __init__(self, root=None, remote="origin", lazy=True):
@@ -22,7 +37,7 @@ class GitRepo(object):
     @property
     def repo(self):
         if self._repo is None:
-            if self.remote_name is None:
+            if self.remote_name is None or not _import_git():
                 self._repo = False
             else:
                 try:
@@ -189,9 +204,3 @@ class FakeGitRepo(GitRepo):
     @property
     def repo(self):
         return None
-
-
-try:
-    from git import Repo, exc  # type: ignore
-except ImportError:  # import fails if user doesn't have git
-    GitRepo = FakeGitRepo  # type: ignore
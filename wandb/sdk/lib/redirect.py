@@ -6,7 +6,7 @@ try:
 except ImportError:  # windows
     pty = tty = termios = fcntl = None  # type: ignore
 
-from collections import defaultdict
+import codecs
 import itertools
 import logging
 import os
@@ -17,42 +17,9 @@ import sys
 import threading
 import time
 
-from six.moves import queue
 import wandb
 
 
-class _Numpy:  # fallback in case numpy is not available
-    def where(self, x):
-        return ([i for i in range(len(x)) if x[i]],)
-
-    def diff(self, x):
-        return [x[i + 1] - x[i] for i in range(len(x) - 1)]
-
-    def arange(self, x):
-        class Arr(list):
-            def __getitem__(self, s):
-                if isinstance(s, slice):
-                    self._start = s.start
-                    return self
-                return super(Arr, self).__getitem__(s)
-
-            def __getslice__(self, i, j):
-                self._start = i
-                return self
-
-            def __iadd__(self, i):  # type: ignore
-                for j in range(self._start, len(self)):
-                    self[j] += i
-
-        return Arr(range(x))
-
-
-try:
-    import numpy as np  # type: ignore
-except ImportError:
-    np = _Numpy()
-
-
 logger = logging.getLogger("wandb")
 
 _redirects = {"stdout": None, "stderr": None}
@@ -60,13 +27,19 @@ _redirects = {"stdout": None, "stderr": None}
 
 ANSI_CSI_RE = re.compile("\001?\033\\[((?:\\d|;)*)([a-zA-Z])\002?")
 ANSI_OSC_RE = re.compile("\001?\033\\]([^\a]*)(\a)\002?")
+# start of an escape sequence cut off at the end of a write
+ANSI_PARTIAL_RE = re.compile("\033(?:\\[(?:\\d|;)*|\\][^\a]{0,1024})?$")
 
 _LAST_WRITE_TOKEN = b"L@stWr!t3T0k3n"
 
 SEP_RE = re.compile(
-    "\r|\n|"
+    "["
+    + "\r\n"
     # Unprintable ascii characters:
-    + "|".join([chr(i) for i in range(2 ** 8) if repr(chr(i)).startswith("'\\x")])
+    + "".join(
+        [re.escape(chr(i)) for i in range(2 ** 8) if repr(chr(i)).startswith("'\\x")]
+    )
+    + "]"
 )
 
 ANSI_FG = list(map(str, itertools.chain(range(30, 40), range(90, 98))))
@@ -163,6 +136,19 @@ class Char(object):
                 attrs[k] = self[k]
         return self.__class__(**attrs)
 
+    def style(self):
+        """Returns the attributes other than data as a hashable tuple."""
+        return (
+            self.fg,
+            self.bg,
+            self.bold,
+            self.italics,
+            self.underscore,
+            self.blink,
+            self.strikethrough,
+            self.reverse,
+        )
+
     def __eq__(self, other):
         for k in self.__slots__:
             if self[k] != other[k]:
@@ -170,7 +156,132 @@ class Char(object):
         return True
 
 
-_defchar = Char()
+_DEFAULT_STYLE = Char().style()
+
+
+_style_changes = {}
+
+
+def _style_change(prev, style):
+    # escape codes switching from the attributes in prev to those in style, in the
+    # order fg, bg, then the other attributes
+    ret = _style_changes.get((prev, style))
+    if ret is not None:
+        return ret
+    codes = []
+    if style[0] != prev[0]:
+        codes.append(_get_char(style[0]))
+    if style[1] != prev[1]:
+        codes.append(_get_char(style[1]))
+    for k, prev_v, v in zip(Char.__slots__[3:], prev[2:], style[2:]):
+        if v != prev_v:
+            codes.append(_get_char(ANSI_STYLES_REV[k if v else "/" + k]))
+    ret = _style_changes[(prev, style)] = "".join(codes)
+    return ret
+
+
+class Line(object):
+    """
+    A single line of the terminal. Characters are stored as a plain string and their
+    attributes as runs of (start, style) over it, so that the common case of text
+    without any formatting is a single run no matter how long the line is.
+    """
+
+    __slots__ = ("text", "runs")
+
+    def __init__(self):
+        self.text = ""
+        self.runs = []
+
+    def _style_at(self, i):
+        style = _DEFAULT_STYLE
+        for start, s in self.runs:
+            if start > i:
+                break
+            style = s
+        return style
+
+    def _restyle(self, start, end, style):
+        runs = self.runs
+        if len(runs) == 1 and runs[0][1] == style:
+            return
+        tail = []
+        if end < len(self.text):
+            tail.append((end, self._style_at(end)))
+        merged = []
+        for run in itertools.chain(
+            [r for r in runs if r[0] < start],
+            [(start, style)],
+            tail,
+            [r for r in runs if r[0] > end],
+        ):
+            if not merged or merged[-1][1] != run[1]:
+                merged.append(run)
+        self.runs = merged
+
+    def _append_run(self, start, style):
+        runs = self.runs
+        if runs and runs[-1][1] == style:
+            return
+        if runs and runs[-1][0] == start:
+            runs.pop()
+            if runs and runs[-1][1] == style:
+                return
+        runs.append((start, style))
+
+    def write(self, x, s, style):
+        """Writes s at column x, overwriting what was there."""
+        if not s:
+            return
+        text = self.text
+        if x >= len(text):
+            # appending, by far the most common case
+            if x > len(text):
+                self._append_run(len(text), _DEFAULT_STYLE)
+                text += " " * (x - len(text))
+            self._append_run(x, style)
+            self.text = text + s
+            return
+        end = x + len(s)
+        self.text = text[:x] + s + text[end:]
+        self._restyle(x, end, style)
+
+    def erase(self, start=0, end=None):
+        """Blanks columns [start, end), to the end of the line if end is None."""
+        if end is None or end >= len(self.text):
+            self.text = self.text[:start]
+            self.runs = [r for r in self.runs if r[0] < start]
+            return
+        if start >= end:
+            return
+        self.text = self.text[:start] + " " * (end - start) + self.text[end:]
+        self._restyle(start, end, _DEFAULT_STYLE)
+
+    def __len__(self):
+        # trailing blank (space in the default style) columns don't count
+        n = len(self.text.rstrip(" "))
+        if self.runs and self.runs[-1][1] != _DEFAULT_STYLE:
+            return len(self.text)
+        if len(self.runs) > 1 and self.runs[-1][0] > n:
+            n = self.runs[-1][0]
+        return n
+
+    def render(self):
+        """Returns the text of the line with escape codes for its attributes."""
+        n = len(self)
+        runs = self.runs
+        if len(runs) == 1 and runs[0][1] == _DEFAULT_STYLE:
+            return self.text[:n]
+        out = []
+        prev = _DEFAULT_STYLE
+        for i, (start, style) in enumerate(runs):
+            if start >= n:
+                break
+            end = runs[i + 1][0] if i + 1 < len(runs) else n
+            out.append(_style_change(prev, style))
+            out.append(self.text[start : min(end, n)])
+            prev = style
+        return "".join(out)
 
 
 class Cursor(object):
@@ -194,15 +305,18 @@ class Cursor(object):
 
 class TerminalEmulator(object):
     """
-    An FSM emulating a terminal. Characters are stored in a 2D matrix (buffer) indexed by the cursor.
+    An FSM emulating a terminal. Lines are stored in a dict (buffer) indexed by the
+    cursor's y coordinate.
     """
 
     _MAX_LINES = 100
 
     def __init__(self):
-        self.buffer = defaultdict(lambda: defaultdict(lambda: _defchar))
+        self.buffer = {}
         self.cursor = Cursor()
         self._num_lines = None  # Cache
+        self._style = _DEFAULT_STYLE
+        self._partial = ""
 
         # For diffing:
         self._prev_num_lines = None
@@ -240,34 +354,26 @@ class TerminalEmulator(object):
         self.carriage_return()
 
     def _get_line_len(self, n):
-        if n not in self.buffer:
-            return 0
-        line = self.buffer[n]
-        if not line:
-            return 0
-        n = max(line.keys())
-        for i in range(n, -1, -1):
-            if line[i] != _defchar:
-                return i + 1
-        return 0
+        line = self.buffer.get(n)
+        return len(line) if line is not None else 0
 
     @property
     def num_lines(self):
         if self._num_lines is not None:
             return self._num_lines
         ret = 0
-        if self.buffer:
-            n = max(self.buffer.keys())
-            for i in range(n, -1, -1):
-                if self._get_line_len(i):
-                    ret = i + 1
-                    break
+        for i in sorted(self.buffer, reverse=True):
+            if self._get_line_len(i):
+                ret = i + 1
+                break
         self._num_lines = ret
         return ret
 
     def display(self):
         return [
-            [self.buffer[i][j].data for j in range(self._get_line_len(i))]
+            list(self.buffer[i].text[: self._get_line_len(i)])
+            if i in self.buffer
+            else []
             for i in range(self.num_lines)
         ]
 
@@ -286,32 +392,33 @@ class TerminalEmulator(object):
             self.buffer.clear()
 
     def erase_line(self, mode=0):
-        curr_line = self.buffer[self.cursor.y]
+        curr_line = self.buffer.get(self.cursor.y)
+        if curr_line is None:
+            return
         if mode == 0:
-            for i in range(self.cursor.x, self._get_line_len(self.cursor.y)):
-                if i in curr_line:
-                    del curr_line[i]
+            curr_line.erase(self.cursor.x)
         elif mode == 1:
-            for i in range(self.cursor.x + 1):
-                if i in curr_line:
-                    del curr_line[i]
+            curr_line.erase(0, self.cursor.x + 1)
         else:
-            curr_line.clear()
+            curr_line.erase()
 
     def insert_lines(self, n=1):
         for i in range(self.num_lines - 1, self.cursor.y, -1):
-            self.buffer[i + n] = self.buffer[i]
+            if i in self.buffer:
+                self.buffer[i + n] = self.buffer[i]
+            elif i + n in self.buffer:
+                del self.buffer[i + n]
         for i in range(self.cursor.y + 1, self.cursor.y + 1 + n):
             if i in self.buffer:
                 del self.buffer[i]
 
     def _write_plain_text(self, plain_text):
-        self.buffer[self.cursor.y].update(
-            [
-                (self.cursor.x + i, self.cursor.char.copy(data=c))
-                for i, c in enumerate(plain_text)
-            ]
-        )
+        if not plain_text:
+            return
+        line = self.buffer.get(self.cursor.y)
+        if line is None:
+            line = self.buffer[self.cursor.y] = Line()
+        line.write(self.cursor.x, plain_text, self._style)
         self.cursor.x += len(plain_text)
 
     def _write_text(self, text):
@@ -336,6 +443,18 @@ class TerminalEmulator(object):
 
     def write(self, data):
         self._num_lines = None  # invalidate cache
+        self._style = self.cursor.char.style()
+        if self._partial:
+            data = self._partial + data
+            self._partial = ""
+        if "\033" not in data:
+            # fast path, no escape sequences to look for
+            self._write_text(data)
+            return
+        i = data.rfind("\033")
+        if ANSI_PARTIAL_RE.match(data, i):
+            # keep it for the next write
+            data, self._partial = data[:i], data[i:]
         data = self._remove_osc(data)
         prev_end = 0
         for match in ANSI_CSI_RE.finditer(data):
@@ -365,6 +484,7 @@ class TerminalEmulator(object):
                     if off:
                         style = style[1:]
                     self.cursor.char[style] = not off
+                self._style = self.cursor.char.style()
             else:
                 abcd = {
                     "A": "cursor_up",
@@ -399,48 +519,8 @@ class TerminalEmulator(object):
             pass
 
     def _get_line(self, n):
-        line = self.buffer[n]
-        line_len = self._get_line_len(n)
-        # We have to loop through each character in the line and check if foreground, background and
-        # other attributes (italics, bold, underline, etc) of the ith character are different from those of the
-        # (i-1)th character. If different, the appropriate ascii character for switching the color/attribute
-        # should be appended to the output string before appending the actual character. This loop and subsequent
-        # checks can be expensive, especially because 99% of terminal output use default colors and formatting. Even
-        # in outputs that do contain colors and styles, its unlikely that they will change on a per character basis.
-
-        # So instead we create a character list without any ascii codes (`out`), and a list of all the foregrounds
-        # in the line (`fgs`) on which we call np.diff() and np.where() to find the indices where the foreground change,
-        # and insert the ascii characters in the output list (`out`) on those indices. All of this is the done ony if
-        # there are more than 1 foreground color in the line in the first place (`if len(set(fgs)) > 1 else None`).
-        # Same logic is repeated for background colors and other attributes.
-
-        out = [line[i].data for i in range(line_len)]
-
-        # for dynamic insert using original indices
-        idxs = np.arange(line_len)
-        insert = lambda i, c: (out.insert(idxs[i], c), idxs[i:].__iadd__(1))  # noqa
-
-        fgs = [int(_defchar.fg)] + [int(line[i].fg) for i in range(line_len)]
-        [
-            insert(i, _get_char(line[int(i)].fg)) for i in np.where(np.diff(fgs))[0]
-        ] if len(set(fgs)) > 1 else None
-        bgs = [int(_defchar.bg)] + [int(line[i].bg) for i in range(line_len)]
-        [
-            insert(i, _get_char(line[int(i)].bg)) for i in np.where(np.diff(bgs))[0]
-        ] if len(set(bgs)) > 1 else None
-        attrs = {
-            k: [False] + [line[i][k] for i in range(line_len)]
-            for k in Char.__slots__[3:]
-        }
-        [
-            [
-                insert(i, _get_char(ANSI_STYLES_REV[k if line[int(i)][k] else "/" + k]))
-                for i in np.where(np.diff(v))[0]
-            ]
-            for k, v in attrs.items()
-            if any(v)
-        ]
-        return "".join(out)
+        line = self.buffer.get(n)
+        return line.render() if line is not None else ""
 
     def read(self):
         num_lines = self.num_lines
@@ -471,11 +551,9 @@ class TerminalEmulator(object):
                 )
         if num_lines > self._MAX_LINES:
             shift = num_lines - self._MAX_LINES
-            for i in range(shift, num_lines):
-                self.buffer[i - shift] = self.buffer[i]
-            for i in range(self._MAX_LINES, max(self.buffer.keys())):
-                if i in self.buffer:
-                    del self.buffer[i]
+            self.buffer = {
+                i - shift: line for i, line in self.buffer.items() if i >= shift
+            }
             self.cursor.y -= min(self.cursor.y, shift)
             self._num_lines = num_lines = self._MAX_LINES
         self._prev_num_lines = num_lines
@@ -484,20 +562,186 @@ class TerminalEmulator(object):
 
 
 _MIN_CALLBACK_INTERVAL = 2  # seconds
+_MAX_BYTES_PER_INTERVAL = 4 * 1024 * 1024  # fed to the emulators
+_MAX_UNPROCESSED_BYTES = 100000  # logged raw when a redirect is uninstalled
+
+
+class ConsolePump(object):
+    """
+    Feeds the output captured by any number of redirects to their terminal emulators
+    on a single thread, and hands what the emulators display to the callbacks.
+
+    The thread sleeps until there is output or a redirect is uninstalled, there is
+    no polling. At most `_MAX_BYTES_PER_INTERVAL` bytes are processed per
+    `_MIN_CALLBACK_INTERVAL`, anything more waits for the next interval.
+    """
+
+    def __init__(self, cbs=(), live=None):
+        """
+        # Arguments
+
+        `cbs`: tuple/list of callbacks. Each callback is called with a list of
+            (src, data) tuples for every redirect with new output.
+        `live`: Read back the emulators every `_MIN_CALLBACK_INTERVAL` seconds, and not
+            only when a redirect is uninstalled. Defaults to whether the run is online.
+
+        """
+        if live is None:
+            live = not wandb.run or wandb.run._settings.mode == "online"
+        self.cbs = cbs
+        self._live = live
+        self._cond = threading.Condition()
+        self._redirects = []
+        self._thread = None
+        self._last_flush = time.time()
+        self._budget_start = 0
+        self._budget_used = 0
+
+    def add(self, redir):
+        with self._cond:
+            redir._pending = []
+            redir._pending_bytes = 0
+            redir._closing = False
+            redir._closed = threading.Event()
+            if redir not in self._redirects:
+                self._redirects.append(redir)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def put(self, redir, data):
+        with self._cond:
+            redir._pending.append(data)
+            redir._pending_bytes += len(data)
+            self._cond.notify()
+
+    def remove(self, redir):
+        """Processes and flushes the remaining output of redir before returning."""
+        with self._cond:
+            if redir not in self._redirects:
+                return
+            redir._closing = True
+            self._cond.notify()
+        if not redir._closed.wait(timeout=5):
+            wandb.termlog("Processing terminal ouput (%s)..." % redir.src)
+            redir._closed.wait()
+            wandb.termlog("Done.")
+
+    def _budget(self, now):
+        if now - self._budget_start >= _MIN_CALLBACK_INTERVAL:
+            self._budget_start = now
+            self._budget_used = 0
+        return _MAX_BYTES_PER_INTERVAL - self._budget_used
+
+    def _wait(self):
+        # Blocks until there is something to do, returns (redirects being
+        # uninstalled, whether to flush all of them, data to process per redirect).
+        while True:
+            if not self._redirects:
+                self._thread = None
+                return None
+            now = time.time()
+            closing = [r for r in self._redirects if r._closing]
+            dirty = self._live and any(r._dirty for r in self._redirects)
+            flush_at = self._last_flush + _MIN_CALLBACK_INTERVAL
+            flush = dirty and now >= flush_at
+            budget = self._budget(now)
+            pending = any(r._pending for r in self._redirects)
+            if closing or flush or (pending and budget > 0):
+                break
+            timeouts = []
+            if dirty:
+                timeouts.append(flush_at - now)
+            if pending:
+                timeouts.append(self._budget_start + _MIN_CALLBACK_INTERVAL - now)
+            self._cond.wait(min(timeouts) if timeouts else None)
+
+        work = []
+        for r in self._redirects:
+            if r._closing:
+                data, r._pending = r._pending, []
+            else:
+                n = 0
+                while n < len(r._pending) and budget > 0:
+                    budget -= len(r._pending[n])
+                    self._budget_used += len(r._pending[n])
+                    n += 1
+                data, r._pending = r._pending[:n], r._pending[n:]
+            r._pending_bytes -= sum(map(len, data))
+            if data:
+                work.append((r, data))
+        self._redirects = [r for r in self._redirects if not r._closing]
+        return closing, flush, work
+
+    def _run(self):
+        while True:
+            with self._cond:
+                todo = self._wait()
+            if todo is None:
+                return
+            closing, flush, work = todo
+            for r, data in work:
+                if r in closing and sum(map(len, data)) > _MAX_UNPROCESSED_BYTES:
+                    wandb.termlog(
+                        "Terminal output too large. Logging without processing."
+                    )
+                    self._flush([r])
+                    [self._flush([r], r._raw(d)) for d in data]
+                    continue
+                try:
+                    r._emulator_write(data)
+                except Exception:
+                    pass
+                r._dirty = True
+            if flush:
+                self._flush(self._redirects + closing)
+            elif closing:
+                self._flush(closing)
+            for r in closing:
+                r._closed.set()
+
+    def _flush(self, redirects, data=None):
+        outputs = []
+        for r in redirects:
+            if data is None and not r._dirty:
+                continue
+            r._dirty = False
+            out = data if data is not None else r._read()
+            if out:
+                for cb in r.cbs:
+                    try:
+                        cb(out)
+                    except Exception:
+                        pass  # TODO(frz)
+                outputs.append((r.src, out))
+        if outputs:
+            for cb in self.cbs:
+                try:
+                    cb(outputs)
+                except Exception:
+                    pass
+        if data is None:
+            self._last_flush = time.time()
 
 
 class RedirectBase(object):
-    def __init__(self, src, cbs=()):
+    def __init__(self, src, cbs=(), pump=None):
         """
         # Arguments
 
         `src`: Source stream to be redirected. "stdout" or "stderr".
         `cbs`: tuple/list of callbacks. Each callback should take exactly 1 argument (bytes).
+        `pump`: ConsolePump processing the output, redirects of the same run should
+            share one. A new one is created if not given.
 
         """
         assert hasattr(sys, src)
         self.src = src
         self.cbs = cbs
+        self._pump = pump
+        self._emulator = TerminalEmulator()
+        self._dirty = False
 
     @property
     def src_stream(self):
@@ -522,6 +766,17 @@ class RedirectBase(object):
             return
         _redirects[self.src] = None
 
+    def _start_pump(self):
+        if self._pump is None:
+            self._pump = ConsolePump()
+        self._pump.add(self)
+
+    def _read(self):
+        try:
+            return self._emulator.read().encode("utf-8")
+        except Exception:
+            return None
+
 
 class _WrappedStream(object):
     """
@@ -541,35 +796,15 @@ class StreamWrapper(RedirectBase):
     Patches the write method of current sys.stdout/sys.stderr
     """
 
-    def __init__(self, src, cbs=()):
-        super(StreamWrapper, self).__init__(src=src, cbs=cbs)
+    def __init__(self, src, cbs=(), pump=None):
+        super(StreamWrapper, self).__init__(src=src, cbs=cbs, pump=pump)
         self._installed = False
-        self._emulator = TerminalEmulator()
 
-    def _emulator_write(self):
-        while True:
-            if self._queue.empty():
-                if self._stopped.is_set():
-                    return
-                time.sleep(0.5)
-                continue
-            data = []
-            while not self._queue.empty():
-                data.append(self._queue.get())
-            if self._stopped.is_set() and sum(map(len, data)) > 100000:
-                wandb.termlog("Terminal output too large. Logging without processing.")
-                self.flush()
-                [self.flush(line.encode("utf-8")) for line in data]
-                return
-            try:
-                self._emulator.write("".join(data))
-            except Exception:
-                pass
+    def _emulator_write(self, data):
+        self._emulator.write("".join(data))
 
-    def _callback(self):
-        while not (self._stopped.is_set() and self._queue.empty()):
-            self.flush()
-            time.sleep(_MIN_CALLBACK_INTERVAL)
+    def _raw(self, data):
+        return data.encode("utf-8")
 
     def install(self):
         super(StreamWrapper, self).install()
@@ -577,12 +812,13 @@ class StreamWrapper(RedirectBase):
             return
         stream = self.src_wrapped_stream
         old_write = stream.write
-        self._prev_callback_timestamp = time.time()
         self._old_write = old_write
+        self._start_pump()
 
         def write(data):
             self._old_write(data)
-            self._queue.put(data)
+            if data:
+                self._pump.put(self, data)
 
         if sys.version_info[0] > 2:
             stream.write = write
@@ -590,32 +826,8 @@ class StreamWrapper(RedirectBase):
             self._old_stream = stream
             setattr(sys, self.src, _WrappedStream(stream, write))
 
-        self._queue = queue.Queue()
-        self._stopped = threading.Event()
-        self._emulator_write_thread = threading.Thread(target=self._emulator_write)
-        self._emulator_write_thread.daemon = True
-        self._emulator_write_thread.start()
-
-        if not wandb.run or wandb.run._settings.mode == "online":
-            self._callback_thread = threading.Thread(target=self._callback)
-            self._callback_thread.daemon = True
-            self._callback_thread.start()
-
         self._installed = True
 
-    def flush(self, data=None):
-        if data is None:
-            try:
-                data = self._emulator.read().encode("utf-8")
-            except Exception:
-                pass
-        if data:
-            for cb in self.cbs:
-                try:
-                    cb(data)
-                except Exception:
-                    pass  # TODO(frz)
-
     def uninstall(self):
         if not self._installed:
             return
@@ -624,13 +836,7 @@ class StreamWrapper(RedirectBase):
         else:
             setattr(sys, self.src, self._old_stream)
 
-        self._stopped.set()
-        self._emulator_write_thread.join(timeout=5)
-        if self._emulator_write_thread.is_alive():
-            wandb.termlog("Processing terminal ouput (%s)..." % self.src)
-            self._emulator_write_thread.join()
-            wandb.termlog("Done.")
-        self.flush()
+        self._pump.remove(self)
 
         self._installed = False
         super(StreamWrapper, self).uninstall()
@@ -688,10 +894,10 @@ class Redirect(RedirectBase):
     Redirects low level file descriptors.
     """
 
-    def __init__(self, src, cbs=()):
-        super(Redirect, self).__init__(src=src, cbs=cbs)
+    def __init__(self, src, cbs=(), pump=None):
+        super(Redirect, self).__init__(src=src, cbs=cbs, pump=pump)
         self._installed = False
-        self._emulator = TerminalEmulator()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
 
     def _pipe(self):
         if pty:
@@ -700,6 +906,12 @@ class Redirect(RedirectBase):
             r, w = os.pipe()
         return r, w
 
+    def _emulator_write(self, data):
+        self._emulator.write(self._decoder.decode(b"".join(data)))
+
+    def _raw(self, data):
+        return data
+
     def install(self):
         super(Redirect, self).install()
         if self._installed:
@@ -711,18 +923,11 @@ class Redirect(RedirectBase):
         self._orig_src = os.fdopen(self._orig_src_fd, "wb", 0)
         os.dup2(self._pipe_write_fd, self.src_fd)
         self._installed = True
-        self._queue = queue.Queue()
         self._stopped = threading.Event()
+        self._start_pump()
         self._pipe_relay_thread = threading.Thread(target=self._pipe_relay)
         self._pipe_relay_thread.daemon = True
         self._pipe_relay_thread.start()
-        self._emulator_write_thread = threading.Thread(target=self._emulator_write)
-        self._emulator_write_thread.daemon = True
-        self._emulator_write_thread.start()
-        if not wandb.run or wandb.run._settings.mode == "online":
-            self._callback_thread = threading.Thread(target=self._callback)
-            self._callback_thread.daemon = True
-            self._callback_thread.start()
 
     def uninstall(self):
         if not self._installed:
@@ -744,34 +949,11 @@ class Redirect(RedirectBase):
         t.start()
         t.join(timeout=10)
 
-        self._emulator_write_thread.join(timeout=5)
-        if self._emulator_write_thread.is_alive():
-            wandb.termlog("Processing terminal ouput (%s)..." % self.src)
-            self._emulator_write_thread.join()
-            wandb.termlog("Done.")
-        self.flush()
+        self._pump.remove(self)
 
         _WSCH.remove_fd(self._pipe_read_fd)
         super(Redirect, self).uninstall()
 
-    def flush(self, data=None):
-        if data is None:
-            try:
-                data = self._emulator.read().encode("utf-8")
-            except Exception:
-                pass
-        if data:
-            for cb in self.cbs:
-                try:
-                    cb(data)
-                except Exception:
-                    pass  # TODO(frz)
-
-    def _callback(self):
-        while not self._stopped.is_set():
-            self.flush()
-            time.sleep(_MIN_CALLBACK_INTERVAL)
-
     def _pipe_relay(self):
         while True:
             try:
@@ -794,28 +976,9 @@ class Redirect(RedirectBase):
                 if i is not None:  # python 3 w/ unbuffered i/o: we need to keep writing
                     while i < len(data):
                         i += self._orig_src.write(data[i:])
-                self._queue.put(data)
+                if data:
+                    self._pump.put(self, data)
                 if brk:
                     return
             except OSError:
                 return
-
-    def _emulator_write(self):
-        while True:
-            if self._queue.empty():
-                if self._stopped.is_set():
-                    return
-                time.sleep(0.5)
-                continue
-            data = []
-            while not self._queue.empty():
-                data.append(self._queue.get())
-            if self._stopped.is_set() and sum(map(len, data)) > 100000:
-                wandb.termlog("Terminal output too large. Logging without processing.")
-                self.flush()
-                [self.flush(line) for line in data]
-                return
-            try:
-                self._emulator.write(b"".join(data).decode("utf-8"))
-            except Exception:
-                pass
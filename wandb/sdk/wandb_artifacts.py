@@ -1,10 +1,12 @@
 #
 import base64
+from concurrent import futures
 import contextlib
 import hashlib
 import os
 import re
 import shutil
+import threading
 import time
 from typing import (
     Any,
@@ -14,6 +16,7 @@ from typing import (
     IO,
     List,
     Mapping,
+    NamedTuple,
     Optional,
     Sequence,
     Tuple,
@@ -26,8 +29,7 @@ from six.moves.urllib.parse import quote, urlparse
 import wandb
 from wandb import env
 from wandb import util
-from wandb.apis import InternalApi, PublicApi
-from wandb.apis.public import Artifact as PublicArtifact
+from wandb.apis import InternalApi
 from wandb.compat import tempfile as compat_tempfile
 import wandb.data_types as data_types
 from wandb.errors import CommError
@@ -53,6 +55,7 @@ if TYPE_CHECKING:
     import google.cloud.storage as gcs_module  # type: ignore
     import boto3  # type: ignore
     import wandb.filesync.step_prepare.StepPrepare as StepPrepare  # type: ignore
+    from wandb.apis.public import Api as PublicApi
 
 # This makes the first sleep 1s, and then doubles it up to total times,
 # which makes for ~18 hours.
@@ -66,6 +69,29 @@ _REQUEST_POOL_CONNECTIONS = 64
 
 _REQUEST_POOL_MAXSIZE = 64
 
+# Entries at least this large are fetched with several concurrent ranged
+# requests written straight into the cache file, instead of a single stream.
+_MULTIPART_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
+
+# Parts a single entry is split into are sized for this many connections.
+_MULTIPART_DOWNLOAD_CONCURRENCY = 8
+
+# Parts of all multipart downloads share one pool of this many threads, so
+# together with the streams of Artifact.download (at most 32) the number of
+# open connections stays within the session's pool.
+_MULTIPART_DOWNLOAD_WORKERS = _REQUEST_POOL_MAXSIZE // 2
+
+_MULTIPART_DOWNLOAD_MIN_PART_SIZE = 8 * 1024 * 1024
+
+_MULTIPART_DOWNLOAD_MAX_PART_SIZE = 256 * 1024 * 1024
+
+# How many times a single part may be resumed after its connection drops.
+_MULTIPART_DOWNLOAD_PART_RETRIES = 5
+
+_DOWNLOAD_CHUNK_SIZE = 16 * 1024
+
+_MULTIPART_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 ARTIFACT_TMP = compat_tempfile.TemporaryDirectory("wandb-artifacts")
 
 
@@ -697,7 +723,50 @@ class Artifact(ArtifactInterface):
         return self.get(name)
 
 
+class _EntriesDict(dict):
+    """A dict that counts its mutations, so that results derived from it can tell
+    when they are stale even if callers change it directly."""
+
+    mutations = 0
+
+    def __setitem__(self, key, value):
+        self.mutations += 1
+        super(_EntriesDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.mutations += 1
+        super(_EntriesDict, self).__delitem__(key)
+
+    def clear(self):
+        self.mutations += 1
+        super(_EntriesDict, self).clear()
+
+    def pop(self, *args):
+        self.mutations += 1
+        return super(_EntriesDict, self).pop(*args)
+
+    def popitem(self):
+        self.mutations += 1
+        return super(_EntriesDict, self).popitem()
+
+    def setdefault(self, key, default=None):
+        self.mutations += 1
+        return super(_EntriesDict, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.mutations += 1
+        super(_EntriesDict, self).update(*args, **kwargs)
+
+
 class ArtifactManifestV1(ArtifactManifest):
+    _entries: _EntriesDict
+    # Raw json contents of entries that haven't been turned into
+    # ArtifactManifestEntry objects yet.
+    _pending_contents: Optional[Dict[str, Dict]]
+    _sorted_paths: Optional[List[str]]
+    # mutation count of the entries when _sorted_paths was computed
+    _sorted_paths_mutations: int
+
     @classmethod
     def version(cls) -> int:
         return 1
@@ -717,23 +786,11 @@ class ArtifactManifestV1(ArtifactManifest):
         if storage_policy_cls is None:
             raise ValueError('Failed to find storage policy "%s"' % storage_policy_name)
 
-        entries: Mapping[str, ArtifactManifestEntry]
-        entries = {
-            name: ArtifactManifestEntry(
-                path=name,
-                digest=val["digest"],
-                birth_artifact_id=val.get("birthArtifactID"),
-                ref=val.get("ref"),
-                size=val.get("size"),
-                extra=val.get("extra"),
-                local_path=val.get("local_path"),
-            )
-            for name, val in manifest_json["contents"].items()
-        }
-
-        return cls(
-            artifact, storage_policy_cls.from_config(storage_policy_config), entries
-        )
+        manifest = cls(artifact, storage_policy_cls.from_config(storage_policy_config))
+        # Entries are built on first access, so looking up a few paths in a
+        # huge manifest doesn't have to materialize all of them.
+        manifest._pending_contents = manifest_json["contents"]
+        return manifest
 
     def __init__(
         self,
@@ -741,10 +798,58 @@ class ArtifactManifestV1(ArtifactManifest):
         storage_policy: StoragePolicy,
         entries: Optional[Mapping[str, ArtifactEntry]] = None,
     ) -> None:
+        self._pending_contents = None
+        self._sorted_paths = None
+        self._sorted_paths_mutations = 0
         super(ArtifactManifestV1, self).__init__(
             artifact, storage_policy, entries=entries
         )
 
+    @property
+    def entries(self) -> Dict[str, ArtifactEntry]:  # type: ignore
+        if self._pending_contents is not None:
+            contents, self._pending_contents = self._pending_contents, None
+            for name, val in contents.items():
+                if name not in self._entries:
+                    self._entries[name] = _manifest_entry_from_json(name, val)
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries: Dict[str, ArtifactEntry]) -> None:
+        self._entries = _EntriesDict(entries)
+        self._pending_contents = None
+        self._sorted_paths = None
+
+    def get_entry_by_path(self, path: str) -> Optional[ArtifactEntry]:
+        if self._pending_contents is None or path in self._entries:
+            return self._entries.get(path)
+        val = self._pending_contents.get(path)
+        if val is None:
+            return None
+        entry = self._entries[path] = _manifest_entry_from_json(path, val)
+        return entry
+
+    def get_reference_entries(self) -> List[ArtifactEntry]:
+        if self._pending_contents is None:
+            return super(ArtifactManifestV1, self).get_reference_entries()
+        return [
+            self.get_entry_by_path(name)  # type: ignore
+            for name, val in self._pending_contents.items()
+            if val.get("ref") is not None
+        ]
+
+    def sorted_paths(self) -> List[str]:
+        """Returns entry paths in manifest order, sorted again only after the
+        entries changed."""
+        entries = self.entries
+        if (
+            self._sorted_paths is None
+            or self._sorted_paths_mutations != entries.mutations
+        ):
+            self._sorted_paths = sorted(entries)
+            self._sorted_paths_mutations = entries.mutations
+        return self._sorted_paths
+
     def to_manifest_json(self) -> Dict:
         """This is the JSON that's stored in wandb_manifest.json
 
@@ -754,7 +859,9 @@ class ArtifactManifestV1(ArtifactManifest):
         contents.
         """
         contents = {}
-        for entry in sorted(self.entries.values(), key=lambda k: k.path):
+        entries = self.entries
+        for path in self.sorted_paths():
+            entry = entries[path]
             json_entry: Dict[str, Any] = {
                 "digest": entry.digest,
             }
@@ -777,12 +884,35 @@ class ArtifactManifestV1(ArtifactManifest):
     def digest(self) -> str:
         hasher = hashlib.md5()
         hasher.update("wandb-artifact-manifest-v1\n".encode())
-        for (name, entry) in sorted(self.entries.items(), key=lambda kv: kv[0]):
-            hasher.update("{}:{}\n".format(name, entry.digest).encode())
+        entries = self.entries
+        for name in self.sorted_paths():
+            hasher.update("{}:{}\n".format(name, entries[name].digest).encode())
         return hasher.hexdigest()
 
 
+def _manifest_entry_from_json(name: str, val: Dict) -> "ArtifactManifestEntry":
+    return ArtifactManifestEntry(
+        path=name,
+        digest=val["digest"],
+        birth_artifact_id=val.get("birthArtifactID"),
+        ref=val.get("ref"),
+        size=val.get("size"),
+        extra=val.get("extra"),
+        local_path=val.get("local_path"),
+    )
+
+
 class ArtifactManifestEntry(ArtifactEntry):
+    __slots__ = (
+        "path",
+        "ref",
+        "digest",
+        "birth_artifact_id",
+        "size",
+        "extra",
+        "local_path",
+    )
+
     def __init__(
         self,
         path: str,
@@ -821,6 +951,57 @@ class ArtifactManifestEntry(ArtifactEntry):
         return "<ManifestEntry %s>" % summary
 
 
+def _plan_download_parts(size: int) -> List[Tuple[int, int]]:
+    """Splits `size` bytes into inclusive (start, end) byte ranges.
+
+    Parts are sized so that each connection gets several of them, which keeps
+    all connections busy until the end of the file, within fixed bounds so
+    that huge files don't turn into thousands of tiny requests.
+    """
+    part_size = size // (_MULTIPART_DOWNLOAD_CONCURRENCY * 4)
+    part_size = max(_MULTIPART_DOWNLOAD_MIN_PART_SIZE, part_size)
+    part_size = min(_MULTIPART_DOWNLOAD_MAX_PART_SIZE, part_size)
+    return [
+        (start, min(start + part_size, size) - 1) for start in range(0, size, part_size)
+    ]
+
+
+_multipart_executor = None
+_multipart_executor_lock = threading.Lock()
+
+
+def _multipart_pool() -> futures.ThreadPoolExecutor:
+    global _multipart_executor
+    with _multipart_executor_lock:
+        if _multipart_executor is None:
+            _multipart_executor = futures.ThreadPoolExecutor(
+                max_workers=_MULTIPART_DOWNLOAD_WORKERS
+            )
+    return _multipart_executor
+
+
+class _PositionalWriter(object):
+    """Writes chunks at absolute offsets of an open file from many threads."""
+
+    def __init__(self, file: IO) -> None:
+        self._fd = file.fileno()
+        self._lock = threading.Lock()
+
+    def write(self, data: bytes, offset: int) -> None:
+        if hasattr(os, "pwrite"):
+            while data:
+                written = os.pwrite(self._fd, data, offset)
+                data = data[written:]
+                offset += written
+            return
+
+        # Windows has no pwrite, so serialize seek + write instead.
+        with self._lock:
+            os.lseek(self._fd, offset, os.SEEK_SET)
+            while data:
+                data = data[os.write(self._fd, data) :]
+
+
 class WandbStoragePolicy(StoragePolicy):
     @classmethod
     def name(cls) -> str:
@@ -862,24 +1043,134 @@ class WandbStoragePolicy(StoragePolicy):
     def load_file(
         self, artifact: ArtifactInterface, name: str, manifest_entry: ArtifactEntry
     ) -> str:
+        size = manifest_entry.size if manifest_entry.size is not None else 0
         path, hit, cache_open = self._cache.check_md5_obj_path(
-            manifest_entry.digest,
-            manifest_entry.size if manifest_entry.size is not None else 0,
+            manifest_entry.digest, size,
         )
         if hit:
             return path
 
+        # Other processes sharing the cache (e.g. every rank of a distributed
+        # job) wait here while one of them downloads the object, and then
+        # find it in the cache.
+        with self._cache.lock(path):
+            _, hit, _ = self._cache.check_md5_obj_path(manifest_entry.digest, size)
+            if hit:
+                return path
+
+            url = self._file_url(self._api, artifact.entity, manifest_entry)
+            with cache_open(mode="wb") as file:
+                if (
+                    size < _MULTIPART_DOWNLOAD_THRESHOLD
+                    or not self._download_multipart(url, size, file)
+                ):
+                    self._download_stream(url, file)
+        return path
+
+    def _download_stream(self, url: str, file: IO) -> None:
+        response = self._session.get(url, auth=("api", self._api.api_key), stream=True,)
+        response.raise_for_status()
+
+        # A failed multipart attempt may have left data behind.
+        file.seek(0)
+        file.truncate()
+        for data in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+            file.write(data)
+
+    def _download_multipart(self, url: str, size: int, file: IO) -> bool:
+        """Downloads `url` into `file` using concurrent ranged requests.
+
+        Returns False without writing anything if the server doesn't honor
+        range requests, in which case the caller should fall back to a single
+        streaming download.
+        """
+        parts = _plan_download_parts(size)
+        start, end = parts[0]
         response = self._session.get(
-            self._file_url(self._api, artifact.entity, manifest_entry),
+            url,
             auth=("api", self._api.api_key),
+            headers={"Range": "bytes={}-{}".format(start, end)},
             stream=True,
         )
         response.raise_for_status()
+        if response.status_code != 206:
+            response.close()
+            return False
 
-        with cache_open(mode="wb") as file:
-            for data in response.iter_content(chunk_size=16 * 1024):
-                file.write(data)
-        return path
+        file.truncate(size)
+        writer = _PositionalWriter(file)
+
+        def download_part(part_index: int) -> None:
+            start, end = parts[part_index]
+            self._download_range(
+                url, start, end, writer, response if part_index == 0 else None
+            )
+
+        pending = []
+        try:
+            for i in range(len(parts)):
+                pending.append(_multipart_pool().submit(download_part, i))
+            for future in futures.as_completed(pending):
+                future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            futures.wait(pending)
+            # part 0 closes the response when it runs, but not if it was
+            # cancelled because another part failed first
+            response.close()
+        return True
+
+    def _download_range(
+        self,
+        url: str,
+        start: int,
+        end: int,
+        writer: "_PositionalWriter",
+        response: Optional[requests.Response] = None,
+    ) -> None:
+        offset = start
+        retries = 0
+        while offset <= end:
+            try:
+                if response is None:
+                    response = self._session.get(
+                        url,
+                        auth=("api", self._api.api_key),
+                        headers={"Range": "bytes={}-{}".format(offset, end)},
+                        stream=True,
+                    )
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise CommError(
+                            "Expected partial content for range download of {}".format(
+                                url
+                            )
+                        )
+                for data in response.iter_content(
+                    chunk_size=_MULTIPART_DOWNLOAD_CHUNK_SIZE
+                ):
+                    writer.write(data, offset)
+                    offset += len(data)
+                if offset <= end:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        "Range response ended early"
+                    )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout,
+            ):
+                # Resume the part from the last byte we wrote rather than
+                # starting it over.
+                retries += 1
+                if retries > _MULTIPART_DOWNLOAD_PART_RETRIES:
+                    raise
+                time.sleep(2 ** retries)
+            finally:
+                if response is not None:
+                    response.close()
+                response = None
 
     def store_reference(
         self,
@@ -1141,6 +1432,70 @@ class TrackingHandler(StorageHandler):
 
 DEFAULT_MAX_OBJECTS = 10000
 
+# Number of prefixes listed at once when enumerating a bucket prefix.
+_LIST_CONCURRENCY = 16
+
+
+class _ListBudget(object):
+    """The number of objects a listing may still return, shared by the threads
+    listing sibling prefixes."""
+
+    def __init__(self, max_objects: int) -> None:
+        self._left = max_objects
+        self._lock = threading.Lock()
+
+    def exhausted(self) -> bool:
+        return self._left <= 0
+
+    def take(self, count: int) -> bool:
+        """Counts `count` listed objects, returns whether more may be listed."""
+        with self._lock:
+            self._left -= count
+            return self._left > 0
+
+
+def _list_prefix_concurrently(
+    list_level: Callable[[str, _ListBudget], Tuple[List[Any], List[str]]],
+    prefix: str,
+    max_objects: int,
+) -> List[Any]:
+    """Lists up to `max_objects` objects under `prefix`.
+
+    `list_level(prefix, budget)` lists a single level of the bucket hierarchy
+    (using "/" as delimiter) and returns the objects at that level along with
+    the prefixes below it. It takes every page it lists from `budget` and stops
+    paging once the budget is exhausted. Sibling prefixes are listed
+    concurrently, so listing a large tree takes roughly one round trip per
+    level instead of one per page of objects. The pages of a single prefix are
+    chained by continuation tokens, so a flat prefix is listed page by page.
+    """
+    import multiprocessing.dummy  # this uses threads
+
+    objects: List[Any] = []
+    pending = [prefix]
+    budget = _ListBudget(max_objects)
+    pool = multiprocessing.dummy.Pool(_LIST_CONCURRENCY)
+    try:
+        while pending and not budget.exhausted():
+            next_pending: List[str] = []
+            listed = pool.imap(lambda p: list_level(p, budget), pending)
+            for level_objects, sub_prefixes in listed:
+                objects.extend(level_objects)
+                next_pending.extend(sub_prefixes)
+            pending = next_pending
+    finally:
+        pool.close()
+        pool.join()
+    return objects[:max_objects]
+
+
+class _S3ListedObject(NamedTuple):
+    """The fields of an object returned by ListObjectsV2."""
+
+    key: str
+    e_tag: str
+    size: int
+
 
 class LocalFileHandler(StorageHandler):
     """Handles file:// references"""
@@ -1391,10 +1746,10 @@ class S3Handler(StorageHandler):
                     % (max_objects, key),
                     newline=False,
                 )
-                objs = (
-                    self._s3.Bucket(bucket)
-                    .objects.filter(Prefix=key)
-                    .limit(max_objects)
+                objs = _list_prefix_concurrently(
+                    lambda prefix, budget: self._list_level(bucket, prefix, budget),
+                    key,
+                    max_objects,
                 )
             else:
                 raise CommError(
@@ -1418,6 +1773,25 @@ class S3Handler(StorageHandler):
             )
         return entries
 
+    def _list_level(
+        self, bucket: str, prefix: str, budget: _ListBudget
+    ) -> Tuple[List[_S3ListedObject], List[str]]:
+        assert self._s3 is not None  # mypy: unwraps optionality
+        objects: List[_S3ListedObject] = []
+        prefixes: List[str] = []
+        if budget.exhausted():
+            return objects, prefixes
+        # Unlike resources, boto3 clients are safe to share between threads.
+        paginator = self._s3.meta.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter="/"):
+            contents = page.get("Contents", [])
+            for obj in contents:
+                objects.append(_S3ListedObject(obj["Key"], obj["ETag"], obj["Size"]))
+            prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+            if not budget.take(len(contents)):
+                break
+        return objects, prefixes
+
     def _size_from_obj(self, obj: "boto3.s3.Object") -> int:
         # ObjectSummary has size, Object has content_length
         size: int
@@ -1593,8 +1967,10 @@ class GCSHandler(StorageHandler):
                 % (max_objects, key),
                 newline=False,
             )
-            objects = self._client.bucket(bucket).list_blobs(
-                prefix=key, max_results=max_objects
+            objects = _list_prefix_concurrently(
+                lambda prefix, budget: self._list_level(bucket, prefix, budget),
+                key,
+                max_objects,
             )
         else:
             objects = [obj]
@@ -1612,6 +1988,22 @@ class GCSHandler(StorageHandler):
             )
         return entries
 
+    def _list_level(
+        self, bucket: str, prefix: str, budget: _ListBudget
+    ) -> Tuple[List["gcs_module.blob.Blob"], List[str]]:
+        assert self._client is not None  # mypy: unwraps optionality
+        blobs: List["gcs_module.blob.Blob"] = []
+        if budget.exhausted():
+            return blobs, []
+        iterator = self._client.bucket(bucket).list_blobs(prefix=prefix, delimiter="/")
+        # The iterator only knows the sub-prefixes of the pages it has consumed.
+        for page in iterator.pages:
+            page_blobs = list(page)
+            blobs.extend(page_blobs)
+            if not budget.take(len(page_blobs)):
+                break
+        return blobs, list(iterator.prefixes)
+
     def _entry_from_obj(
         self,
         obj: "gcs_module.blob.Blob",
@@ -1734,7 +2126,7 @@ class HTTPHandler(StorageHandler):
 class WBArtifactHandler(StorageHandler):
     """Handles loading and storing Artifact reference-type files"""
 
-    _client: Optional[PublicApi]
+    _client: Optional["PublicApi"]
 
     def __init__(self) -> None:
         self._scheme = "wandb-artifact"
@@ -1751,9 +2143,9 @@ class WBArtifactHandler(StorageHandler):
         return self._scheme
 
     @property
-    def client(self) -> PublicApi:
+    def client(self) -> "PublicApi":
         if self._client is None:
-            self._client = PublicApi()
+            self._client = wandb.apis.PublicApi()
         return self._client
 
     def load_path(
@@ -1783,7 +2175,7 @@ class WBArtifactHandler(StorageHandler):
         artifact_id = util.host_from_path(manifest_entry.ref)
         artifact_file_path = util.uri_from_path(manifest_entry.ref)
 
-        dep_artifact = PublicArtifact.from_id(
+        dep_artifact = wandb.apis.public.Artifact.from_id(
             util.hex_to_b64_id(artifact_id), self.client
         )
         link_target_path: str
@@ -1821,7 +2213,7 @@ class WBArtifactHandler(StorageHandler):
         while path is not None and urlparse(path).scheme == self._scheme:
             artifact_id = util.host_from_path(path)
             artifact_file_path = util.uri_from_path(path)
-            target_artifact = PublicArtifact.from_id(
+            target_artifact = wandb.apis.public.Artifact.from_id(
                 util.hex_to_b64_id(artifact_id), self.client
             )
 
@@ -1848,7 +2240,7 @@ class WBArtifactHandler(StorageHandler):
 class WBLocalArtifactHandler(StorageHandler):
     """Handles loading and storing Artifact reference-type files"""
 
-    _client: Optional[PublicApi]
+    _client: Optional["PublicApi"]
 
     def __init__(self) -> None:
         self._scheme = "wandb-client-artifact"
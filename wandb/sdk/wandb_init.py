@@ -511,21 +511,15 @@ class _WandbInit(object):
                     f"`resume` will be ignored since W&B syncing is set to `offline`. Starting a new run with run id {run.id}."
                 )
         else:
+            # the version check runs in the backend while the run is upserted
             logger.info("communicating current version")
-            ret = backend.interface.communicate_check_version(
+            init_start = time.time()
+            version_future = backend.interface.communicate_check_version_async(
                 current_version=wandb.__version__
             )
-            if ret:
-                logger.info("got version response {}".format(ret))
-                if ret.upgrade_message:
-                    run._set_upgraded_version_message(ret.upgrade_message)
-                if ret.delete_message:
-                    run._set_deleted_version_message(ret.delete_message)
-                if ret.yank_message:
-                    run._set_yanked_version_message(ret.yank_message)
-            run._on_init()
             logger.info("communicating run to backend with 30 second timeout")
             ret = backend.interface.communicate_run(run, timeout=30)
+            run_time = time.time() - init_start
 
             error_message: Optional[str] = None
             if not ret:
@@ -545,6 +539,23 @@ class _WandbInit(object):
                 backend.cleanup()
                 self.teardown()
                 raise UsageError(error_message)
+            version_timeout = max(0, 5 - (time.time() - init_start))
+            version_result = version_future.get(timeout=version_timeout)
+            logger.info(
+                "communicated run in %.3fs, joined version check after %.3fs",
+                run_time,
+                time.time() - init_start,
+            )
+            if version_result:
+                version = version_result.response.check_version_response
+                logger.info("got version response {}".format(version))
+                if version.upgrade_message:
+                    run._set_upgraded_version_message(version.upgrade_message)
+                if version.delete_message:
+                    run._set_deleted_version_message(version.delete_message)
+                if version.yank_message:
+                    run._set_yanked_version_message(version.yank_message)
+            run._on_init()
             if ret.run.resumed:
                 logger.info("run resumed")
                 with telemetry.context(run=run) as tel:
@@ -554,7 +565,9 @@ class _WandbInit(object):
         logger.info("starting run threads in backend")
         # initiate run (stats and metadata probing)
         run_obj = run._run_obj or run._run_obj_offline
+        run_start = time.time()
         _ = backend.interface.communicate_run_start(run_obj)
+        logger.info("started run threads in %.3fs", time.time() - run_start)
 
         self._wl._global_run_stack.append(run)
         self.run = run
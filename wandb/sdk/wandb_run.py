@@ -42,8 +42,7 @@ import wandb
 from wandb import errors
 from wandb import trigger
 from wandb._globals import _datatypes_set_callback
-from wandb.apis import internal, public
-from wandb.apis.public import Api as PublicApi
+from wandb.apis import internal
 from wandb.errors import Error
 from wandb.proto.wandb_internal_pb2 import (
     FilePusherStats,
@@ -76,7 +75,6 @@ from .lib import (
     apikey,
     config_util,
     filenames,
-    filesystem,
     ipython,
     module,
     proto_util,
@@ -93,6 +91,8 @@ from .wandb_setup import _WandbSetup
 if TYPE_CHECKING:
     from typing import NoReturn
 
+    from wandb.apis.public import Api as PublicApi
+
     from .data_types import WBValue
 
     from .interface.artifacts import (
@@ -262,8 +262,8 @@ class Run(object):
 
     _out_redir: Optional[redirect.RedirectBase]
     _err_redir: Optional[redirect.RedirectBase]
-    _redirect_cb: Optional[Callable[[str, str], None]]
-    _output_writer: Optional["filesystem.CRDedupedFile"]
+    _redirect_cb: Optional[Callable[[List[Tuple[str, str]]], None]]
+    _console_pump: Optional[redirect.ConsolePump]
 
     _atexit_cleanup_called: bool
     _hooks: Optional[ExitHooks]
@@ -317,6 +317,7 @@ class Run(object):
         self._hooks = None
         self._teardown_hooks = []
         self._redirect_cb = None
+        self._console_pump = None
         self._out_redir = None
         self._err_redir = None
         self.stdout_redirector = None
@@ -333,7 +334,6 @@ class Run(object):
         if self._settings._jupyter and ipython._get_python_type() == "jupyter":
             self._jupyter_progress = ipython.jupyter_progress_bar()
 
-        self._output_writer = None
         self._upgraded_version_message = None
         self._deleted_version_message = None
         self._yanked_version_message = None
@@ -907,10 +907,10 @@ class Run(object):
                 row, step, publish_step=not_using_tensorboard
             )
 
-    def _console_callback(self, name: str, data: str) -> None:
-        # logger.info("console callback: %s, %s", name, data)
+    def _console_callback(self, outputs: List[Tuple[str, str]]) -> None:
+        # logger.info("console callback: %s", outputs)
         if self._backend:
-            self._backend.interface.publish_output(name, data)
+            self._backend.interface.publish_output_batch(outputs)
 
     def _tensorboard_callback(
         self, logdir: str, save: bool = None, root_logdir: str = None
@@ -1480,22 +1480,15 @@ class Run(object):
 
         out_redir: redirect.RedirectBase
         err_redir: redirect.RedirectBase
+        if self._console_pump is None:
+            # one thread processes the output of both streams
+            self._console_pump = redirect.ConsolePump(
+                cbs=[lambda outputs: self._redirect_cb(outputs)]  # type: ignore
+            )
         if console == self._settings.Console.REDIRECT:
             logger.info("Redirecting console.")
-            out_redir = redirect.Redirect(
-                src="stdout",
-                cbs=[
-                    lambda data: self._redirect_cb("stdout", data),  # type: ignore
-                    self._output_writer.write,  # type: ignore
-                ],
-            )
-            err_redir = redirect.Redirect(
-                src="stderr",
-                cbs=[
-                    lambda data: self._redirect_cb("stderr", data),  # type: ignore
-                    self._output_writer.write,  # type: ignore
-                ],
-            )
+            out_redir = redirect.Redirect(src="stdout", pump=self._console_pump,)
+            err_redir = redirect.Redirect(src="stderr", pump=self._console_pump,)
             if os.name == "nt":
 
                 def wrap_fallback() -> None:
@@ -1514,20 +1507,8 @@ class Run(object):
                 add_import_hook("tensorflow", wrap_fallback)
         elif console == self._settings.Console.WRAP:
             logger.info("Wrapping output streams.")
-            out_redir = redirect.StreamWrapper(
-                src="stdout",
-                cbs=[
-                    lambda data: self._redirect_cb("stdout", data),  # type: ignore
-                    self._output_writer.write,  # type: ignore
-                ],
-            )
-            err_redir = redirect.StreamWrapper(
-                src="stderr",
-                cbs=[
-                    lambda data: self._redirect_cb("stderr", data),  # type: ignore
-                    self._output_writer.write,  # type: ignore
-                ],
-            )
+            out_redir = redirect.StreamWrapper(src="stdout", pump=self._console_pump,)
+            err_redir = redirect.StreamWrapper(src="stderr", pump=self._console_pump,)
         elif console == self._settings.Console.OFF:
             return
         else:
@@ -1611,15 +1592,10 @@ class Run(object):
             # setup fake callback
             self._redirect_cb = self._console_callback
 
-        output_log_path = os.path.join(self.dir, filenames.OUTPUT_FNAME)
-        self._output_writer = filesystem.CRDedupedFile(open(output_log_path, "wb"))
         self._redirect(self._stdout_slave_fd, self._stderr_slave_fd)
 
     def _console_stop(self) -> None:
         self._restore()
-        if self._output_writer:
-            self._output_writer.close()
-            self._output_writer = None
 
     def _on_init(self) -> None:
         self._show_version_info()
@@ -2137,7 +2113,7 @@ class Run(object):
                     artifact, aliases, is_user_created=True, use_after_commit=True
                 )
                 return artifact
-            elif isinstance(artifact, public.Artifact):
+            elif isinstance(artifact, wandb.apis.public.Artifact):
                 api.use_artifact(artifact.id)
                 return artifact
             else:
@@ -2327,20 +2303,20 @@ class Run(object):
                 )
         return artifact
 
-    def _public_api(self) -> PublicApi:
+    def _public_api(self) -> "PublicApi":
         overrides = {"run": self.id}
         run_obj = self._run_obj
         if run_obj is not None:
             overrides["entity"] = run_obj.entity
             overrides["project"] = run_obj.project
-        return public.Api(overrides)
+        return wandb.apis.public.Api(overrides)
 
     # TODO(jhr): annotate this
     def _assert_can_log_artifact(self, artifact) -> None:  # type: ignore
         if not self._settings._offline:
             try:
                 public_api = self._public_api()
-                expected_type = public.Artifact.expected_type(
+                expected_type = wandb.apis.public.Artifact.expected_type(
                     public_api.client,
                     artifact.name,
                     public_api.settings["entity"],
@@ -2492,7 +2468,7 @@ def restore(
     if root is None:
         if run is not None:
             root = run.dir
-    api = public.Api()
+    api = wandb.apis.public.Api()
     api_run = api.run(run_path)
     if root is None:
         root = os.getcwd()
@@ -2538,11 +2514,11 @@ except AttributeError:
 
 class _LazyArtifact(ArtifactInterface):
 
-    _api: PublicApi
+    _api: "PublicApi"
     _instance: Optional[ArtifactInterface] = None
     _future: Any
 
-    def __init__(self, api: PublicApi, future: Any):
+    def __init__(self, api: "PublicApi", future: Any):
         self._api = api
         self._future = future
 
@@ -2562,7 +2538,9 @@ class _LazyArtifact(ArtifactInterface):
             resp = self._future.get().response.log_artifact_response
             if resp.error_message:
                 raise ValueError(resp.error_message)
-            self._instance = public.Artifact.from_id(resp.artifact_id, self._api.client)
+            self._instance = wandb.apis.public.Artifact.from_id(
+                resp.artifact_id, self._api.client
+            )
         assert isinstance(
             self._instance, ArtifactInterface
         ), "Insufficient permissions to fetch Artifact with id {} from {}".format(
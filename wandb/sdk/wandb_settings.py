@@ -24,7 +24,6 @@ Override priorities are in the reverse order of non-override settings
 import configparser
 import copy
 from datetime import datetime
-from distutils.util import strtobool
 import enum
 import getpass
 import itertools
@@ -58,6 +57,7 @@ from typing import (
 import six
 import wandb
 from wandb import util
+from wandb.env import strtobool
 from wandb.sdk.wandb_config import Config
 from wandb.sdk.wandb_setup import _EarlyLogger
 
@@ -106,6 +106,8 @@ env_settings: Dict[str, Optional[str]] = dict(
     start_method=None,
     strict=None,
     label_disable=None,
+    stats_sample_rate_hz=None,
+    service=None,
     root_dir="WANDB_DIR",
     run_name="WANDB_NAME",
     run_notes="WANDB_NOTES",
@@ -389,6 +391,9 @@ class Settings(object):
         _internal_check_process: float = 8,
         _disable_meta: bool = None,
         _disable_stats: bool = None,
+        stats_sample_rate_hz: float = None,
+        service: str = None,
+        _cwd: str = None,  # cwd of a run handled by the wandb service
         _jupyter_path: str = None,
         _jupyter_name: str = None,
         _jupyter_root: str = None,
@@ -605,6 +610,21 @@ class Settings(object):
             return None
         return _error_choices(value, choices)
 
+    def _validate_stats_sample_rate_hz(self, value: float) -> Optional[str]:
+        try:
+            rate = float(value)
+        except (TypeError, ValueError):
+            return "{} is not a number".format(value)
+        if not 0 < rate <= 100:
+            return "{} is not in (0, 100]".format(value)
+        return None
+
+    def _validate_service(self, value: str) -> Optional[str]:
+        port = str(value).rsplit(":", 1)[-1]
+        if port.isdigit():
+            return None
+        return "{} is not a port or host:port".format(value)
+
     def _validate_problem(self, value: str) -> Optional[str]:
         choices = {"fatal", "warn", "silent"}
         if value in choices:
@@ -663,6 +683,12 @@ class Settings(object):
             value = value.rstrip("/")
         return value
 
+    def _preprocess_service(self, value: Optional[str]) -> Optional[str]:
+        # a port alone is a service on this host
+        if value is not None and str(value).isdigit():
+            value = "localhost:{}".format(value)
+        return value
+
     def _start_run(self) -> None:
         datetime_now: datetime = datetime.now()
         time_now: float = time.time()
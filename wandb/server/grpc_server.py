@@ -3,17 +3,49 @@
 
 from concurrent import futures
 import datetime
+import itertools
 import logging
 import multiprocessing
 import os
+import sys
+import threading
 import time
 
 import grpc
+from six.moves import queue
 import wandb
 from wandb import wandb_sdk
 from wandb.proto import wandb_internal_pb2  # type: ignore
 from wandb.proto import wandb_server_pb2  # type: ignore
 from wandb.proto import wandb_server_pb2_grpc  # type: ignore
+from wandb.sdk.backend import service
+from wandb.sdk.internal import internal
+
+logger = logging.getLogger("wandb")
+
+# runs handled at the same time, each one holds a server thread for its stream
+MAX_RUNS = 64
+
+# numbers the runs handled by the service, to name their threads
+_run_numbers = itertools.count(1)
+
+
+class RunLogFilter(logging.Filter):
+    """Passes the records logged by the threads of one run.
+
+    All runs handled by the service log to the same "wandb" logger, this keeps
+    the records of the other runs out of the internal log of a run. The threads
+    of a run are the ones named with its prefix: the thread running it and the
+    threads started by wandb_internal. Records of the helper threads these
+    start, e.g. for uploads, are left out of every run's log.
+    """
+
+    def __init__(self, thread_name_prefix):
+        super(RunLogFilter, self).__init__()
+        self._prefix = thread_name_prefix
+
+    def filter(self, record):
+        return record.threadName.startswith(self._prefix)
 
 
 class InternalServiceServicer(wandb_server_pb2_grpc.InternalServiceServicer):
@@ -22,6 +54,14 @@ class InternalServiceServicer(wandb_server_pb2_grpc.InternalServiceServicer):
     def __init__(self, server, backend):
         self._server = server
         self._backend = backend
+        self._lock = threading.Lock()
+
+    def _interface(self):
+        # the run these calls log to is only set up when they are first used
+        with self._lock:
+            if self._backend._interface is None:
+                self._backend.setup()
+        return self._backend._interface
 
     def RunUpdate(self, run_data, context):  # noqa: N802
         if not run_data.run_id:
@@ -29,47 +69,48 @@ class InternalServiceServicer(wandb_server_pb2_grpc.InternalServiceServicer):
         # Record telemetry info about grpc server
         run_data.telemetry.feature.grpc = True
         run_data.telemetry.cli_version = wandb.__version__
-        result = self._backend._interface._communicate_run(run_data)
+        result = self._interface()._communicate_run(run_data)
 
         # initiate run (stats and metadata probing)
-        _ = self._backend._interface.communicate_run_start(result.run)
+        _ = self._interface().communicate_run_start(result.run)
 
         return result
 
     def RunExit(self, exit_data, context):  # noqa: N802
-        result = self._backend._interface._communicate_exit(exit_data)
+        result = self._interface()._communicate_exit(exit_data)
         return result
 
     def Log(self, log_data, context):  # noqa: N802
         # TODO: make this sync?
-        self._backend._interface._publish_history(log_data)
+        self._interface()._publish_history(log_data)
         # make up a response even though this was async
         result = wandb_internal_pb2.HistoryResult()
         return result
 
     def Summary(self, summary_data, context):  # noqa: N802
         # TODO: make this sync?
-        self._backend._interface._publish_summary(summary_data)
+        self._interface()._publish_summary(summary_data)
         # make up a response even though this was async
         result = wandb_internal_pb2.SummaryResult()
         return result
 
     def Output(self, output_data, context):  # noqa: N802
         # TODO: make this sync?
-        self._backend._interface._publish_output(output_data)
+        self._interface()._publish_output(output_data)
         # make up a response even though this was async
         result = wandb_internal_pb2.OutputResult()
         return result
 
     def Config(self, config_data, context):  # noqa: N802
         # TODO: make this sync?
-        self._backend._interface._publish_config(config_data)
+        self._interface()._publish_config(config_data)
         # make up a response even though this was async
         result = wandb_internal_pb2.ConfigResult()
         return result
 
     def ServerShutdown(self, request, context):  # noqa: N802
-        self._backend.cleanup()
+        if self._backend._interface is not None:
+            self._backend.cleanup()
         result = wandb_server_pb2.ServerShutdownResult()
         self._server.stop(5)
         return result
@@ -79,6 +120,97 @@ class InternalServiceServicer(wandb_server_pb2_grpc.InternalServiceServicer):
         return result
 
 
+class RunService(object):
+    """Handles many runs at the same time, each in its own RunStream.
+
+    This is what a run started with the service setting talks to instead of a
+    new internal process, see wandb/sdk/backend/service.py. The runs share this
+    process, its imported modules and connection pools, but each gets its own
+    queues and internal threads, and a run that fails only ends its own stream.
+    """
+
+    def RunStream(self, request_iterator, context):  # noqa: N802
+        try:
+            hello = service.decode_hello(next(request_iterator))
+        except (StopIteration, ValueError):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "expected a hello")
+        if hello.get("version") != wandb.__version__:
+            context.abort(
+                grpc.StatusCode.FAILED_PRECONDITION,
+                "the service runs wandb {}".format(wandb.__version__),
+            )
+        if hello.get("executable") != sys.executable:
+            context.abort(
+                grpc.StatusCode.FAILED_PRECONDITION,
+                "the service runs python {}".format(sys.executable),
+            )
+
+        settings = dict(hello["settings"])
+        settings["_cwd"] = hello["cwd"]
+        record_q = queue.Queue()
+        result_q = queue.Queue()
+        thread_name_prefix = "run{}-".format(next(_run_numbers))
+        run_thread = threading.Thread(
+            target=self._run_internal,
+            args=(settings, record_q, result_q, hello["pid"], thread_name_prefix),
+        )
+        run_thread.name = thread_name_prefix + "wandb_internal"
+        run_thread.daemon = True
+        run_thread.start()
+        reader = threading.Thread(
+            target=self._read_records, args=(request_iterator, record_q, run_thread)
+        )
+        reader.name = "RunStreamReader"
+        reader.daemon = True
+        reader.start()
+
+        yield service.encode_hello(dict(pid=os.getpid()))
+        while True:
+            result = result_q.get()
+            if result is None:
+                break
+            yield result.SerializeToString()
+
+    def _run_internal(self, settings, record_q, result_q, pid, thread_name_prefix):
+        logger.info("run %s started by pid %s", settings.get("run_id"), pid)
+        log_filter = RunLogFilter(thread_name_prefix)
+        try:
+            internal.wandb_internal(
+                settings=settings,
+                record_q=record_q,
+                result_q=result_q,
+                parent_pid=pid,
+                log_filter=log_filter,
+                thread_name_prefix=thread_name_prefix,
+            )
+        except Exception:
+            logger.exception("run %s failed", settings.get("run_id"))
+        finally:
+            # each run adds a handler for its own internal log
+            root = logging.getLogger("wandb")
+            for handler in list(root.handlers):
+                if log_filter in handler.filters:
+                    root.removeHandler(handler)
+                    handler.close()
+            # ends the stream
+            result_q.put(None)
+        logger.info("run %s finished", settings.get("run_id"))
+
+    def _read_records(self, request_iterator, record_q, run_thread):
+        try:
+            for data in request_iterator:
+                record_q.put(wandb_internal_pb2.Record.FromString(data))
+        except grpc.RpcError:
+            pass
+        # the stream of a run that finished ends after its internal threads
+        # stopped, if they are still running the run went away
+        if run_thread.is_alive():
+            shutdown = wandb_internal_pb2.ShutdownRequest()
+            record = wandb_internal_pb2.Record()
+            record.request.shutdown.CopyFrom(shutdown)
+            record_q.put(record)
+
+
 # TODO(jhr): this should be merged with code in backend/backend.py ensure launched
 class Backend:
     def __init__(self):
@@ -113,6 +245,7 @@ class Backend:
             _disable_meta=True,
             _disable_stats=False,
             git_remote=None,
+            _cwd=None,
             program=None,
             resume=None,
             ignore_globs=(),
@@ -167,14 +300,35 @@ class Backend:
         # No printing allowed from here until redirect restore!!!
 
 
+def start_server(backend, port):
+    """Starts the server on a local port, 0 picks a free one.
+
+    Returns:
+        The server and the port it listens on.
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=MAX_RUNS + 10))
+    wandb_server_pb2_grpc.add_InternalServiceServicer_to_server(
+        InternalServiceServicer(server, backend), server
+    )
+    # RunStream is not in wandb_server.proto, its messages are the hello bytes
+    # followed by serialized records and results
+    run_stream = grpc.stream_stream_rpc_method_handler(RunService().RunStream)
+    server.add_generic_rpc_handlers(
+        (
+            grpc.method_handlers_generic_handler(
+                service.SERVICE_NAME, {service.RUN_STREAM_METHOD: run_stream}
+            ),
+        )
+    )
+    # runs tell the service where to write, so only accept local ones
+    port = server.add_insecure_port("localhost:{}".format(port))
+    server.start()
+    return server, port
+
+
 def serve(backend, port):
     try:
-        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-        wandb_server_pb2_grpc.add_InternalServiceServicer_to_server(
-            InternalServiceServicer(server, backend), server
-        )
-        server.add_insecure_port("[::]:{}".format(port))
-        server.start()
+        server, _ = start_server(backend, port)
         server.wait_for_termination()
         # print("server shutting down")
         # print("shutdown")
@@ -186,7 +340,6 @@ def main(port=None):
     try:
         logging.basicConfig()
         backend = Backend()
-        backend.setup()
         serve(backend, port or 50051)
     except KeyboardInterrupt:
         print("outer control-c")
@@ -4,8 +4,11 @@ sync.
 
 from __future__ import print_function
 
+import base64
+import collections
 import datetime
 import fnmatch
+import json
 import os
 import sys
 import threading
@@ -18,13 +21,17 @@ from wandb.compat import tempfile
 from wandb.proto import wandb_internal_pb2  # type: ignore
 from wandb.sdk.interface import interface
 from wandb.sdk.internal import datastore
+from wandb.sdk.internal.file_pusher import FilePusher
 from wandb.sdk.internal import handler
 from wandb.sdk.internal import sender
 from wandb.sdk.internal import tb_watcher
+from wandb.sdk.lib import filenames
 from wandb.util import check_and_warn_old, mkdir_exists_ok
 
 WANDB_SUFFIX = ".wandb"
 SYNCED_SUFFIX = ".synced"
+CHECKPOINT_SUFFIX = ".progress"
+CHECKPOINT_SECONDS = 10
 TFEVENT_SUBSTRING = ".tfevents."
 TMPDIR = tempfile.TemporaryDirectory()
 
@@ -42,6 +49,88 @@ class _LocalRun(object):
         return self.path
 
 
+class _Checkpoint(object):
+    """Progress of syncing a .wandb file, saved next to it.
+
+    Records are sent in order, so resuming needs the offset of the first record
+    not yet sent, the number of lines already streamed for each file, and the
+    records whose effect outlives them, which are replayed before continuing.
+    """
+
+    # file stream files and the sender resume state they continue from
+    STREAMS = {
+        filenames.HISTORY_FNAME: "history",
+        filenames.EVENTS_FNAME: "events",
+        filenames.OUTPUT_FNAME: "output",
+    }
+    REPLAY = ("config", "files", "metric", "telemetry")
+
+    def __init__(self, path, run_id=None, offset=None, streams=None, records=None):
+        self.path = path
+        self.run_id = run_id
+        self.offset = offset
+        self.streams = streams or {}
+        self.records = records or []
+        self._summary = None
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            return cls(
+                path,
+                run_id=state["run_id"],
+                offset=state["offset"],
+                streams=state["streams"],
+                records=[base64.b64decode(r) for r in state["records"]],
+            )
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def replay_records(self):
+        for data in self.records:
+            pb = wandb_internal_pb2.Record()
+            pb.ParseFromString(data)
+            yield pb
+
+    def track(self, pb):
+        record_type = pb.WhichOneof("record_type")
+        if record_type == "summary":
+            self._summary = pb.SerializeToString()
+        elif record_type in self.REPLAY:
+            self.records.append(pb.SerializeToString())
+
+    def save_when_posted(self, send_manager, run_id, offset):
+        """Saves the checkpoint once the file stream posted all records sent."""
+        records = self.records[:]
+        if self._summary is not None:
+            records.append(self._summary)
+        state = dict(
+            run_id=run_id,
+            offset=offset,
+            records=[base64.b64encode(r).decode("ascii") for r in records],
+        )
+
+        def save(chunk_offsets):
+            state["streams"] = {
+                key: chunk_offsets.get(name, 0) for name, key in self.STREAMS.items()
+            }
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.path)
+            except (IOError, OSError) as e:
+                wandb.termwarn("Unable to save sync progress ({})".format(e))
+
+        send_manager._fs.enqueue_checkpoint(save)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
 class SyncThread(threading.Thread):
     def __init__(
         self,
@@ -54,10 +143,15 @@ class SyncThread(threading.Thread):
         mark_synced=None,
         app_url=None,
         sync_tensorboard=None,
+        upload_slots=None,
+        parallel=None,
     ):
         threading.Thread.__init__(self)
         # mark this process as internal
         wandb._set_internal_process(disable=True)
+        # threads syncing in parallel take their items from a shared deque
+        if not isinstance(sync_list, collections.deque):
+            sync_list = collections.deque(sync_list)
         self._sync_list = sync_list
         self._project = project
         self._entity = entity
@@ -67,6 +161,8 @@ class SyncThread(threading.Thread):
         self._mark_synced = mark_synced
         self._app_url = app_url
         self._sync_tensorboard = sync_tensorboard
+        self._upload_slots = upload_slots
+        self._parallel = parallel
 
     def _parse_pb(self, data, exit_pb=None):
         pb = wandb_internal_pb2.Record()
@@ -160,7 +256,11 @@ class SyncThread(threading.Thread):
         sender_record_q = queue.Queue()
         new_interface = interface.BackendSender(record_q)
         send_manager = sender.SendManager(
-            send_manager._settings, sender_record_q, queue.Queue(), new_interface
+            send_manager._settings,
+            sender_record_q,
+            queue.Queue(),
+            new_interface,
+            upload_slots=send_manager._upload_slots,
         )
         record = send_manager._interface._make_record(run=proto_run)
         settings = wandb.Settings(
@@ -221,76 +321,164 @@ class SyncThread(threading.Thread):
             else:
                 raise e
 
-    def run(self):
-        for sync_item in self._sync_list:
-            tb_event_files, tb_logdirs, tb_root = self._find_tfevent_files(sync_item)
-            if os.path.isdir(sync_item):
-                files = os.listdir(sync_item)
-                filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
-                if tb_root is None and (
-                    check_and_warn_old(files) or len(filtered_files) != 1
-                ):
-                    print("Skipping directory: {}".format(sync_item))
-                    continue
-                if len(filtered_files) > 0:
-                    sync_item = os.path.join(sync_item, filtered_files[0])
-            sync_tb = self._setup_tensorboard(
-                tb_root, tb_logdirs, tb_event_files, sync_item
-            )
-            # If we're syncing tensorboard, let's use a tmp dir for images etc.
-            root_dir = TMPDIR.name if sync_tb else os.path.dirname(sync_item)
-            sm = sender.SendManager.setup(root_dir)
-            if sync_tb:
-                self._send_tensorboard(tb_root, tb_logdirs, sm)
-                continue
+    def _send(self, sm, pb):
+        sm.send(pb)
+        # send any records that were added in previous send
+        while not sm._record_q.empty():
+            data = sm._record_q.get(block=True)
+            sm.send(data)
+
+    def _can_checkpoint(self, sm, exit_pb):
+        # a held back exit record or partial output line would be lost
+        return (
+            sm._fs is not None
+            and exit_pb is None
+            and not any(sm._partial_output.values())
+        )
 
-            ds = datastore.DataStore()
+    def run(self):
+        while True:
             try:
-                ds.open_for_scan(sync_item)
-            except AssertionError as e:
-                print(".wandb file is empty ({}), skipping: {}".format(e, sync_item))
+                sync_item = self._sync_list.popleft()
+            except IndexError:
+                break
+            self._sync_item(sync_item)
+
+    def _sync_item(self, sync_item):
+        tb_event_files, tb_logdirs, tb_root = self._find_tfevent_files(sync_item)
+        sync_item = self._find_wandb_file(sync_item, tb_root)
+        if sync_item is None:
+            return
+        sync_tb = self._setup_tensorboard(
+            tb_root, tb_logdirs, tb_event_files, sync_item
+        )
+        # If we're syncing tensorboard, let's use a tmp dir for images etc.
+        root_dir = TMPDIR.name if sync_tb else os.path.dirname(sync_item)
+        sm = sender.SendManager.setup(root_dir, upload_slots=self._upload_slots)
+        if sync_tb:
+            self._send_tensorboard(tb_root, tb_logdirs, sm)
+            return
+
+        ds = datastore.DataStore()
+        try:
+            ds.open_for_scan(sync_item)
+        except AssertionError as e:
+            print(".wandb file is empty ({}), skipping: {}".format(e, sync_item))
+            return
+
+        checkpoint_path = "{}{}".format(sync_item, CHECKPOINT_SUFFIX)
+        resume = None if self._view else _Checkpoint.load(checkpoint_path)
+        checkpoint = _Checkpoint(checkpoint_path)
+        finished, url = self._send_records(ds, sm, checkpoint, resume)
+        self._finish_item(sync_item, sm, checkpoint, finished, url)
+
+    def _find_wandb_file(self, sync_item, tb_root):
+        """Returns the .wandb file of a run directory, the item itself if it isn't
+        a directory, or None if the directory should be skipped."""
+        if not os.path.isdir(sync_item):
+            return sync_item
+        files = os.listdir(sync_item)
+        filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
+        if tb_root is None and (check_and_warn_old(files) or len(filtered_files) != 1):
+            print("Skipping directory: {}".format(sync_item))
+            return None
+        if len(filtered_files) > 0:
+            return os.path.join(sync_item, filtered_files[0])
+        return sync_item
+
+    def _send_records(self, ds, sm, checkpoint, resume):
+        """Sends the records of a .wandb file, continuing from the checkpoint of
+        an earlier sync if there is one. Returns whether the run finished and its
+        url."""
+        checkpoint_time = time.time()
+        run_id = None
+        offset = ds.get_offset()
+
+        # save exit for final send
+        exit_pb = None
+        finished = False
+        url = None
+        while True:
+            data = self._robust_scan(ds)
+            if data is None:
+                break
+            offset = ds.get_offset()
+            pb, exit_pb, cont = self._parse_pb(data, exit_pb)
+            if exit_pb is not None:
+                finished = True
+            if cont:
                 continue
-
-            # save exit for final send
-            exit_pb = None
-            finished = False
-            shown = False
-            while True:
-                data = self._robust_scan(ds)
-                if data is None:
-                    break
-                pb, exit_pb, cont = self._parse_pb(data, exit_pb)
-                if exit_pb is not None:
-                    finished = True
-                if cont:
-                    continue
-                sm.send(pb)
-                # send any records that were added in previous send
-                while not sm._record_q.empty():
-                    data = sm._record_q.get(block=True)
-                    sm.send(data)
-
-                if pb.control.req_resp:
-                    result = sm._result_q.get(block=True)
-                    result_type = result.WhichOneof("result_type")
-                    if not shown and result_type == "run_result":
-                        r = result.run_result.run
-                        # TODO(jhr): hardcode until we have settings in sync
-                        url = "{}/{}/{}/runs/{}".format(
-                            self._app_url,
-                            url_quote(r.entity),
-                            url_quote(r.project),
-                            url_quote(r.run_id),
-                        )
-                        print("Syncing: %s ..." % url, end="")
-                        sys.stdout.flush()
-                        shown = True
-            sm.finish()
-            # Only mark synced if the run actually finished
-            if self._mark_synced and not self._view and finished:
-                synced_file = "{}{}".format(sync_item, SYNCED_SUFFIX)
-                with open(synced_file, "w"):
-                    pass
+            is_run = pb.WhichOneof("record_type") == "run"
+            if is_run and run_id is None:
+                run_id = pb.run.run_id
+                resume = self._resume_streams(sm, resume, run_id)
+            self._send(sm, pb)
+            checkpoint.track(pb)
+
+            if pb.control.req_resp:
+                url = self._show_url(sm._result_q.get(block=True), url)
+
+            if resume and is_run:
+                self._replay(sm, ds, checkpoint, resume)
+                resume = None
+
+            if (
+                not self._view
+                and time.time() - checkpoint_time > CHECKPOINT_SECONDS
+                and self._can_checkpoint(sm, exit_pb)
+            ):
+                checkpoint.save_when_posted(sm, run_id, offset)
+                checkpoint_time = time.time()
+
+        if not self._view and not finished and self._can_checkpoint(sm, exit_pb):
+            # let a later sync of this run pick up where this one ended
+            checkpoint.save_when_posted(sm, run_id, offset)
+        return finished, url
+
+    def _resume_streams(self, sm, resume, run_id):
+        """Returns the checkpoint to resume from if it is for run_id."""
+        if not resume or resume.run_id != run_id:
+            return None
+        # stream files continue where the last sync left off
+        for key in _Checkpoint.STREAMS.values():
+            sm._resume_state[key] = resume.streams.get(key, 0)
+        return resume
+
+    def _replay(self, sm, ds, checkpoint, resume):
+        for replay_pb in resume.replay_records():
+            self._send(sm, replay_pb)
+            checkpoint.track(replay_pb)
+        ds.seek(resume.offset)
+
+    def _show_url(self, result, url):
+        """Returns the url of the run, printing it when the run result arrives."""
+        if url is not None or result.WhichOneof("result_type") != "run_result":
+            return url
+        r = result.run_result.run
+        # TODO(jhr): hardcode until we have settings in sync
+        url = "{}/{}/{}/runs/{}".format(
+            self._app_url,
+            url_quote(r.entity),
+            url_quote(r.project),
+            url_quote(r.run_id),
+        )
+        if not self._parallel:
+            print("Syncing: %s ..." % url, end="")
+            sys.stdout.flush()
+        return url
+
+    def _finish_item(self, sync_item, sm, checkpoint, finished, url):
+        sm.finish()
+        if finished and not self._view:
+            checkpoint.remove()
+        # Only mark synced if the run actually finished
+        if self._mark_synced and not self._view and finished:
+            synced_file = "{}{}".format(sync_item, SYNCED_SUFFIX)
+            with open(synced_file, "w"):
+                pass
+        if self._parallel:
+            print("Syncing: %s ...done." % (url or sync_item))
+        else:
             print("done.")
 
 
@@ -305,9 +493,10 @@ class SyncManager:
         view=None,
         verbose=None,
         sync_tensorboard=None,
+        jobs=None,
     ):
         self._sync_list = []
-        self._thread = None
+        self._threads = []
         self._project = project
         self._entity = entity
         self._run_id = run_id
@@ -316,6 +505,7 @@ class SyncManager:
         self._view = view
         self._verbose = verbose
         self._sync_tensorboard = sync_tensorboard
+        self._jobs = max(1, jobs or 1)
 
     def status(self):
         pass
@@ -324,22 +514,33 @@ class SyncManager:
         self._sync_list.append(os.path.abspath(str(p)))
 
     def start(self):
-        # create a thread for each file?
-        self._thread = SyncThread(
-            sync_list=self._sync_list,
-            project=self._project,
-            entity=self._entity,
-            run_id=self._run_id,
-            view=self._view,
-            verbose=self._verbose,
-            mark_synced=self._mark_synced,
-            app_url=self._app_url,
-            sync_tensorboard=self._sync_tensorboard,
-        )
-        self._thread.start()
+        sync_list = collections.deque(self._sync_list)
+        jobs = min(self._jobs, len(sync_list)) or 1
+        # runs synced in parallel share one bound on concurrent file uploads
+        upload_slots = None
+        if jobs > 1:
+            upload_slots = threading.BoundedSemaphore(FilePusher.MAX_UPLOAD_JOBS)
+        self._threads = [
+            SyncThread(
+                sync_list=sync_list,
+                project=self._project,
+                entity=self._entity,
+                run_id=self._run_id,
+                view=self._view,
+                verbose=self._verbose,
+                mark_synced=self._mark_synced,
+                app_url=self._app_url,
+                sync_tensorboard=self._sync_tensorboard,
+                upload_slots=upload_slots,
+                parallel=jobs > 1,
+            )
+            for _ in range(jobs)
+        ]
+        for thread in self._threads:
+            thread.start()
 
     def is_done(self):
-        return not self._thread.is_alive()
+        return not any(thread.is_alive() for thread in self._threads)
 
     def poll(self):
         time.sleep(1)
@@ -1091,8 +1091,10 @@ def guess_data_type(shape, risky=False):
     return None
 
 
-def download_file_from_url(dest_path, source_url, api_key=None):
-    response = requests.get(source_url, auth=("api", api_key), stream=True, timeout=5)
+def download_file_from_url(dest_path, source_url, api_key=None, session=None):
+    response = (session or requests).get(
+        source_url, auth=("api", api_key), stream=True, timeout=5
+    )
     response.raise_for_status()
 
     if os.sep in dest_path: